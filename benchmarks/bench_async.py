@@ -0,0 +1,118 @@
+"""Measure how long an asyncio event loop is blocked while todo.txt files are used
+Run with::
+
+    python -m benchmarks.bench_async --lists 4 --lines 20000 --changes 20
+
+A ticker coroutine sleeps for a millisecond at a time and records how late
+it wakes, while the files of several lists are read, each list is changed
+and the files are all read again. Called directly from a coroutine, every
+read and change blocks the loop. An AsyncTaskList runs them in the loop's
+thread pool and, given a ProcessPoolExecutor, parses large files across
+processes. Threads still hold the interpreter lock while they parse, which
+delays the loop, and full garbage collections of the many tasks held stall
+every thread, so the worst lag remains that of a collection.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmarks.lines import todotxt_lines
+from blockbuster.core.aio import AsyncTaskList, read_files
+from blockbuster.core.model import TaskList
+
+INTERVAL = 0.001
+
+
+async def _tick(lags, done):
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(INTERVAL)
+        lags.append(time.perf_counter() - start - INTERVAL)
+
+
+async def _blocking(files, changes, executor):
+    task_lists = [TaskList.from_file(file, executor=executor) for file in files]
+    await asyncio.sleep(0)
+    for count in range(changes):
+        for task_list in task_lists:
+            task_list.update_tasks({0: f"2019-01-01 Change {count}"})
+            await asyncio.sleep(0)
+    for task_list in task_lists:
+        task_list.read_file(force=True)
+        await asyncio.sleep(0)
+
+
+async def _awaited(files, changes, executor):
+    task_lists = await AsyncTaskList.from_files(files, executor=executor)
+    for count in range(changes):
+        await asyncio.gather(
+            *(
+                task_list.update_tasks({0: f"2019-01-01 Change {count}"})
+                for task_list in task_lists
+            )
+        )
+    await read_files(task_lists, force=True)
+
+
+MODES = {
+    "blocking": (_blocking, False),
+    "threads": (_awaited, False),
+    "threads, processes": (_awaited, True),
+}
+
+
+async def _measure(load, files, changes, executor):
+    lags = []
+    done = asyncio.Event()
+    ticker = asyncio.ensure_future(_tick(lags, done))
+    start = time.perf_counter()
+    await load(files, changes, executor)
+    seconds = time.perf_counter() - start
+    done.set()
+    await ticker
+    return seconds, sorted(lags)
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument("--lists", type=int, default=4)
+    arguments.add_argument("--lines", type=int, default=20000)
+    arguments.add_argument("--changes", type=int, default=20)
+    options = arguments.parse_args()
+
+    lines = todotxt_lines(options.lines)
+    with tempfile.TemporaryDirectory() as directory:
+        files = [
+            Path(directory, f"todo{number}.txt") for number in range(options.lists)
+        ]
+        print(
+            f"{options.lists} lists of {options.lines} lines,"
+            f" {options.changes} changes each"
+        )
+        for mode, (load, processes) in MODES.items():
+            for file in files:
+                file.write_text("\n".join(lines))
+            executor = ProcessPoolExecutor() if processes else None
+            loop = asyncio.new_event_loop()
+            try:
+                seconds, lags = loop.run_until_complete(
+                    _measure(load, files, options.changes, executor)
+                )
+            finally:
+                loop.close()
+                if executor is not None:
+                    executor.shutdown()
+            median = lags[len(lags) // 2]
+            worst = lags[-1]
+            print(
+                f"{mode:>18}: {seconds:6.2f}s  loop lag median {median * 1e3:7.2f}ms"
+                f"  max {worst * 1e3:7.2f}ms  {len(lags)} ticks"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Show how loading todo.txt files scales with the number of processes
+
+Run with::
+
+    python -m benchmarks.bench_collection --files 500 --lines 2000
+
+Both many small files, loaded with TaskListCollection, and one large file,
+parsed in chunks by a TaskList with a ProcessPoolExecutor, are measured.
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmarks.lines import todotxt_lines
+from blockbuster.core.collection import TaskListCollection
+from blockbuster.core.model import TaskList
+
+
+def _worker_counts():
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def _timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def _report(name, seconds, baseline):
+    print(f"{name:>24}: {seconds:8.3f}s  {baseline / seconds:5.2f}x")
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument("--files", type=int, default=500)
+    arguments.add_argument("--lines", type=int, default=2000)
+    arguments.add_argument("--large-lines", type=int, default=500_000)
+    options = arguments.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        lines = todotxt_lines(options.lines)
+        files = []
+        for number in range(options.files):
+            file = Path(directory, f"list{number}.txt")
+            file.write_text("\n".join(lines))
+            files.append(file)
+
+        print(f"{options.files} files of {options.lines} lines")
+        baseline = _timed(lambda: [TaskList.from_file(file) for file in files])
+        _report("sequential", baseline, baseline)
+        for workers in _worker_counts():
+            seconds = _timed(
+                lambda: TaskListCollection.from_files(files, max_workers=workers)
+            )
+            _report(f"{workers} processes", seconds, baseline)
+
+        large = Path(directory, "large.txt")
+        large.write_text("\n".join(todotxt_lines(options.large_lines)))
+        print(f"1 file of {options.large_lines} lines")
+        baseline = _timed(lambda: TaskList.from_file(large))
+        _report("sequential", baseline, baseline)
+        for workers in _worker_counts():
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                seconds = _timed(lambda: TaskList.from_file(large, executor=executor))
+            _report(f"{workers} processes", seconds, baseline)
+
+
+if __name__ == "__main__":
+    main()
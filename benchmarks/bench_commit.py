@@ -0,0 +1,80 @@
+"""Compare the throughput of changes written in place and by a Committer
+Run with::
+
+    python -m benchmarks.bench_commit --threads 1 4 16 --changes 100
+
+Each thread makes its share of single line updates to one TaskList. Writing
+in place truncates and rewrites the file without syncing it. A Committer
+replaces the file atomically, optionally syncing each write, and with a
+window lets the changes of many threads share a write. A WriteBehind
+returns from each change before writing it, so the time per change is that
+of the change in memory. Its final write is included in the throughput.
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.lines import todotxt_lines
+from blockbuster.core.commit import Committer, WriteBehind
+from blockbuster.core.model import TaskList
+
+MODES = {
+    "in place": lambda: None,
+    "atomic": lambda: Committer(fsync=False),
+    "atomic, fsync": lambda: Committer(fsync=True),
+    "group commit": lambda: Committer(fsync=True, window=0.002),
+    "write-behind": lambda: WriteBehind(fsync=True, delay=0.05),
+}
+
+
+def _run(file, threads, changes, committer):
+    task_list = TaskList.from_file(file, committer=committer)
+
+    def update(thread):
+        for count in range(changes):
+            task_list.update_tasks({thread: f"2019-01-01 Thread {thread} {count}"})
+
+    workers = [
+        threading.Thread(target=update, args=(thread,)) for thread in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    latency = (time.perf_counter() - start) / (threads * changes)
+    task_list.close()
+    return time.perf_counter() - start, latency
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    arguments.add_argument("--changes", type=int, default=100)
+    arguments.add_argument("--lines", type=int, default=1000)
+    options = arguments.parse_args()
+
+    lines = todotxt_lines(options.lines)
+    with tempfile.TemporaryDirectory() as directory:
+        file = Path(directory, "todo.txt")
+        for threads in options.threads:
+            print(f"{threads} threads, {options.changes} changes each")
+            for mode, committer in MODES.items():
+                file.write_text("\n".join(lines))
+                committer = committer()
+                seconds, latency = _run(file, threads, options.changes, committer)
+                writes = options.changes * threads
+                if committer is not None:
+                    writes = committer.writes
+                throughput = threads * options.changes / seconds
+                print(
+                    f"{mode:>14}: {throughput:8.0f} changes/s  {writes:6} writes"
+                    f"  {latency * 1e6:8.0f}us per change"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Measure the throughput of processes changing the same todo.txt file
+Run with::
+
+    python -m benchmarks.bench_contention --writers 1 2 4 8 --changes 200
+
+Each writer process repeatedly updates its own line of a shared file with a
+count of its changes. Once every writer has finished, each line should hold
+its writer's final count, so any other value shows a lost update. Writers
+run without locking, with locking, and with compare_and_swap, retrying
+conflicting changes.
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.lines import todotxt_lines
+from blockbuster.core.model import TaskList
+
+MODES = {
+    "unlocked": {},
+    "locking": {"locking": True},
+    "compare_and_swap": {"compare_and_swap": True},
+}
+
+
+def _line(writer, count):
+    return f"2019-01-01 Writer {writer} change {count}"
+
+
+def _write(file, writer, changes, options, start):
+    task_list = TaskList.from_file(file, **options)
+    start.wait()
+    for count in range(1, changes + 1):
+        updates = {writer: _line(writer, count)}
+        try:
+            task_list.retry(lambda tasks: tasks.update_tasks(updates), attempts=1000)
+        except Exception:  # pylint: disable=broad-except
+            # Unlocked writers can read a partly written file
+            task_list.read_file(force=True)
+
+
+def _run(file, writers, changes, options, lines):
+    file.write_text("\n".join([_line(writer, 0) for writer in range(writers)] + lines))
+    start = multiprocessing.Barrier(writers + 1)
+    processes = [
+        multiprocessing.Process(
+            target=_write, args=(file, writer, changes, options, start)
+        )
+        for writer in range(writers)
+    ]
+    for process in processes:
+        process.start()
+    start.wait()
+    began = time.perf_counter()
+    for process in processes:
+        process.join()
+    seconds = time.perf_counter() - began
+
+    final = file.read_text().splitlines()
+    lost = sum(
+        final[writer].strip() != _line(writer, changes) if writer < len(final) else 1
+        for writer in range(writers)
+    )
+    return seconds, lost
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument("--writers", type=int, nargs="+", default=[1, 2, 4, 8])
+    arguments.add_argument("--changes", type=int, default=200)
+    arguments.add_argument("--lines", type=int, default=1000)
+    options = arguments.parse_args()
+
+    lines = todotxt_lines(options.lines)
+    with tempfile.TemporaryDirectory() as directory:
+        file = Path(directory, "todo.txt")
+        for writers in options.writers:
+            print(f"{writers} writers, {options.changes} changes each")
+            for mode, mode_options in MODES.items():
+                seconds, lost = _run(
+                    file, writers, options.changes, mode_options, lines
+                )
+                throughput = writers * options.changes / seconds
+                print(
+                    f"{mode:>17}: {throughput:8.0f} changes/s"
+                    f"  {lost} of {writers} writers' final changes lost"
+                )
+
+
+if __name__ == "__main__":
+    main()
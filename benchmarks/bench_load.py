@@ -0,0 +1,63 @@
+"""Compare cold loads of a large todo.txt file in each loading mode
+Run with::
+
+    python -m benchmarks.bench_load --lines 200000
+
+Each load is followed by counting the tasks which are done and those with a
+priority, as a count badge would, and is compared with simply reading the
+file's lines. Loads of only the open tasks and of only the tasks in one
+project show the effect of prefiltering lines.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import blockbuster.core.parser as parser
+from benchmarks.lines import todotxt_lines
+from blockbuster.core.model import TaskList
+from blockbuster.core.query import Done, Project
+
+
+def _read(file):
+    with file.open("r") as reader:
+        reader.readlines()
+
+
+def _badge(file, **options):
+    task_list = TaskList.from_file(file, **options)
+    sum(task.done for task in task_list.tasks)
+    sum(task.priority is not None for task in task_list.tasks)
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument("--lines", type=int, default=200_000)
+    arguments.add_argument("--repeat", type=int, default=3)
+    options = arguments.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = Path(directory, "todo.txt")
+        file.write_text("\n".join(todotxt_lines(options.lines)))
+
+        baseline = None
+        for name, function in (
+            ("eager", lambda: _badge(file)),
+            ("lazy", lambda: _badge(file, lazy=True)),
+            ("open", lambda: _badge(file, where=~Done())),
+            ("project", lambda: _badge(file, where=Project("Project1"))),
+            ("readlines", lambda: _read(file)),
+        ):
+            best = float("inf")
+            for _ in range(options.repeat):
+                parser._date.cache_clear()
+                start = time.perf_counter()
+                function()
+                best = min(best, time.perf_counter() - start)
+            baseline = baseline or best
+            print(f"{name:>10}: {best:8.3f}s  {baseline / best:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
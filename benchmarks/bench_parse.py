@@ -0,0 +1,52 @@
+"""Compare per line Task creation with the batch parse API
+
+Run with::
+
+    python -m benchmarks.bench_parse --lines 100000
+"""
+import argparse
+import time
+
+import blockbuster.core.parser as parser
+from benchmarks.lines import todotxt_lines
+from blockbuster.core.model import Task
+
+
+def _reference(lines):
+    return [Task(**parser._reference_parse(line)) for line in lines]
+
+
+def _per_line(lines):
+    parser._date.cache_clear()
+    return [Task.from_todotxt(line) for line in lines]
+
+
+def _batch(lines):
+    parser._date.cache_clear()
+    return Task.from_todotxts(lines)
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument("--lines", type=int, default=100_000)
+    arguments.add_argument("--repeat", type=int, default=3)
+    options = arguments.parse_args()
+    lines = todotxt_lines(options.lines)
+
+    baseline = None
+    for name, function in (
+        ("reference", _reference),
+        ("per line", _per_line),
+        ("batch", _batch),
+    ):
+        best = float("inf")
+        for _ in range(options.repeat):
+            start = time.perf_counter()
+            function(lines)
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        print(f"{name:>10}: {best:8.3f}s  {baseline / best:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compare the original Task.__str__ with the cached serializer
+Run with::
+
+    python -m benchmarks.bench_serialize --lines 100000
+"""
+
+import argparse
+import time
+
+import blockbuster.core.serializer as serializer
+from benchmarks.lines import todotxt_lines
+from blockbuster.core.model import Task
+
+
+def _reference(tasks):
+    return [serializer._reference_render(task) for task in tasks]
+
+
+def _uncached(tasks):
+    serializer.format_date.cache_clear()
+    return [serializer._render(task) for task in tasks]
+
+
+def _cached(tasks):
+    return [str(task) for task in tasks]
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument("--lines", type=int, default=100_000)
+    arguments.add_argument("--repeat", type=int, default=3)
+    options = arguments.parse_args()
+    tasks = Task.from_todotxts(todotxt_lines(options.lines))
+    _cached(tasks)
+
+    baseline = None
+    for name, function in (
+        ("reference", _reference),
+        ("uncached", _uncached),
+        ("cached", _cached),
+    ):
+        best = float("inf")
+        for _ in range(options.repeat):
+            start = time.perf_counter()
+            function(tasks)
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        print(f"{name:>10}: {best:8.3f}s  {baseline / best:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare cold starts with and without a snapshot
+Run with::
+
+    python -m benchmarks.bench_snapshot --lines 10000 100000 1000000
+
+For each size, a plain load is compared with a first load which parses the
+file and saves its snapshot and with a load from that snapshot.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import blockbuster.core.parser as parser
+from benchmarks.lines import todotxt_lines
+from blockbuster.core.model import TaskList
+from blockbuster.core.snapshot import Snapshot
+
+
+def _timed(function):
+    parser._date.cache_clear()
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument(
+        "--lines", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    options = arguments.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for count in options.lines:
+            file = Path(directory, f"todo{count}.txt")
+            file.write_text("\n".join(todotxt_lines(count)))
+            snapshot = Snapshot.for_file(file)
+
+            print(f"{count} lines")
+            baseline = _timed(lambda: TaskList.from_file(file))
+            for name, seconds in (
+                ("parse", baseline),
+                (
+                    "parse and save",
+                    _timed(lambda: TaskList.from_file(file, snapshot=snapshot)),
+                ),
+                (
+                    "snapshot",
+                    _timed(lambda: TaskList.from_file(file, snapshot=snapshot)),
+                ),
+            ):
+                print(f"{name:>16}: {seconds:8.3f}s  {baseline / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Measure the throughput of threads reading and changing one TaskList
+Run with::
+
+    python -m benchmarks.bench_threads --readers 1 4 16 --writers 1 --seconds 2
+
+Reader threads repeatedly take the list's tasks and tasks_hash, check that
+the hash is that of the tasks, and count the tasks done, while writer
+threads update a line. Without thread_safe, readers take the list's
+attributes, which a change can leave part way updated. With it, readers
+take the list's published TaskListView, which never changes.
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from hashlib import sha256
+from pathlib import Path
+
+from benchmarks.lines import todotxt_lines
+from blockbuster.core.model import TaskList
+
+
+def _unsafe(task_list):
+    return task_list.tasks, task_list.tasks_hash
+
+
+def _view(task_list):
+    view = task_list.view()
+    return view.tasks, view.tasks_hash
+
+
+MODES = {"unsafe": (False, _unsafe), "thread safe": (True, _view)}
+
+
+def _run(file, readers, writers, seconds, thread_safe, take):
+    task_list = TaskList.from_file(file, thread_safe=thread_safe)
+    done = threading.Event()
+    reads = [0] * readers
+    inconsistent = [0] * readers
+    writes = [0] * writers
+
+    def read(reader):
+        while not done.is_set():
+            tasks, tasks_hash = take(task_list)
+            content = "\n".join(str(task) for task in tasks)
+            if sha256(content.encode("UTF-8")).hexdigest() != tasks_hash:
+                inconsistent[reader] += 1
+            sum(task.done for task in tasks)
+            reads[reader] += 1
+
+    def write(writer):
+        while not done.is_set():
+            count = writes[writer]
+            task_list.update_tasks({writer: f"2019-01-01 Writer {writer} {count}"})
+            writes[writer] += 1
+
+    threads = [threading.Thread(target=read, args=(idx,)) for idx in range(readers)]
+    threads += [threading.Thread(target=write, args=(idx,)) for idx in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    done.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / seconds, sum(writes) / seconds, sum(inconsistent)
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument("--readers", type=int, nargs="+", default=[1, 4, 16])
+    arguments.add_argument("--writers", type=int, default=1)
+    arguments.add_argument("--seconds", type=float, default=2.0)
+    arguments.add_argument("--lines", type=int, default=1000)
+    options = arguments.parse_args()
+
+    lines = todotxt_lines(options.lines)
+    with tempfile.TemporaryDirectory() as directory:
+        file = Path(directory, "todo.txt")
+        for readers in options.readers:
+            print(f"{readers} readers, {options.writers} writers")
+            for mode, (thread_safe, take) in MODES.items():
+                file.write_text("\n".join(lines))
+                reads, writes, inconsistent = _run(
+                    file,
+                    readers,
+                    options.writers,
+                    options.seconds,
+                    thread_safe,
+                    take,
+                )
+                print(
+                    f"{mode:>12}: {reads:8.0f} reads/s  {writes:8.0f} writes/s"
+                    f"  {inconsistent} inconsistent reads"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Generate realistic todo.txt content for the benchmarks"""
+import datetime as dt
+import random
+
+WORDS = (
+    "call email write review plan book fix clean buy pay update check the a "
+    "report plumber invoice meeting draft agenda garden car tax return slides"
+).split()
+PROJECTS = [f"Project{number}" for number in range(50)]
+CONTEXTS = ["home", "work", "phone", "computer", "errands", "office"]
+START = dt.date(2018, 1, 1)
+
+
+def _date(rng):
+    return (START + dt.timedelta(days=rng.randrange(730))).strftime("%Y-%m-%d")
+
+
+def todotxt_line(rng):
+    """A single line in todo.txt format with a typical mix of components"""
+    parts = []
+    done = rng.random() < 0.3
+    if done:
+        parts.append("x")
+    if rng.random() < 0.5:
+        parts.append(f"({rng.choice('ABCD')})")
+    if done:
+        parts.append(_date(rng))
+    parts.append(_date(rng))
+    parts.extend(rng.choice(WORDS) for _ in range(rng.randint(2, 8)))
+    parts.extend(f"+{rng.choice(PROJECTS)}" for _ in range(rng.randint(0, 2)))
+    parts.extend(f"@{rng.choice(CONTEXTS)}" for _ in range(rng.randint(0, 2)))
+    if rng.random() < 0.4:
+        parts.append(f"due:{_date(rng)}")
+    return " ".join(parts)
+
+
+def todotxt_lines(count, seed=0):
+    """A list of count lines in todo.txt format"""
+    rng = random.Random(seed)
+    return [todotxt_line(rng) for _ in range(count)]
@@ -5,3 +5,5 @@ TASKS_ADDED = "blockbuser.core.tasks_added"
 TASKS_DELETED = "blockbuster.core.tasks_deleted"
 TASKS_UPDATED = "blockbuster.core.tasks_updated"
 FILE_READ = "blockbuster.core.file_read"
+TASKS_BATCHED = "blockbuster.core.tasks_batched"
+FILE_FLUSHED = "blockbuster.core.file_flushed"
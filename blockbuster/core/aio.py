@@ -0,0 +1,150 @@
+"""Use todo.txt files from asyncio without blocking the event loop"""
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Optional
+
+import attr
+from blockbuster.core.model import TaskList
+
+
+@attr.s(auto_attribs=True, slots=True)
+class AsyncTaskList:
+    """A TaskList whose reads and changes are awaited
+
+    Each read and change of the wrapped TaskList runs in io_executor, or
+    the event loop's default thread pool, so that neither file I/O nor
+    parsing blocks the loop. Give the TaskList a ProcessPoolExecutor as its
+    executor to parse large files across processes rather than in the
+    thread. Operations on the same list run one at a time, while those on
+    different lists run concurrently.
+
+    Reading tasks or tasks_hash from the loop while an operation on the list
+    is running may see the list part way through it, so await the operation
+    first, or pass thread_safe=True to from_file and read the TaskListView
+    returned by the list's view method.
+
+    Attributes
+    ----------
+    task_list : TaskList
+        the wrapped list
+    io_executor : concurrent.futures.Executor, optional
+        in which reads and changes run, defaulting to the loop's
+    """
+
+    task_list: TaskList
+    io_executor: Optional[Executor] = attr.ib(default=None, repr=False, eq=False)
+    _lock: Optional[asyncio.Lock] = attr.ib(
+        default=None, init=False, repr=False, eq=False
+    )
+
+    @classmethod
+    async def from_file(cls, file, io_executor=None, **kwargs):
+        """Create an AsyncTaskList by reading a file in io_executor
+
+        Further keyword arguments are passed to TaskList.from_file.
+        """
+        loop = asyncio.get_event_loop()
+        task_list = await loop.run_in_executor(
+            io_executor, partial(TaskList.from_file, file, **kwargs)
+        )
+        return cls(task_list=task_list, io_executor=io_executor)
+
+    @classmethod
+    async def from_files(cls, files, io_executor=None, **kwargs):
+        """Create an AsyncTaskList for each of files, reading them concurrently
+
+        Keyword arguments are as for from_file.
+
+        Returns
+        -------
+        list
+            of AsyncTaskList instances, in the order of files
+        """
+        return list(
+            await asyncio.gather(
+                *(cls.from_file(file, io_executor, **kwargs) for file in files)
+            )
+        )
+
+    @property
+    def file(self):
+        return self.task_list.file
+
+    @property
+    def tasks(self):
+        return self.task_list.tasks
+
+    @property
+    def tasks_hash(self):
+        return self.task_list.tasks_hash
+
+    @property
+    def log(self):
+        return self.task_list.log
+
+    async def call(self, function, *args, **kwargs):
+        """Call function with the TaskList, and further arguments, in
+        io_executor once the list's earlier operations have finished
+
+        Returns
+        -------
+        The result of function
+        """
+        # Created here, rather than with the instance, so that it belongs to
+        # the running loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        loop = asyncio.get_event_loop()
+        async with self._lock:
+            return await loop.run_in_executor(
+                self.io_executor, partial(function, self.task_list, *args, **kwargs)
+            )
+
+    async def read_file(self, force=False, verify=False):
+        return await self.call(TaskList.read_file, force=force, verify=verify)
+
+    async def add_tasks(self, additions):
+        return await self.call(TaskList.add_tasks, additions)
+
+    async def delete_tasks(self, deletions):
+        return await self.call(TaskList.delete_tasks, deletions)
+
+    async def update_tasks(self, updates):
+        return await self.call(TaskList.update_tasks, updates)
+
+    async def undo(self):
+        return await self.call(TaskList.undo)
+
+    async def redo(self):
+        return await self.call(TaskList.redo)
+
+    async def retry(self, change, attempts=3):
+        return await self.call(TaskList.retry, change, attempts)
+
+    async def compact(self):
+        return await self.call(TaskList.compact)
+
+    async def flush(self):
+        return await self.call(TaskList.flush)
+
+    async def close(self):
+        return await self.call(TaskList.close)
+
+
+async def read_files(task_lists, force=False, verify=False):
+    """Read the files of many AsyncTaskLists again, concurrently
+
+    Returns
+    -------
+    list
+        of the Event of each read, in the order of task_lists
+    """
+    return list(
+        await asyncio.gather(
+            *(
+                task_list.read_file(force=force, verify=verify)
+                for task_list in task_lists
+            )
+        )
+    )
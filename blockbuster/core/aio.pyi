@@ -0,0 +1,48 @@
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from blockbuster.core.events import EventLog
+from blockbuster.core.model import Event, Task, TaskList
+
+class AsyncTaskList:
+    task_list: TaskList
+    io_executor: Optional[Executor]
+    def __init__(
+        self, task_list: TaskList, io_executor: Optional[Executor] = ...
+    ) -> None: ...
+    @classmethod
+    async def from_file(
+        cls, file: Path, io_executor: Optional[Executor] = ..., **kwargs: Any
+    ) -> AsyncTaskList: ...
+    @classmethod
+    async def from_files(
+        cls, files: Iterable[Path], io_executor: Optional[Executor] = ..., **kwargs: Any
+    ) -> List[AsyncTaskList]: ...
+    @property
+    def file(self) -> Path: ...
+    @property
+    def tasks(self) -> Sequence[Task]: ...
+    @property
+    def tasks_hash(self) -> str: ...
+    @property
+    def log(self) -> EventLog: ...
+    async def call(
+        self, function: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any: ...
+    async def read_file(self, force: bool = ..., verify: bool = ...) -> Event: ...
+    async def add_tasks(self, additions: List[str]) -> Event: ...
+    async def delete_tasks(self, deletions: List[int]) -> Event: ...
+    async def update_tasks(self, updates: Dict[int, str]) -> Event: ...
+    async def undo(self) -> Event: ...
+    async def redo(self) -> Event: ...
+    async def retry(
+        self, change: Callable[[TaskList], Any], attempts: int = ...
+    ) -> Any: ...
+    async def compact(self) -> None: ...
+    async def flush(self) -> None: ...
+    async def close(self) -> None: ...
+
+async def read_files(
+    task_lists: Iterable[AsyncTaskList], force: bool = ..., verify: bool = ...
+) -> List[Event]: ...
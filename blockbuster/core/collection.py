@@ -0,0 +1,63 @@
+"""Load many todo.txt files together"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict
+
+import attr
+from blockbuster.core.model import TaskList
+
+
+@attr.s(auto_attribs=True, slots=True)
+class TaskListCollection:
+    """A class to represent a collection of todo.txt files
+
+    Attributes
+    ----------
+    task_lists : dict
+        mapping each file's Path to its TaskList instance
+    """
+
+    task_lists: Dict[Path, TaskList] = attr.Factory(dict)
+
+    @classmethod
+    def from_files(cls, files, executor=None, max_workers=None):
+        """Create a collection by reading and parsing files in parallel
+
+        Parameters
+        ----------
+        files
+            An iterable of Path instances
+        executor
+            An optional concurrent.futures.Executor with which to load the
+            files. If not given, a ProcessPoolExecutor is used.
+        max_workers
+            The number of processes in the ProcessPoolExecutor, defaulting to
+            the number of CPUs
+        """
+        files = list(files)
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                return cls.from_files(files, executor=pool)
+
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(files) // (workers * 4))
+        task_lists = executor.map(TaskList.from_file, files, chunksize=chunksize)
+        return cls(task_lists=dict(zip(files, task_lists)))
+
+    @classmethod
+    def from_directory(cls, directory, pattern="*.txt", **kwargs):
+        """Create a collection from the files in a directory matching pattern
+
+        Further keyword arguments are passed to from_files.
+        """
+        return cls.from_files(sorted(Path(directory).glob(pattern)), **kwargs)
+
+    def __getitem__(self, file):
+        return self.task_lists[file]
+
+    def __iter__(self):
+        return iter(self.task_lists.values())
+
+    def __len__(self):
+        return len(self.task_lists)
@@ -0,0 +1,23 @@
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+from blockbuster.core.model import TaskList
+
+class TaskListCollection:
+    task_lists: Dict[Path, TaskList]
+    def __init__(self, task_lists: Dict[Path, TaskList] = ...) -> None: ...
+    @classmethod
+    def from_files(
+        cls,
+        files: Iterable[Path],
+        executor: Optional[Executor] = ...,
+        max_workers: Optional[int] = ...,
+    ) -> TaskListCollection: ...
+    @classmethod
+    def from_directory(
+        cls, directory: Union[Path, str], pattern: str = ..., **kwargs: Any
+    ) -> TaskListCollection: ...
+    def __getitem__(self, file: Path) -> TaskList: ...
+    def __iter__(self) -> Iterator[TaskList]: ...
+    def __len__(self) -> int: ...
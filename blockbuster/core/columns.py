@@ -0,0 +1,351 @@
+"""A columnar store of tasks, for lists with very many of them"""
+import datetime as dt
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Sequence
+from itertools import compress
+from typing import Any, Dict, List
+
+import attr
+import blockbuster.core.parser as parser
+from blockbuster.core.model import Task
+
+_INVERT = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+_ID_COLUMNS = (
+    "priorities",
+    "_project_ids",
+    "_context_ids",
+    "_tag_keys",
+    "_tag_values",
+)
+
+
+def _ordinal(date):
+    return date.toordinal() if date else 0
+
+
+def _date(ordinal):
+    return dt.date.fromordinal(ordinal) if ordinal else None
+
+
+def _runs(reused):
+    """Split reused into runs of consecutive previous indices
+
+    Returns
+    -------
+    list
+        of (start, count) tuples, where start is the first previous index of
+        the run, or None for a single new task
+    """
+    runs = []
+    start = None
+    count = 0
+    for previous_idx in reused:
+        if count and previous_idx is not None and previous_idx == start + count:
+            count += 1
+            continue
+        if count:
+            runs.append((start, count))
+        if previous_idx is None:
+            runs.append((None, 1))
+            count = 0
+        else:
+            start = previous_idx
+            count = 1
+    if count:
+        runs.append((start, count))
+    return runs
+
+
+def _shifted(values, shift):
+    return values if not shift else array(values.typecode, [v + shift for v in values])
+
+
+@attr.s(auto_attribs=True, slots=True, eq=False, repr=False)
+class TaskColumns(Sequence):
+    """A sequence of tasks held in columns rather than as Task instances
+
+    Done flags are held in a bytearray and dates as ordinals in arrays.
+    Priorities, projects, contexts and tag keys and values are held as
+    integer ids into a single table of distinct values. Each task's projects,
+    contexts and tags are held as rows of (task index, id) pairs and the
+    descriptions are packed into a single string.
+
+    Indexing returns a new Task instance built from the columns, so changing
+    that instance does not change the columns. Dates are held without any
+    time, so a created_at datetime is returned as a date.
+    """
+
+    done: bytearray = attr.Factory(bytearray)
+    priorities: array = attr.Factory(lambda: array("L"))
+    created_at: array = attr.Factory(lambda: array("l"))
+    completed_at: array = attr.Factory(lambda: array("l"))
+    _values: List[Any] = attr.Factory(lambda: [None])
+    _ids: Dict[Any, int] = attr.Factory(dict)
+    _project_tasks: array = attr.Factory(lambda: array("L"))
+    _project_ids: array = attr.Factory(lambda: array("L"))
+    _context_tasks: array = attr.Factory(lambda: array("L"))
+    _context_ids: array = attr.Factory(lambda: array("L"))
+    _tag_tasks: array = attr.Factory(lambda: array("L"))
+    _tag_keys: array = attr.Factory(lambda: array("L"))
+    _tag_values: array = attr.Factory(lambda: array("L"))
+    _description_offsets: array = attr.Factory(lambda: array("Q", [0]))
+    _descriptions: str = ""
+    _pending: List[str] = attr.Factory(list)
+    _compact_at: int = 0
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Create columns from dicts, as returned by parser.parse, of tasks"""
+        columns = cls()
+        for row in rows:
+            columns.append(row)
+        columns._pack()
+        columns._compact_at = 2 * len(columns._values)
+        return columns
+
+    @classmethod
+    def from_todotxts(cls, todotxts):
+        """Create columns by parsing strings in todo.txt format"""
+        return cls.from_rows(parser.iter_parse(todotxts))
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        """Create columns from Task instances"""
+        return cls.from_rows(attr.asdict(task, recurse=False) for task in tasks)
+
+    def _id(self, value):
+        if value is None:
+            return 0
+        try:
+            return self._ids[value]
+        except KeyError:
+            self._ids[value] = len(self._values)
+            self._values.append(value)
+            return self._ids[value]
+
+    def append(self, task):
+        """Add a task to the end of the columns
+
+        Parameters
+        ----------
+        task
+            A dict, as returned by parser.parse, of the task's attributes
+        """
+        idx = len(self.done)
+        self.done.append(bool(task["done"]))
+        self.priorities.append(self._id(task["priority"]))
+        self.created_at.append(_ordinal(task["created_at"]))
+        self.completed_at.append(_ordinal(task["completed_at"]))
+        for project in task["projects"]:
+            self._project_tasks.append(idx)
+            self._project_ids.append(self._id(project))
+        for context in task["contexts"]:
+            self._context_tasks.append(idx)
+            self._context_ids.append(self._id(context))
+        for key, value in task["tags"].items():
+            self._tag_tasks.append(idx)
+            self._tag_keys.append(self._id(key))
+            self._tag_values.append(self._id(value))
+        self._pending.append(task["description"])
+        self._description_offsets.append(
+            self._description_offsets[-1] + len(task["description"])
+        )
+
+    def rearranged(self, reused, rows):
+        """New columns made of these columns' tasks and of rows
+
+        Runs of consecutive tasks are copied from these columns a slice at a
+        time, so the work grows with the number of runs rather than of
+        tasks. The new columns share the table of distinct values, to which
+        values are only ever added, until it has doubled in size since it was
+        last compacted; then the new columns get a table of only the values
+        they use. These columns are left unchanged.
+
+        Parameters
+        ----------
+        reused
+            for each task of the new columns, the index of the task in these
+            columns, or None to take the next of rows
+        rows
+            dicts, as returned by parser.parse, of the new tasks
+
+        Returns
+        -------
+        TaskColumns
+        """
+        self._pack()
+        columns = TaskColumns(
+            values=self._values, ids=self._ids, compact_at=self._compact_at
+        )
+        rows = iter(rows)
+        offsets = self._description_offsets
+        for start, count in _runs(reused):
+            if start is None:
+                columns.append(next(rows))
+                continue
+            end = start + count
+            shift = len(columns) - start
+            columns.done.extend(self.done[start:end])
+            columns.priorities.extend(self.priorities[start:end])
+            columns.created_at.extend(self.created_at[start:end])
+            columns.completed_at.extend(self.completed_at[start:end])
+            for tasks, value_columns in (
+                ("_project_tasks", ("_project_ids",)),
+                ("_context_tasks", ("_context_ids",)),
+                ("_tag_tasks", ("_tag_keys", "_tag_values")),
+            ):
+                previous = getattr(self, tasks)
+                first = bisect_left(previous, start)
+                last = bisect_left(previous, end, first)
+                getattr(columns, tasks).extend(_shifted(previous[first:last], shift))
+                for name in value_columns:
+                    getattr(columns, name).extend(getattr(self, name)[first:last])
+            columns._pending.append(self._descriptions[offsets[start] : offsets[end]])
+            columns._description_offsets.extend(
+                _shifted(
+                    offsets[start + 1 : end + 1],
+                    columns._description_offsets[-1] - offsets[start],
+                )
+            )
+        columns._pack()
+        if len(columns._values) > columns._compact_at:
+            columns._compact()
+        return columns
+
+    def _compact(self):
+        """Replace the table of distinct values with one of only those in use"""
+        used = set().union(*(getattr(self, name) for name in _ID_COLUMNS))
+        if 2 * len(used | {0}) <= len(self._values):
+            new_ids = [0] * len(self._values)
+            values = [None]
+            for value_id in sorted(used - {0}):
+                new_ids[value_id] = len(values)
+                values.append(self._values[value_id])
+            for name in _ID_COLUMNS:
+                column = getattr(self, name)
+                setattr(
+                    self, name, array(column.typecode, map(new_ids.__getitem__, column))
+                )
+            self._values = values
+            self._ids = {value: new_id for new_id, value in enumerate(values) if new_id}
+        self._compact_at = 2 * len(self._values)
+
+    def _pack(self):
+        if self._pending:
+            self._descriptions += "".join(self._pending)
+            self._pending = []
+
+    def _range(self, tasks, idx):
+        return range(bisect_left(tasks, idx), bisect_left(tasks, idx + 1))
+
+    def row(self, idx):
+        """A dict, as returned by parser.parse, of the task at idx"""
+        self._pack()
+        values = self._values
+        start, end = self._description_offsets[idx : idx + 2]
+        return {
+            "description": self._descriptions[start:end],
+            "done": bool(self.done[idx]),
+            "priority": values[self.priorities[idx]],
+            "completed_at": _date(self.completed_at[idx]),
+            "created_at": _date(self.created_at[idx]),
+            "projects": [
+                values[self._project_ids[pos]]
+                for pos in self._range(self._project_tasks, idx)
+            ],
+            "contexts": [
+                values[self._context_ids[pos]]
+                for pos in self._range(self._context_tasks, idx)
+            ],
+            "tags": {
+                values[self._tag_keys[pos]]: values[self._tag_values[pos]]
+                for pos in self._range(self._tag_tasks, idx)
+            },
+        }
+
+    def __len__(self):
+        return len(self.done)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[pos] for pos in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("task index out of range")
+        return Task(**self.row(idx))
+
+    def _matching(self, values, tasks, value):
+        """Indices of tasks with any entry in values equal to value's id"""
+        value_id = self._ids.get(value)
+        if value_id is None:
+            return set()
+        return set(compress(tasks, map(value_id.__eq__, values)))
+
+    def where(self, done=None, priority=None, project=None, context=None, tag=None):
+        """Find tasks matching all the given criteria, without creating them
+
+        Parameters
+        ----------
+        done
+            If not None, the done flag tasks must have
+        priority
+            If not None, the priority tasks must have
+        project
+            If not None, a project tasks must include
+        context
+            If not None, a context tasks must include
+        tag
+            If not None, a tag key tasks must include
+
+        Returns
+        -------
+        list
+            of the index numbers of the matching tasks, in ascending order
+        """
+        selected = None
+        if done is not None:
+            flags = self.done if done else self.done.translate(_INVERT)
+            selected = set(compress(range(len(self)), flags))
+        if priority is not None:
+            matching = self._matching(self.priorities, range(len(self)), priority)
+            selected = matching if selected is None else selected & matching
+        for value, values, tasks in (
+            (project, self._project_ids, self._project_tasks),
+            (context, self._context_ids, self._context_tasks),
+            (tag, self._tag_keys, self._tag_tasks),
+        ):
+            if value is not None:
+                matching = self._matching(values, tasks, value)
+                selected = matching if selected is None else selected & matching
+        if selected is None:
+            return list(range(len(self)))
+        return sorted(selected)
+
+    def count_where(self, **criteria):
+        """The number of tasks matching the criteria accepted by where"""
+        if not criteria:
+            return len(self)
+        if list(criteria) == ["done"] and criteria["done"] is not None:
+            done = self.done.count(1)
+            return done if criteria["done"] else len(self) - done
+        return len(self.where(**criteria))
+
+    def _counts(self, tasks, ids):
+        values = self._values
+        counts = Counter(value_id for _, value_id in set(zip(tasks, ids)))
+        return Counter({values[value_id]: n for value_id, n in counts.items()})
+
+    def priority_counts(self):
+        """A Counter of the number of tasks with each priority"""
+        return self._counts(range(len(self)), self.priorities)
+
+    def project_counts(self):
+        """A Counter of the number of tasks in each project"""
+        return self._counts(self._project_tasks, self._project_ids)
+
+    def context_counts(self):
+        """A Counter of the number of tasks in each context"""
+        return self._counts(self._context_tasks, self._context_ids)
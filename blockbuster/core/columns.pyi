@@ -0,0 +1,39 @@
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union, overload
+
+from blockbuster.core.model import Task
+
+class TaskColumns(Sequence[Task]):
+    done: bytearray
+    priorities: array
+    created_at: array
+    completed_at: array
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> TaskColumns: ...
+    @classmethod
+    def from_todotxts(cls, todotxts: Iterable[str]) -> TaskColumns: ...
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task]) -> TaskColumns: ...
+    def append(self, task: Dict) -> None: ...
+    def rearranged(
+        self, reused: Sequence[Optional[int]], rows: Iterable[Dict]
+    ) -> TaskColumns: ...
+    def row(self, idx: int) -> Dict: ...
+    def __len__(self) -> int: ...
+    @overload
+    def __getitem__(self, idx: int) -> Task: ...
+    @overload
+    def __getitem__(self, idx: slice) -> List[Task]: ...
+    def where(
+        self,
+        done: Optional[bool] = ...,
+        priority: Optional[str] = ...,
+        project: Optional[str] = ...,
+        context: Optional[str] = ...,
+        tag: Optional[str] = ...,
+    ) -> List[int]: ...
+    def count_where(self, **criteria: Any) -> int: ...
+    def priority_counts(self) -> Counter: ...
+    def project_counts(self) -> Counter: ...
+    def context_counts(self) -> Counter: ...
@@ -0,0 +1,326 @@
+"""Atomic writes of whole todo.txt files, shared by changes which arrive together"""
+import atexit
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+import attr
+import blockbuster.core.io as io
+
+
+def _written_lines(file, lines, fsync):
+    """Replace the content of file with lines, returning any OSError raised"""
+    try:
+        io.replace_lines(lines, file, fsync=fsync)
+    except OSError as error:
+        return error
+    return None
+
+
+@attr.s(auto_attribs=True, slots=True)
+class Committer:
+    """Writes the lines of a todo.txt file atomically, grouping changes
+
+    Each change submits the file's new lines and then waits for them to be
+    written. The first change to wait leads a write: it waits up to window
+    seconds for further changes to be submitted, then writes only the latest
+    lines of each submitted file to a temporary file and replaces the file
+    with it. Every change submitted before that write shares it, so changes
+    from many threads cost one write and one fsync per file. A crash leaves
+    either the old or the new content, never a partly written file. Lists
+    of different files can share a Committer.
+
+    Attributes
+    ----------
+    fsync : bool
+        if True, each write is synced to disk, along with its directory,
+        before the changes waiting for it return
+    window : float
+        the number of seconds for which a write waits for further changes
+    writes : int
+        the number of writes made
+    """
+
+    fsync: bool = True
+    window: float = 0.0
+    writes: int = attr.ib(default=0, init=False)
+    _condition: Any = attr.ib(
+        factory=threading.Condition, init=False, repr=False, eq=False
+    )
+    _pending: Dict[Any, tuple] = attr.ib(factory=dict, init=False, repr=False)
+    _submitted: int = attr.ib(default=0, init=False, repr=False)
+    _written: int = attr.ib(default=0, init=False, repr=False)
+    _leading: bool = attr.ib(default=False, init=False, repr=False)
+    _writing: Dict[Any, tuple] = attr.ib(factory=dict, init=False, repr=False)
+    _failures: Dict[int, OSError] = attr.ib(factory=dict, init=False, repr=False)
+
+    def submit(self, file, lines, written=None):
+        """Submit the new lines of a file, replacing any of the same file not
+        yet written
+
+        Parameters
+        ----------
+        file
+            A Path instance
+        lines
+            A list of lines, as returned by readlines
+        written
+            An optional function, called with no arguments once the lines, or
+            later ones, have been written
+
+        Returns
+        -------
+        int
+            a ticket to pass to wait
+        """
+        with self._condition:
+            self._submitted += 1
+            tickets = self._pending[file][2] if file in self._pending else []
+            tickets.append(self._submitted)
+            self._pending[file] = (lines, written, tickets)
+            return self._submitted
+
+    def busy(self, file=None):
+        """True if submitted lines, of file if it is given, have yet to be
+        written"""
+        if file is None:
+            return self._written < self._submitted
+        return file in self._pending or file in self._writing
+
+    def wait(self, ticket, window=None):
+        """Return once the lines submitted for ticket have been written
+
+        Parameters
+        ----------
+        ticket
+            As returned by submit
+        window
+            If given, the number of seconds to wait for further changes
+            should this call lead the write, rather than the window attribute
+
+        Raises
+        ------
+        OSError
+            if the write which included the ticket's lines failed
+        """
+        with self._condition:
+            self._wait(ticket, window)
+            error = self._failures.pop(ticket, None)
+        if error is not None:
+            raise error
+
+    def _wait(self, ticket, window):
+        """Wait, or lead writes, until ticket is written, with the condition
+        held on entry and exit"""
+        while self._written < ticket:
+            if self._leading:
+                self._condition.wait()
+            else:
+                self._lead(self.window if window is None else window)
+
+    def _lead(self, window):
+        """Write the latest lines of each file, with the condition held on
+        entry and exit"""
+        self._leading = True
+        try:
+            if window:
+                self._condition.wait(window)
+            last = self._submitted
+            pending, self._pending = self._pending, {}
+            self._writing = pending
+            self._condition.release()
+            try:
+                errors = [
+                    _written_lines(file, lines, self.fsync)
+                    for file, (lines, _, _) in pending.items()
+                ]
+            finally:
+                self._condition.acquire()
+            for (_, written, tickets), error in zip(pending.values(), errors):
+                if error is None:
+                    self.writes += 1
+                    if written is not None:
+                        written()
+                else:
+                    self._failures.update((ticket, error) for ticket in tickets)
+            self._written = last
+        finally:
+            self._writing = {}
+            self._leading = False
+            self._condition.notify_all()
+
+    def commit(self, file, lines, written=None):
+        """Submit the new lines of a file and wait for them to be written"""
+        self.wait(self.submit(file, lines, written))
+
+    def flush(self):
+        """Write any lines yet to be written without waiting for more
+
+        Raises
+        ------
+        OSError
+            if the write of the latest lines submitted failed. The error is
+            still raised by wait for their ticket.
+        """
+        with self._condition:
+            ticket = self._submitted
+            self._wait(ticket, window=0)
+            error = self._failures.get(ticket)
+        if error is not None:
+            raise error
+
+    def close(self):
+        """Write any lines yet to be written"""
+        self.flush()
+
+
+_OPEN = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all():
+    for write_behind in list(_OPEN):
+        write_behind.close()
+
+
+@attr.s(auto_attribs=True, slots=True, eq=False)
+class WriteBehind:
+    """Writes the lines of todo.txt files in a background thread, later
+
+    Submitting lines returns at once. A background thread writes the latest
+    lines of each submitted file, atomically as a Committer does, once delay
+    seconds pass without another submission or once max_changes submissions
+    are waiting, whichever comes first. Lines are also written by flush and
+    close, and when the interpreter exits. Lines replaced by later ones of
+    the same file before a write are never written. Lists of different
+    files can share a WriteBehind.
+
+    A failed write is retried after a further delay, and raised by the next
+    flush or close.
+
+    Attributes
+    ----------
+    delay : float
+        the number of seconds without a submission after which lines are
+        written
+    max_changes : int
+        the number of waiting submissions at which lines are written at once
+    fsync : bool
+        if True, each write is synced to disk, along with its directory
+    writes : int
+        the number of files written
+    """
+
+    delay: float = 1.0
+    max_changes: int = 100
+    fsync: bool = True
+    writes: int = attr.ib(default=0, init=False)
+    _condition: Any = attr.ib(
+        factory=threading.Condition, init=False, repr=False, eq=False
+    )
+    _pending: Dict[Any, tuple] = attr.ib(factory=dict, init=False, repr=False)
+    _changes: int = attr.ib(default=0, init=False, repr=False)
+    _changed_at: float = attr.ib(default=0.0, init=False, repr=False)
+    _writing: Dict[Any, tuple] = attr.ib(factory=dict, init=False, repr=False)
+    _failure: Optional[OSError] = attr.ib(default=None, init=False, repr=False)
+    _thread: Optional[threading.Thread] = attr.ib(
+        default=None, init=False, repr=False, eq=False
+    )
+
+    def submit(self, file, lines, written=None):
+        """Submit the new lines of a file, to be written in the background
+
+        Parameters are as for Committer.submit. written is called from
+        whichever thread writes the lines. There is nothing to wait for, so
+        None is returned rather than a ticket.
+        """
+        with self._condition:
+            self._pending[file] = (lines, written)
+            self._changes += 1
+            self._changed_at = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+                _OPEN.add(self)
+            self._condition.notify_all()
+        return None
+
+    def busy(self, file=None):
+        """True if submitted lines, of file if it is given, have yet to be
+        written"""
+        if file is None:
+            return bool(self._pending or self._writing)
+        return file in self._pending or file in self._writing
+
+    def _due_in(self):
+        """The seconds until the waiting lines are due to be written"""
+        if self._changes >= self.max_changes:
+            return 0
+        return self._changed_at + self.delay - time.monotonic()
+
+    def _run(self):
+        with self._condition:
+            while self._thread is not None:
+                if not self._pending or self._writing:
+                    self._condition.wait()
+                elif self._due_in() > 0:
+                    self._condition.wait(self._due_in())
+                else:
+                    self._write()
+
+    def _write(self):
+        """Write the waiting lines of each file, with the condition held on
+        entry and exit"""
+        pending, self._pending = self._pending, {}
+        self._changes = 0
+        self._writing = pending
+        self._condition.release()
+        try:
+            errors = [
+                _written_lines(file, lines, self.fsync)
+                for file, (lines, _) in pending.items()
+            ]
+        finally:
+            self._condition.acquire()
+        failure = None
+        for (file, (lines, written)), error in zip(pending.items(), errors):
+            if error is None:
+                self.writes += 1
+                if written is not None:
+                    written()
+            else:
+                self._pending.setdefault(file, (lines, written))
+                failure = error
+        if failure is not None:
+            self._changed_at = time.monotonic()
+        self._failure = failure
+        self._writing = {}
+        self._condition.notify_all()
+        return failure
+
+    def flush(self):
+        """Write any waiting lines now
+
+        Raises
+        ------
+        OSError
+            if the lines of any file could not be written
+        """
+        with self._condition:
+            while self._writing:
+                self._condition.wait()
+            if self._pending:
+                error = self._write()
+                if error is not None:
+                    raise error
+
+    def close(self):
+        """Write any waiting lines and stop the background thread"""
+        self.flush()
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._condition.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        _OPEN.discard(self)
@@ -0,0 +1,42 @@
+from pathlib import Path
+from typing import Callable, List, Optional
+
+class Committer:
+    fsync: bool
+    window: float
+    writes: int
+    def __init__(self, fsync: bool = ..., window: float = ...) -> None: ...
+    def submit(
+        self,
+        file: Path,
+        lines: List[str],
+        written: Optional[Callable[[], None]] = ...,
+    ) -> int: ...
+    def busy(self, file: Optional[Path] = ...) -> bool: ...
+    def wait(self, ticket: int, window: Optional[float] = ...) -> None: ...
+    def commit(
+        self,
+        file: Path,
+        lines: List[str],
+        written: Optional[Callable[[], None]] = ...,
+    ) -> None: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
+
+class WriteBehind:
+    delay: float
+    max_changes: int
+    fsync: bool
+    writes: int
+    def __init__(
+        self, delay: float = ..., max_changes: int = ..., fsync: bool = ...
+    ) -> None: ...
+    def submit(
+        self,
+        file: Path,
+        lines: List[str],
+        written: Optional[Callable[[], None]] = ...,
+    ) -> None: ...
+    def busy(self, file: Optional[Path] = ...) -> bool: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
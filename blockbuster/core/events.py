@@ -0,0 +1,109 @@
+"""A bounded log of the events of a TaskList, with subscribers"""
+import json
+import logging
+from collections import deque
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import attr
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@attr.s(auto_attribs=True, slots=True, repr=False)
+class EventLog(Sequence):
+    """A sequence of Event instances, oldest first, which notifies subscribers
+
+    Attributes
+    ----------
+    max_length : int, optional
+        the number of events to hold. Once it is reached, the oldest event is
+        removed as each new one is appended. If None, every event is held.
+    spill : pathlib.Path, optional
+        a file to which each removed event is appended as a line of JSON
+    """
+
+    max_length: Optional[int] = attr.ib(default=None, eq=False)
+    spill: Optional[Path] = attr.ib(default=None, eq=False)
+    _events: Deque[Any] = attr.Factory(deque)
+    _subscribers: Dict[Optional[str], List[Tuple[Callable, Any]]] = attr.ib(
+        factory=dict, eq=False
+    )
+
+    def __len__(self):
+        return len(self._events)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return list(self._events)[idx]
+        return self._events[idx]
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def __repr__(self):
+        return f"EventLog({list(self._events)!r})"
+
+    def append(self, event):
+        """Add an event to the log and pass it to its subscribers"""
+        self._events.append(event)
+        if self.max_length is not None:
+            while len(self._events) > self.max_length:
+                self._spill(self._events.popleft())
+        self._notify(event)
+
+    def _spill(self, event):
+        if self.spill is not None:
+            with self.spill.open("a") as writer:
+                writer.write(json.dumps(event.to_dict(), default=str) + "\n")
+
+    def spilled(self):
+        """Yield, oldest first, dicts of the events written to spill
+
+        Dates, times and paths are given as strings.
+        """
+        if self.spill is None or not self.spill.exists():
+            return
+        with self.spill.open("r") as reader:
+            for line in reader:
+                yield json.loads(line)
+
+    def _notify(self, event):
+        for event_type in (event.event_type, None):
+            for callback, executor in self._subscribers.get(event_type, ()):
+                if executor is not None:
+                    executor.submit(callback, event)
+                    continue
+                try:
+                    callback(event)
+                except Exception:  # pylint: disable=broad-except
+                    # The event has already happened, so its caller must not
+                    # see it fail
+                    _LOGGER.exception("subscriber %r failed on %r", callback, event)
+
+    def subscribe(self, callback, event_type=None, executor=None):
+        """Call a function with each event as it is appended
+
+        Parameters
+        ----------
+        callback
+            A function taking an Event as its only argument
+        event_type
+            If given, such as TASKS_ADDED, callback is only called for events
+            of that type. Otherwise it is called for every event.
+        executor
+            If given, a concurrent.futures.Executor to whose submit method
+            callback is passed, so that it runs asynchronously. Otherwise
+            callback is called before append returns, and any exception it
+            raises is logged rather than raised from append.
+        """
+        self._subscribers.setdefault(event_type, []).append((callback, executor))
+
+    def unsubscribe(self, callback, event_type=None):
+        """Stop calling a function which was subscribed for event_type"""
+        self._subscribers[event_type] = [
+            subscriber
+            for subscriber in self._subscribers.get(event_type, ())
+            if subscriber[0] != callback
+        ]
@@ -0,0 +1,29 @@
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, overload
+
+from blockbuster.core.model import Event
+
+class EventLog(Sequence[Event]):
+    max_length: Optional[int]
+    spill: Optional[Path]
+    def __init__(
+        self, max_length: Optional[int] = ..., spill: Optional[Path] = ...
+    ) -> None: ...
+    def __len__(self) -> int: ...
+    @overload
+    def __getitem__(self, idx: int) -> Event: ...
+    @overload
+    def __getitem__(self, idx: slice) -> Sequence[Event]: ...
+    def __iter__(self) -> Iterator[Event]: ...
+    def append(self, event: Event) -> None: ...
+    def spilled(self) -> Iterator[Dict[str, Any]]: ...
+    def subscribe(
+        self,
+        callback: Callable[[Event], Any],
+        event_type: Optional[str] = ...,
+        executor: Optional[Executor] = ...,
+    ) -> None: ...
+    def unsubscribe(
+        self, callback: Callable[[Event], Any], event_type: Optional[str] = ...
+    ) -> None: ...
@@ -0,0 +1,159 @@
+"""Indexes from task attributes to the positions of tasks in a TaskList"""
+from typing import Any, Dict, Set
+
+import attr
+
+
+def _entries(task):
+    """The (field, key) pairs under which a task is indexed"""
+    yield "done", bool(task.done)
+    yield "priority", task.priority
+    for project in task.projects:
+        yield "project", project
+    for context in task.contexts:
+        yield "context", context
+    for key in task.tags:
+        yield "tag", key
+
+
+@attr.s(auto_attribs=True, slots=True)
+class TaskIndex:
+    """A class to map task attributes to the positions of tasks with them
+
+    Attributes
+    ----------
+    positions : dict
+        mapping each of "done", "priority", "project", "context" and "tag"
+        to a dict of the values of that field and the set of positions of
+        tasks having them. Tag entries are keyed by tag key.
+    """
+
+    positions: Dict[str, Dict[Any, Set[int]]] = attr.Factory(
+        lambda: {
+            "done": {},
+            "priority": {},
+            "project": {},
+            "context": {},
+            "tag": {},
+        }
+    )
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        index = cls()
+        for idx, task in enumerate(tasks):
+            index.add(idx, task)
+        return index
+
+    def copy(self):
+        """A copy of the index which can be changed without changing this one"""
+        return TaskIndex(
+            positions={
+                field: {key: set(positions) for key, positions in keys.items()}
+                for field, keys in self.positions.items()
+            }
+        )
+
+    def add(self, idx, task):
+        """Index the task at position idx"""
+        for field, key in _entries(task):
+            self.positions[field].setdefault(key, set()).add(idx)
+
+    def remove(self, idx, task):
+        """Remove the task at position idx from the index"""
+        for field, key in _entries(task):
+            positions = self.positions[field].get(key)
+            if positions is not None:
+                positions.discard(idx)
+                if not positions:
+                    del self.positions[field][key]
+
+    def update(self, previous_tasks, tasks, reused=None, changed=None, removed=None):
+        """Bring the index up to date once tasks have replaced previous_tasks
+
+        Only the tasks at removed and at changed are used, to be removed from
+        and added to the index. Positions are renumbered only if carried over
+        tasks have moved, as they do after a deletion.
+
+        Parameters
+        ----------
+        previous_tasks
+            The sequence of tasks which the index currently describes
+        tasks
+            The sequence of tasks which replaces them
+        reused
+            A list giving, for each of tasks, the position in previous_tasks
+            of the task it was carried over from, or None for a new task. If
+            None, every carried over task keeps its position, and changed and
+            removed must be given.
+        changed
+            The positions in tasks of the new tasks, found from reused if not
+            given
+        removed
+            The positions in previous_tasks of the tasks which were not
+            carried over, found from reused if not given
+        """
+        if removed is None:
+            kept = set(reused)
+            removed = [old for old in range(len(previous_tasks)) if old not in kept]
+        if changed is None:
+            changed = [new for new, old in enumerate(reused) if old is None]
+        for old in removed:
+            self.remove(old, previous_tasks[old])
+
+        if reused is not None:
+            moved = {
+                old: new
+                for new, old in enumerate(reused)
+                if old is not None and old != new
+            }
+            if moved:
+                for keys in self.positions.values():
+                    for key, positions in keys.items():
+                        keys[key] = {moved.get(old, old) for old in positions}
+
+        for new in changed:
+            self.add(new, tasks[new])
+
+    def lookup(self, done=None, priority=None, project=None, context=None, tag=None):
+        """Find the positions of tasks matching all the given criteria
+
+        Parameters
+        ----------
+        done
+            If not None, the done flag tasks must have
+        priority
+            If not None, the priority tasks must have
+        project
+            If not None, a project tasks must include
+        context
+            If not None, a context tasks must include
+        tag
+            If not None, a tag key tasks must include
+
+        Returns
+        -------
+        list
+            of the positions of the matching tasks, in ascending order, or
+            None if no criteria were given
+        """
+        criteria = {
+            "done": done,
+            "priority": priority,
+            "project": project,
+            "context": context,
+            "tag": tag,
+        }
+        candidates = [
+            self.positions[field].get(key, set())
+            for field, key in criteria.items()
+            if key is not None
+        ]
+        if not candidates:
+            return None
+
+        candidates.sort(key=len)
+        smallest, others = candidates[0], candidates[1:]
+        return sorted(
+            idx for idx in smallest if all(idx in positions for positions in others)
+        )
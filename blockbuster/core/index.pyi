@@ -0,0 +1,28 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from blockbuster.core.model import Task
+
+class TaskIndex:
+    positions: Dict[str, Dict[Any, Set[int]]]
+    def __init__(self, positions: Dict[str, Dict[Any, Set[int]]] = ...) -> None: ...
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task]) -> TaskIndex: ...
+    def copy(self) -> TaskIndex: ...
+    def add(self, idx: int, task: Task) -> None: ...
+    def remove(self, idx: int, task: Task) -> None: ...
+    def update(
+        self,
+        previous_tasks: Sequence[Task],
+        tasks: Sequence[Task],
+        reused: Optional[List[Optional[int]]] = ...,
+        changed: Optional[Iterable[int]] = ...,
+        removed: Optional[Iterable[int]] = ...,
+    ) -> None: ...
+    def lookup(
+        self,
+        done: Optional[bool] = ...,
+        priority: Optional[str] = ...,
+        project: Optional[str] = ...,
+        context: Optional[str] = ...,
+        tag: Optional[str] = ...,
+    ) -> Optional[List[int]]: ...
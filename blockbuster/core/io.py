@@ -1,4 +1,56 @@
-def add_tasks(additions, file):
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from io import StringIO
+from itertools import islice
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+@contextmanager
+def locked(file, exclusive=True):
+    """Hold an advisory lock on a todo.txt file
+
+    The lock is taken on a sidecar file alongside the todo.txt file, as
+    replace_lines gives the file itself a new inode. It only excludes other
+    holders of the same lock. Where fcntl is unavailable, no lock is taken.
+
+    The sidecar file is left in place once the lock is released. Removing
+    it while another process waits for the lock would let a third process
+    create and lock a new sidecar, so that both held the lock at once.
+
+    Parameters
+    ----------
+    file
+        A Path instance
+    exclusive
+        If True, wait until no other process holds the lock. Otherwise,
+        share it with other holders which are not exclusive.
+    """
+    with file.with_name(f"{file.name}.lock").open("a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _maybe_locked(file, lock):
+    if not lock:
+        yield
+        return
+    with locked(file):
+        yield
+
+
+def add_tasks(additions, file, lock=True):
     """Add tasks to a todo.txt file
 
     Parameters
@@ -7,20 +59,23 @@ def add_tasks(additions, file):
         A list or tuple of strings in todo.txt format
     file
         A Path instance
+    lock
+        If True, the file's lock is held, as by locked, while it is changed.
+        Pass False if the caller already holds it.
 
     Returns
     -------
     list
         of the tasks in the file after the addition has been made
     """
-    with file.open("a+") as read_writer:
+    with _maybe_locked(file, lock), file.open("a+") as read_writer:
         read_writer.write("\n" + "\n".join(list(additions)))
         read_writer.seek(0)
         tasks = read_writer.readlines()
     return [task.strip() for task in tasks]
 
 
-def delete_tasks(deletions, file):
+def delete_tasks(deletions, file, lock=True):
     """Delete lines from a todo.txt file
 
     Parameters
@@ -30,13 +85,16 @@ def delete_tasks(deletions, file):
         their position in the file
     file
         A Path instance
+    lock
+        If True, the file's lock is held, as by locked, while it is changed.
+        Pass False if the caller already holds it.
 
     Returns
     -------
     list
         of the tasks in the file after the addition has been made
     """
-    with file.open("r+") as read_writer:
+    with _maybe_locked(file, lock), file.open("r+") as read_writer:
         tasks = read_writer.readlines()
         keep_ids = [i for i in range(len(tasks)) if i not in deletions]
         read_writer.seek(0)
@@ -48,7 +106,7 @@ def delete_tasks(deletions, file):
     return [task.strip() for task in tasks]
 
 
-def update_tasks(updates, file):
+def update_tasks(updates, file, lock=True):
     """Update lines in a todo.txt file
 
     Parameters
@@ -58,13 +116,16 @@ def update_tasks(updates, file):
         a string of its updated content
     file
         A Path instance
+    lock
+        If True, the file's lock is held, as by locked, while it is changed.
+        Pass False if the caller already holds it.
 
     Returns
     -------
     list
         of the tasks in the file after the addition has been made
     """
-    with file.open("r+") as read_writer:
+    with _maybe_locked(file, lock), file.open("r+") as read_writer:
         tasks = read_writer.readlines()
         new_tasks = [
             updates[item[0]] if item[0] in updates else tasks[item[0]]
@@ -77,3 +138,304 @@ def update_tasks(updates, file):
         read_writer.seek(0)
         tasks = read_writer.readlines()
     return [task.strip() for task in tasks]
+
+
+def _lines(text):
+    """Split text into lines exactly as readlines on a todo.txt file would"""
+    return StringIO(text, newline=None).readlines()
+
+
+def _addition_text(additions):
+    return "\n" + "\n".join(list(additions))
+
+
+def _update_text(updates, lines):
+    return "\n".join(
+        (updates[idx] if idx in updates else line).strip()
+        for idx, line in enumerate(lines)
+    )
+
+
+def added_lines(additions, lines):
+    """The lines of a todo.txt file after add_tasks, without using the file
+
+    Parameters
+    ----------
+    additions
+        A list or tuple of strings in todo.txt format
+    lines
+        A list of the lines in the file, as returned by readlines
+
+    Returns
+    -------
+    list
+        of the lines add_tasks would leave in the file
+    """
+    tail = (lines[-1] if lines else "") + _addition_text(additions)
+    return lines[:-1] + _lines(tail)
+
+
+def deleted_lines(deletions, lines):
+    """The lines of a todo.txt file after delete_tasks, without using the file
+
+    Parameters
+    ----------
+    deletions
+        A list or tuple of index numbers indicating which tasks to delete by
+        their position in the file
+    lines
+        A list of the lines in the file, as returned by readlines
+
+    Returns
+    -------
+    list
+        of the lines delete_tasks would leave in the file
+    """
+    deletions = set(deletions)
+    return [line for idx, line in enumerate(lines) if idx not in deletions]
+
+
+def updated_lines(updates, lines):
+    """The lines of a todo.txt file after update_tasks, without using the file
+
+    Parameters
+    ----------
+    updates
+        A dictionary mapping the index number of the task within the file to
+        a string of its updated content
+    lines
+        A list of the lines in the file, as returned by readlines
+
+    Returns
+    -------
+    list
+        of the lines update_tasks would leave in the file
+    """
+    return _lines(_update_text(updates, lines))
+
+
+def _inserted(lines, insertions):
+    """lines with each of insertions placed at its index in the result"""
+    result = []
+    remaining = iter(lines)
+    for idx, line in sorted(insertions.items()):
+        result.extend(islice(remaining, max(idx - len(result), 0)))
+        result.append(line)
+    result.extend(remaining)
+    return result
+
+
+def _ended(lines):
+    """lines with every line but the last ending in a newline"""
+    return [
+        line if line.endswith("\n") or idx == len(lines) - 1 else line + "\n"
+        for idx, line in enumerate(lines)
+    ]
+
+
+def _batch_lines(batch, lines):
+    deletions = set(batch["deletions"])
+    updates = batch["updates"]
+    kept = [
+        (updates[idx] if idx in updates else line).strip()
+        for idx, line in enumerate(lines)
+        if idx not in deletions
+    ]
+    kept.extend(batch["additions"])
+    # A blank last line keeps its newline, as otherwise it would be lost
+    text = "".join(line + "\n" for line in kept)
+    if kept and kept[-1]:
+        text = text[:-1]
+    lines = _lines(text)
+    insertions = batch.get("insertions")
+    if insertions:
+        lines = _ended(_inserted(lines, insertions))
+    return lines
+
+
+def batched_lines(batch, lines):
+    """The lines of a todo.txt file after a batch of changes
+
+    Parameters
+    ----------
+    batch
+        A dictionary with "additions", "deletions" and "updates" keys, whose
+        values are as for add_tasks, delete_tasks and update_tasks. Index
+        numbers refer to the lines before any of the changes are made. An
+        optional "insertions" key maps index numbers in the result to
+        lines, as returned by readlines, which are inserted exactly as they
+        are, in index order, once the other changes are made.
+    lines
+        A list of the lines in the file, as returned by readlines
+
+    Returns
+    -------
+    list
+        of the lines once updated and deleted lines are replaced or removed,
+        the additions are appended and any insertions are made
+    """
+    return _batch_lines(batch, lines)
+
+
+def _sync_directory(directory):
+    """Sync a directory so that a file replaced within it survives a crash"""
+    if os.name == "nt":  # pragma: no cover
+        return
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _mode(file):
+    """The permissions of file, or those a new file would be given"""
+    try:
+        return stat.S_IMODE(os.stat(file).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def replace_lines(lines, file, fsync=False):
+    """Replace the content of a todo.txt file in a single step
+
+    The lines are written to a new temporary file alongside the original,
+    which then replaces it, so that readers never see a partially written
+    file. The temporary file takes the original's permissions and, if file
+    is a symbolic link, it replaces the link's target.
+
+    Parameters
+    ----------
+    lines
+        A list of lines, as returned by readlines
+    file
+        A Path instance
+    fsync
+        If True, the temporary file and then the directory are synced to disk
+        so that the new content survives a crash
+    """
+    target = file.resolve()
+    descriptor, temporary = tempfile.mkstemp(
+        prefix=f".{target.name}.", suffix=".tmp", dir=target.parent
+    )
+    try:
+        with os.fdopen(descriptor, "w") as writer:
+            writer.write("".join(lines))
+            if fsync:
+                writer.flush()
+                os.fsync(writer.fileno())
+        os.chmod(temporary, _mode(target))
+        os.replace(temporary, target)
+    except BaseException:
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _sync_directory(target.parent)
+
+
+def apply_additions(additions, file, lines):
+    """Add tasks to a todo.txt file whose content is already known
+
+    The additions are appended to the file, so that readers see its earlier
+    lines unchanged while they are written.
+
+    Parameters
+    ----------
+    additions
+        A list or tuple of strings in todo.txt format
+    file
+        A Path instance
+    lines
+        A list of the lines currently in the file, as returned by readlines
+
+    Returns
+    -------
+    list
+        of the lines in the file after the addition has been made, as
+        add_tasks would have found them but without reading the file
+    """
+    with file.open("a") as writer:
+        writer.write(_addition_text(additions))
+    return added_lines(additions, lines)
+
+
+def apply_deletions(deletions, file, lines):
+    """Delete lines from a todo.txt file whose content is already known
+
+    The file is replaced in a single step, as by replace_lines.
+
+    Parameters
+    ----------
+    deletions
+        A list or tuple of index numbers indicating which tasks to delete by
+        their position in the file
+    file
+        A Path instance
+    lines
+        A list of the lines currently in the file, as returned by readlines
+
+    Returns
+    -------
+    list
+        of the lines in the file after the deletion has been made, as
+        delete_tasks would have found them but without reading the file
+    """
+    lines = deleted_lines(deletions, lines)
+    replace_lines(lines, file)
+    return lines
+
+
+def apply_updates(updates, file, lines):
+    """Update lines in a todo.txt file whose content is already known
+
+    The file is replaced in a single step, as by replace_lines.
+
+    Parameters
+    ----------
+    updates
+        A dictionary mapping the index number of the task within the file to
+        a string of its updated content
+    file
+        A Path instance
+    lines
+        A list of the lines currently in the file, as returned by readlines
+
+    Returns
+    -------
+    list
+        of the lines in the file after the update has been made, as
+        update_tasks would have found them but without reading the file
+    """
+    lines = _lines(_update_text(updates, lines))
+    replace_lines(lines, file)
+    return lines
+
+
+def apply_batch(batch, file, lines):
+    """Make a batch of changes to a todo.txt file whose content is known
+
+    The file is replaced in a single step, as by replace_lines.
+
+    Parameters
+    ----------
+    batch
+        A dictionary with "additions", "deletions" and "updates" keys, and
+        optionally "insertions", as for batched_lines
+    file
+        A Path instance
+    lines
+        A list of the lines currently in the file, as returned by readlines
+
+    Returns
+    -------
+    list
+        of the lines in the file after the changes have been made
+    """
+    lines = _batch_lines(batch, lines)
+    replace_lines(lines, file)
+    return lines
@@ -0,0 +1,217 @@
+"""An append-only journal of changes to a todo.txt file"""
+import json
+import time
+from hashlib import sha256
+from pathlib import Path
+from typing import Optional
+
+import attr
+import blockbuster.core.io as io
+from blockbuster.core import TASKS_ADDED, TASKS_BATCHED, TASKS_DELETED, TASKS_UPDATED
+
+CHANGED_LINES = {
+    TASKS_ADDED: io.added_lines,
+    TASKS_DELETED: io.deleted_lines,
+    TASKS_UPDATED: io.updated_lines,
+    TASKS_BATCHED: io.batched_lines,
+}
+
+
+def _content_hash(lines):
+    return sha256("".join(lines).encode("UTF-8")).hexdigest()
+
+
+def decode_changes(event_type, changes):
+    """Restore the integer keys which JSON turns into strings"""
+    if event_type == TASKS_UPDATED:
+        return {int(idx): update for idx, update in changes.items()}
+    if event_type == TASKS_BATCHED:
+        decoded = dict(changes)
+        for key in ("updates", "insertions"):
+            if key in changes:
+                decoded[key] = decode_changes(TASKS_UPDATED, changes[key])
+        return decoded
+    return changes
+
+
+class JournalError(ValueError):
+    """Raised when it cannot be known whether a journal's records are
+    already in its todo.txt file"""
+
+
+@attr.s(auto_attribs=True, slots=True)
+class Journal:
+    """A sidecar file recording changes yet to be written to a todo.txt file
+
+    The journal's first line holds the hash of the todo.txt content to which
+    its records apply. Each following line is a JSON record of one change.
+    Compaction appends the hash of the content it is about to write before
+    it replaces the todo.txt file, so that a journal left behind once the
+    file was replaced is recognised and removed. If the todo.txt file has
+    instead been changed elsewhere, the records are replayed onto its new
+    content, as a TaskList applies changes to a file changed elsewhere, and
+    the journal is rewritten with the new content's hash.
+
+    Attributes
+    ----------
+    file : pathlib.Path
+        the journal file
+    max_records : int
+        the number of records at which compaction becomes due
+    max_bytes : int
+        the size of the journal, in bytes, at which compaction becomes due
+    max_age : float
+        the number of seconds after its first record at which compaction
+        becomes due
+    """
+
+    file: Path
+    max_records: int = 1000
+    max_bytes: int = 1024 * 1024
+    max_age: float = 300.0
+    _base_hash: Optional[str] = attr.ib(default=None, init=False, repr=False)
+    _records: int = attr.ib(default=0, init=False, repr=False)
+    _bytes: int = attr.ib(default=0, init=False, repr=False)
+    _started_at: Optional[float] = attr.ib(default=None, init=False, repr=False)
+
+    @classmethod
+    def for_file(cls, file, **kwargs):
+        """Create a Journal alongside the todo.txt file at the given Path"""
+        return cls(file=file.with_name(f"{file.name}.journal"), **kwargs)
+
+    def _read_records(self):
+        """The journal's base hash, records and the hash of any compaction
+        which had begun"""
+        try:
+            with self.file.open("r") as reader:
+                lines = reader.readlines()
+        except FileNotFoundError:
+            return None, [], None
+
+        try:
+            base_hash = json.loads(lines[0])["base"] if lines else None
+        except (ValueError, KeyError, TypeError):
+            return None, [], None
+
+        records = []
+        compacted = None
+        for idx, line in enumerate(lines[1:], 1):
+            try:
+                if not line.endswith("\n"):
+                    raise ValueError
+                record = json.loads(line)
+            except ValueError:
+                # A partly written record from an interrupted append. It is
+                # dropped so that later records are not appended to it.
+                with self.file.open("w") as writer:
+                    writer.write("".join(lines[:idx]))
+                break
+            if "compacted" in record:
+                compacted = record["compacted"]
+            else:
+                records.append(record)
+        return base_hash, records, compacted
+
+    def _rewrite(self, records):
+        """Replace the journal with records based on the current content"""
+        lines = [json.dumps({"base": self._base_hash}) + "\n"]
+        lines.extend(json.dumps(record) + "\n" for record in records)
+        io.replace_lines(lines, self.file)
+
+    def _remove(self):
+        try:
+            self.file.unlink()
+        except FileNotFoundError:
+            pass
+
+    def replay(self, lines):
+        """Apply the journal's records to the lines of its todo.txt file
+
+        Parameters
+        ----------
+        lines
+            A list of the lines in the todo.txt file, as returned by readlines
+
+        Returns
+        -------
+        list
+            of the lines with every change in the journal applied
+
+        Raises
+        ------
+        JournalError
+            if a compaction had begun but the file holds neither the content
+            before it nor that which it wrote
+        """
+        self._base_hash = _content_hash(lines)
+        base_hash, records, compacted = self._read_records()
+        if compacted is not None and compacted == self._base_hash:
+            # The compaction replaced the file but did not remove the journal
+            records = []
+            self._remove()
+        elif compacted is not None and base_hash != self._base_hash:
+            raise JournalError(
+                f"{self.file} holds changes which may or may not have been"
+                " written before its todo.txt file was changed elsewhere"
+            )
+        elif compacted is not None or (records and base_hash != self._base_hash):
+            self._rewrite(records)
+
+        for record in records:
+            event_type = record["event_type"]
+            changes = decode_changes(event_type, record["tasks"])
+            lines = CHANGED_LINES[event_type](changes, lines)
+
+        self._records = len(records)
+        self._bytes = self.file.stat().st_size if records else 0
+        self._started_at = time.monotonic() if records else None
+        return lines
+
+    def append(self, event_type, changes):
+        """Record a change to the todo.txt file
+
+        Parameters
+        ----------
+        event_type
+            One of TASKS_ADDED, TASKS_DELETED or TASKS_UPDATED
+        changes
+            The additions, deletions or updates as passed to TaskList
+        """
+        text = json.dumps({"event_type": event_type, "tasks": changes}) + "\n"
+        if not self._records:
+            text = json.dumps({"base": self._base_hash}) + "\n" + text
+            self._started_at = time.monotonic()
+            self._bytes = 0
+        with self.file.open("w" if not self._records else "a") as writer:
+            writer.write(text)
+        self._records += 1
+        self._bytes += len(text.encode("UTF-8"))
+
+    def due(self):
+        """True if the journal has reached any of its thresholds"""
+        return bool(self._records) and (
+            self._records >= self.max_records
+            or self._bytes >= self.max_bytes
+            or time.monotonic() - self._started_at >= self.max_age
+        )
+
+    def compact(self, lines, file):
+        """Write lines to the todo.txt file and empty the journal
+
+        Parameters
+        ----------
+        lines
+            A list of the lines to write, with every change applied
+        file
+            A Path instance for the todo.txt file
+        """
+        target_hash = _content_hash(lines)
+        if self._records:
+            with self.file.open("a") as writer:
+                writer.write(json.dumps({"compacted": target_hash}) + "\n")
+        io.replace_lines(lines, file)
+        self._base_hash = target_hash
+        self._records = 0
+        self._bytes = 0
+        self._started_at = None
+        self._remove()
@@ -0,0 +1,27 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CHANGED_LINES: Dict[str, Any]
+
+def decode_changes(event_type: str, changes: Any) -> Any: ...
+
+class JournalError(ValueError): ...
+
+class Journal:
+    file: Path
+    max_records: int = ...
+    max_bytes: int = ...
+    max_age: float = ...
+    @classmethod
+    def for_file(cls, file: Path, **kwargs: Any) -> Journal: ...
+    def __init__(
+        self,
+        file: Path,
+        max_records: int = ...,
+        max_bytes: int = ...,
+        max_age: float = ...,
+    ) -> None: ...
+    def replay(self, lines: List[str]) -> List[str]: ...
+    def append(self, event_type: str, changes: Any) -> None: ...
+    def due(self) -> bool: ...
+    def compact(self, lines: List[str], file: Path) -> None: ...
@@ -1,22 +1,55 @@
 import datetime as dt
-from hashlib import sha256
+import hashlib
+import os
+import threading
+import zlib
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from functools import partial
+from itertools import compress
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
 
 import attr
 import blockbuster.core.io as io
 import blockbuster.core.parser as parser
+import blockbuster.core.serializer as serializer
 from blockbuster.core import (
-    DATE_FORMAT,
+    FILE_FLUSHED,
     FILE_READ,
     TASKS_ADDED,
+    TASKS_BATCHED,
     TASKS_DELETED,
     TASKS_UPDATED,
 )
+from blockbuster.core.commit import Committer, WriteBehind
+from blockbuster.core.events import EventLog
+from blockbuster.core.index import TaskIndex
+from blockbuster.core.journal import CHANGED_LINES, Journal
 
+_PARALLEL_CHUNK_SIZE = 10000
 
-@attr.s(auto_attribs=True, slots=True)
-class Task:
+
+def _clear_line(task, attribute, value):  # pylint: disable=unused-argument
+    """Discard a task's rendered line when one of its attributes is set"""
+    object.__setattr__(task, "_line", None)
+    return value
+
+
+class _Rendered:
+    """A base for Task holding its rendered line outside its attrs fields
+
+    The slot is unset until the task is first rendered, such as after the
+    task is created or unpickled.
+    """
+
+    __slots__ = ("_line",)
+
+
+@attr.s(auto_attribs=True, slots=True, on_setattr=_clear_line)
+class Task(_Rendered):
     """A class to represent a task
 
     Attributes
@@ -37,6 +70,10 @@ class Task:
         A list of context tags (denoted by a @ prefix in the text definition)
     tags:
         A dict of user defined tag keys and values
+
+    The task's string in todo.txt format is kept once rendered. It is
+    discarded whenever an attribute is set, and rendered again if the
+    projects, contexts or tags have been changed in place.
     """
 
     description: str
@@ -53,32 +90,90 @@ class Task:
         """Create a Task instance from a string in todo.txt format"""
         return cls(**parser.parse(todotxt))
 
+    @classmethod
+    def from_todotxts(cls, todotxts):
+        """Create a list of Task instances from strings in todo.txt format"""
+        return [cls(**task) for task in parser.parse_many(todotxts)]
+
     def __str__(self):
-        optional_prefixes = ""
-        minimal_text = f"{self.created_at.strftime(DATE_FORMAT)} {self.description}"
-        optional_suffixes = ""
+        return serializer.render(self)
 
-        if self.done:
-            optional_prefixes += "x "
 
-        if self.priority:
-            optional_prefixes += f"({self.priority}) "
+_HEAD, _BODY = 1, 2
 
-        if self.completed_at:
-            optional_prefixes += f"{self.completed_at.strftime(DATE_FORMAT)} "
 
-        for project in self.projects:
-            if project:
-                optional_suffixes += f" +{project}"
+def _lazy_field(name, stage):
+    """A property which decodes a LazyTask attribute when first used"""
+    slot = Task.__dict__[name]
 
-        for context in self.contexts:
-            if context:
-                optional_suffixes += f" @{context}"
+    def get(task):
+        if task._decoded < stage:  # pylint: disable=protected-access
+            task._decode(stage)  # pylint: disable=protected-access
+        return slot.__get__(task)
 
-        for key, value in self.tags.items():  # pylint: disable=no-member
-            optional_suffixes += f" {key}:{value}"
+    def set_(task, value):
+        if task._decoded < stage:  # pylint: disable=protected-access
+            task._decode(stage)  # pylint: disable=protected-access
+        slot.__set__(task, value)
 
-        return optional_prefixes + minimal_text + optional_suffixes
+    return property(get, set_)
+
+
+class LazyTask(Task):
+    """A Task which decodes its attributes from its line when first used
+
+    The done flag and priority are decoded together from the start of the
+    line and the remaining attributes are decoded together when any of them
+    is first used. Until an attribute is set, the task's string is its line,
+    exactly as it was read.
+    """
+
+    __slots__ = ("_todotxt", "_decoded")
+
+    description = _lazy_field("description", _BODY)
+    done = _lazy_field("done", _HEAD)
+    priority = _lazy_field("priority", _HEAD)
+    completed_at = _lazy_field("completed_at", _BODY)
+    created_at = _lazy_field("created_at", _BODY)
+    projects = _lazy_field("projects", _BODY)
+    contexts = _lazy_field("contexts", _BODY)
+    tags = _lazy_field("tags", _BODY)
+
+    def __init__(self, todotxt):  # pylint: disable=super-init-not-called
+        # Task's __setattr__ is bypassed as these are not Task attributes
+        todotxt = todotxt.rstrip("\n")
+        object.__setattr__(self, "_todotxt", todotxt)
+        object.__setattr__(self, "_line", (todotxt, None, None, None))
+        object.__setattr__(self, "_decoded", 0)
+
+    def _decode(self, stage):
+        """Decode the attributes of every stage up to and including stage"""
+        done, priority, todotxt = parser.parse_head(self._todotxt)
+        if self._decoded < _HEAD:
+            Task.done.__set__(self, done)
+            Task.priority.__set__(self, priority)
+        if stage == _BODY:
+            for name, value in parser.parse_body(todotxt).items():
+                Task.__dict__[name].__set__(self, value)
+        object.__setattr__(self, "_decoded", stage)
+        if stage == _BODY and self._line is not None:
+            # The lists and tags can now be changed in place
+            line = serializer.line_cache(self._line[0], self)
+            object.__setattr__(self, "_line", line)
+
+    def __reduce__(self):
+        # Pickled as an equal Task, which needs no line to decode
+        fields = attr.fields(Task)
+        return Task, tuple(getattr(self, field.name) for field in fields if field.init)
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return all(
+            getattr(self, field.name) == getattr(other, field.name)
+            for field in attr.fields(Task)
+            if field.eq
+        )
 
 
 @attr.s(auto_attribs=True, slots=True, frozen=True)
@@ -88,14 +183,234 @@ class Event:
     prior_hash: str
     new_hash: str
     tasks: List[str] = attr.Factory(list)
-    occurred_at: dt.datetime = dt.datetime.now()
+    occurred_at: dt.datetime = attr.Factory(dt.datetime.now)
+    cached: bool = False
+    inverse: Optional[Tuple[str, Any]] = None
 
     def to_dict(self):
         return attr.asdict(self)
 
 
 def _tasks_hash(tasks):
-    return sha256("\n".join(tasks).encode("UTF-8")).hexdigest()
+    return hashlib.sha256("\n".join(tasks).encode("UTF-8")).hexdigest()
+
+
+def _task_digest(task, algorithm=None):
+    """The part of a tasks hash which comes from a single task
+
+    This is the task's string in todo.txt format if algorithm is None and
+    otherwise its digest using the named hashlib algorithm.
+    """
+    if algorithm is None:
+        return str(task)
+    return hashlib.new(algorithm, str(task).encode("UTF-8")).digest()
+
+
+def _combined_hash(digests, algorithm=None):
+    """The tasks hash for the per-task digests returned by _task_digest
+
+    With an algorithm, the digests are combined in order by hashing them
+    together and the result is prefixed with the algorithm name, so that it
+    never equals a hash made another way.
+    """
+    if algorithm is None:
+        return _tasks_hash(digests)
+    return f"{algorithm}:{hashlib.new(algorithm, b''.join(digests)).hexdigest()}"
+
+
+@attr.s(auto_attribs=True, slots=True)
+class Batch:
+    """A collection of changes to be made to a TaskList together
+
+    Index numbers for deletions and updates refer to the position of tasks
+    before any of the batch's changes are made.
+
+    Attributes
+    ----------
+    additions : list
+        of strings in todo.txt format
+    deletions : list
+        of index numbers of tasks to delete
+    updates : dict
+        mapping index numbers of tasks to strings of their updated content
+    event : Event
+        the Event for the batch, once it has been made
+    """
+
+    additions: List[str] = attr.Factory(list)
+    deletions: List[int] = attr.Factory(list)
+    updates: Dict[int, str] = attr.Factory(dict)
+    event: Optional[Event] = attr.ib(default=None, init=False)
+
+    def add_tasks(self, additions):
+        self.additions.extend(additions)  # pylint: disable=no-member
+
+    def delete_tasks(self, deletions):
+        self.deletions.extend(deletions)  # pylint: disable=no-member
+
+    def update_tasks(self, updates):
+        self.updates.update(updates)  # pylint: disable=no-member
+
+    def to_dict(self):
+        return {
+            "additions": list(self.additions),
+            "deletions": list(self.deletions),
+            "updates": dict(self.updates),
+        }
+
+
+@attr.s(auto_attribs=True, slots=True)
+class TasksHash:
+    """Compute the hash of a list of tasks one task at a time
+
+    Once every task has been passed to update, hexdigest gives the same value
+    as the tasks_hash of a TaskList holding those tasks and using the same
+    hash_algorithm.
+    """
+
+    algorithm: Optional[str] = None
+    _hash: Any = attr.ib(default=None, repr=False)
+    _separator: bytes = attr.ib(default=b"", repr=False)
+
+    def __attrs_post_init__(self):
+        if self._hash is None:
+            self._hash = hashlib.new(self.algorithm or "sha256")
+
+    def update(self, task):
+        """Add a task, or its string in todo.txt format, to the hash"""
+        if self.algorithm is None:
+            self._hash.update(self._separator + str(task).encode("UTF-8"))
+            self._separator = b"\n"
+        else:
+            self._hash.update(_task_digest(task, self.algorithm))
+
+    def hexdigest(self):
+        if self.algorithm is None:
+            return self._hash.hexdigest()
+        return f"{self.algorithm}:{self._hash.hexdigest()}"
+
+
+def _shifted(position, insertions):
+    """The index of a line once lines are inserted at the sorted insertions"""
+    for idx in insertions:
+        if idx > position:
+            break
+        position += 1
+    return position
+
+
+def _inverse(event_type, changes, before, after):
+    """The event type and changes which turn the lines after a change back
+    into those before it
+
+    Only the changed lines are examined. Deleted lines are kept in the
+    inverse, to be inserted again, and updated lines are replaced with their
+    previous content. Additions end the previous last line with a newline,
+    so their inverse replaces that line with its original, exactly.
+    """
+    if event_type == TASKS_ADDED:
+        if not before:
+            return TASKS_DELETED, list(range(len(after)))
+        last = len(before) - 1
+        return TASKS_BATCHED, {
+            "additions": [],
+            "deletions": list(range(last, len(after))),
+            "updates": {},
+            "insertions": {last: before[last]},
+        }
+    if event_type == TASKS_UPDATED:
+        previous = {idx: before[idx] for idx in changes if 0 <= idx < len(before)}
+        return TASKS_UPDATED, previous
+    if event_type == TASKS_DELETED:
+        changes = {"additions": [], "deletions": changes, "updates": {}}
+
+    deleted = {idx for idx in changes["deletions"] if 0 <= idx < len(before)}
+    deletions = sorted(deleted)
+    inserted = sorted(changes.get("insertions", {}))
+    kept = len(before) - len(deletions)
+    added = range(kept, len(after) - len(inserted))
+    previous = {
+        _shifted(idx - bisect_left(deletions, idx), inserted): before[idx]
+        for idx in changes["updates"]
+        if 0 <= idx < len(before) and idx not in deleted
+    }
+    return TASKS_BATCHED, {
+        "additions": [],
+        "deletions": inserted + [_shifted(idx, inserted) for idx in added],
+        "updates": previous,
+        "insertions": {idx: before[idx] for idx in deletions},
+    }
+
+
+def _patched(previous, length, changed, values):
+    """A list of the first length items of previous, padded with None, with
+    values placed at the indices in changed"""
+    patched = list(previous[:length])
+    patched.extend([None] * (length - len(patched)))
+    for idx, value in zip(changed, values):
+        patched[idx] = value
+    return patched
+
+
+def _checksum(lines):
+    return zlib.crc32("".join(lines).encode("UTF-8"))
+
+
+def _signature(stat):
+    """The parts of an os.stat_result which change when a file is written"""
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class _ChangeLock:
+    """A reentrant lock which is pickled as a new lock, so that a TaskList
+    can be returned from another process"""
+
+    __slots__ = ("_lock",)
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        return self._lock.__enter__()
+
+    def __exit__(self, *exc_info):
+        return self._lock.__exit__(*exc_info)
+
+    def __reduce__(self):
+        return _ChangeLock, ()
+
+
+class ConflictError(ValueError):
+    """Raised when a change is based on tasks which have changed since"""
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class TaskListView:
+    """The tasks of a TaskList at one moment, with the hash, index and
+    positions which describe them
+
+    It has the attributes of a TaskList which queries use, so a Query can be
+    run against it.
+
+    Attributes
+    ----------
+    file : pathlib.Path
+        the todo.txt file
+    tasks : tuple or TaskColumns
+        of the tasks
+    tasks_hash : str
+        the hash of tasks
+    index : TaskIndex, optional
+        of tasks, if the list is indexed
+    positions : tuple, optional
+        the position in the file of each of tasks, if the list has a where
+    """
+
+    file: Path
+    tasks: Sequence[Task]
+    tasks_hash: str
+    index: Optional[TaskIndex] = None
+    positions: Optional[Tuple[int, ...]] = None
 
 
 @attr.s(auto_attribs=True, slots=True)
@@ -109,57 +424,770 @@ class TaskList:
     tasks :  list or tuple
         of Task instances representing the file contents
     tasks_hash : str
-        sha256 hash of the tasks content
-    log : List
-        of Event instances
+        sha256 hash of the tasks content, or a combination of the hashes of
+        each task if there is a hash_algorithm
+    log : EventLog
+        of Event instances, which can be bounded, spilled to a file and
+        subscribed to
+    journal : Journal, optional
+        if given, changes are recorded in the journal and only written to
+        the file itself when the journal is compacted
+    executor : concurrent.futures.Executor, optional
+        if given, large numbers of lines are parsed in chunks using its map
+        method, such as across the processes of a ProcessPoolExecutor
+    columnar : bool
+        if True, tasks is a blockbuster.core.columns.TaskColumns instance,
+        which holds the tasks in columns and creates Task instances on demand.
+        The lines of the file are still kept, so that changes are derived
+        from them and unchanged tasks are found when it is read again, and
+        together take about as much memory as the columns.
+    index : TaskIndex, optional
+        if given, kept up to date with the positions of tasks by their
+        attributes whenever the tasks change
+    hash_algorithm : str, optional
+        if given, the name of a hashlib algorithm, such as "blake2b", with
+        which each task is hashed separately. tasks_hash then combines those
+        digests, so that only changed tasks are hashed again, and is prefixed
+        with the algorithm's name. Otherwise tasks_hash is the sha256 hash of
+        the tasks content, for which the strings of unchanged tasks are kept
+        rather than formatted again.
+    lazy : bool
+        if True, tasks are LazyTask instances, which decode their attributes
+        only when they are first used and whose strings are the lines as
+        read from the file. It has no effect if columnar is True.
+    where : blockbuster.core.query.Predicate, optional
+        if given, only tasks matching it are held. Lines which the
+        predicate's prefilter rules out are never parsed. columnar has no
+        effect when where is given.
+    positions : list, optional
+        when where is given, the position in the file of each of tasks, by
+        which delete_tasks and update_tasks refer to them
+    snapshot : blockbuster.core.snapshot.Snapshot, optional
+        if given, tasks are loaded from the snapshot rather than parsed when
+        none can be carried over from a previous read, and the snapshot is
+        saved whenever it cannot be used. It has no effect if lazy or
+        columnar is True.
+    max_undo : int
+        the number of changes which can be undone
+    locking : bool
+        if True, the file is read under a shared advisory lock and changed
+        under an exclusive one, so that lists in other processes which also
+        lock neither lose each other's changes nor read a partly written file.
+        The lock is held on a sidecar file, as by io.locked, which is left in
+        place.
+    compare_and_swap : bool
+        if True, each change is made under the exclusive lock only if the
+        file still holds the tasks of tasks_hash. Otherwise, the file is read
+        again and ConflictError is raised, so that the change can be retried
+        against the current tasks, such as by the retry method. Implies
+        locking.
+    committer : Committer or WriteBehind, optional
+        if given, each change is written by replacing the whole file
+        atomically, with the committer's durability. The tasks are changed
+        in memory, and the Event logged, before the change is written. With
+        a Committer, changes made from many threads at once share writes and
+        each change returns once it is written. A change whose write fails
+        raises OSError but is kept in memory, to be written with the next
+        change. With a WriteBehind, changes return at once and are written
+        later by a background thread, or by flush or close. Each write is
+        logged as a FILE_FLUSHED Event, whose hashes are those of the tasks
+        written, by the next read, change or flush of the list rather than
+        by the thread which wrote it. A committer can be shared by lists of
+        different files. With locking, each change is written before the lock is
+        released. It has no effect if there is a journal.
+    thread_safe : bool
+        if True, tasks is a tuple, or TaskColumns instance, which is never
+        changed once set, and the index is copied rather than changed, so
+        that threads can use them while other threads change the list. Each
+        change and read publishes a TaskListView whose tasks, tasks_hash,
+        index and positions always belong together, as returned by view.
+        Changes and reads of the file are made one at a time whether or not
+        the list is thread safe.
     """
 
     file: Path
     tasks: List[Task] = attr.Factory(list)
     tasks_hash: str = attr.Factory(str)
-    log: List[Event] = attr.Factory(list)
+    log: EventLog = attr.Factory(EventLog)
+    journal: Optional[Journal] = None
+    executor: Optional[Executor] = attr.ib(default=None, repr=False, eq=False)
+    columnar: bool = False
+    index: Optional[TaskIndex] = attr.ib(default=None, repr=False, eq=False)
+    hash_algorithm: Optional[str] = None
+    lazy: bool = False
+    where: Optional[Any] = attr.ib(default=None, repr=False, eq=False)
+    positions: Optional[List[int]] = attr.ib(
+        default=None, init=False, repr=False, eq=False
+    )
+    snapshot: Optional[Any] = attr.ib(default=None, repr=False, eq=False)
+    max_undo: int = attr.ib(default=100, repr=False, eq=False)
+    _undo: Deque[Event] = attr.ib(
+        default=attr.Factory(lambda self: deque(maxlen=self.max_undo), takes_self=True),
+        init=False,
+        repr=False,
+        eq=False,
+    )
+    _redo: List[Event] = attr.ib(factory=list, init=False, repr=False, eq=False)
+    locking: bool = attr.ib(default=False, repr=False, eq=False)
+    compare_and_swap: bool = attr.ib(default=False, repr=False, eq=False)
+    _lock_depth: int = attr.ib(default=0, init=False, repr=False, eq=False)
+    committer: Optional[Union[Committer, WriteBehind]] = attr.ib(
+        default=None, repr=False, eq=False
+    )
+    thread_safe: bool = attr.ib(default=False, repr=False, eq=False)
+    _view: Optional[TaskListView] = attr.ib(
+        default=None, init=False, repr=False, eq=False
+    )
+    _change_lock: _ChangeLock = attr.ib(
+        factory=_ChangeLock, init=False, repr=False, eq=False
+    )
+    _ticket: Optional[int] = attr.ib(default=None, init=False, repr=False, eq=False)
+    _flushed: Deque[tuple] = attr.ib(factory=deque, init=False, repr=False, eq=False)
+    _lines: List[str] = attr.ib(factory=list, init=False, repr=False, eq=False)
+    _task_lines: List[str] = attr.ib(factory=list, init=False, repr=False, eq=False)
+    _file_signature: Optional[tuple] = attr.ib(
+        default=None, init=False, repr=False, eq=False
+    )
+    _file_checksum: Optional[int] = attr.ib(
+        default=None, init=False, repr=False, eq=False
+    )
+    _task_digests: List[Any] = attr.ib(factory=list, init=False, repr=False, eq=False)
 
     @classmethod
-    def from_file(cls, file):
-        task = cls(file=file)
+    def from_file(
+        cls,
+        file,
+        journal=None,
+        executor=None,
+        columnar=False,
+        indexed=False,
+        hash_algorithm=None,
+        lazy=False,
+        where=None,
+        snapshot=None,
+        log=None,
+        max_undo=100,
+        locking=False,
+        compare_and_swap=False,
+        committer=None,
+        thread_safe=False,
+    ):
+        task = cls(
+            file=file,
+            journal=journal,
+            executor=executor,
+            columnar=columnar,
+            index=TaskIndex() if indexed else None,
+            hash_algorithm=hash_algorithm,
+            lazy=lazy,
+            where=where,
+            snapshot=snapshot,
+            log=EventLog() if log is None else log,
+            max_undo=max_undo,
+            locking=locking,
+            compare_and_swap=compare_and_swap,
+            committer=committer,
+            thread_safe=thread_safe,
+        )
         file.touch()
         task.read_file()
         return task
 
-    def read_file(self):
+    @staticmethod
+    def iter_tasks(file, tasks_hash=None):
+        """Yield the tasks in a todo.txt file one at a time
+
+        The file is read and parsed line by line, so memory use does not grow
+        with the size of the file.
+
+        Parameters
+        ----------
+        file
+            A Path instance
+        tasks_hash
+            An optional TasksHash instance which is updated with each task as
+            it is yielded
+
+        Yields
+        ------
+        Task
+        """
+        with file.open("r") as reader:
+            for task in parser.iter_parse(reader):
+                task = Task(**task)
+                if tasks_hash is not None:
+                    tasks_hash.update(task)
+                yield task
+
+    def _parse(self, lines):
+        """Create tasks for lines, in parallel chunks if there is an executor"""
+        if self.lazy:
+            return [LazyTask(line) for line in lines]
+        if self.executor is None or len(lines) <= _PARALLEL_CHUNK_SIZE:
+            return Task.from_todotxts(lines)
+
+        chunks = [
+            lines[start : start + _PARALLEL_CHUNK_SIZE]
+            for start in range(0, len(lines), _PARALLEL_CHUNK_SIZE)
+        ]
+        return [
+            task
+            for tasks in self.executor.map(Task.from_todotxts, chunks)
+            for task in tasks
+        ]
+
+    def _parse_changed(self, lines, known=None):
+        """Create tasks for lines, reusing those from the previous read
+
+        Each line read from the file is kept as the fingerprint of the task
+        parsed from it. Lines which appeared in the previous read take their
+        existing Task instance and only new or changed lines are parsed.
+
+        If known is given, as returned by _reused for the change which gave
+        lines, the lines are not compared.
+        """
+        aligned = False
+        positions = None
+        if self.where is not None:
+            positions, lines = self._prefilter(lines)
+            self.positions = positions
+        if known is not None:
+            reused, changed, aligned = known
+        elif lines == self._task_lines and self.tasks_hash:
+            return self.tasks
+        else:
+            reused, changed = self._compare_lines(lines)
+
+        if self.columnar and self.where is None:
+            tasks = self._columns_changed(lines, reused, changed)
+        elif self.snapshot is not None and not self.lazy and len(changed) == len(lines):
+            tasks = self._parse_snapshot(lines)
+        else:
+            parsed = self._parse([lines[idx] for idx in changed])
+            if aligned:
+                tasks = _patched(self.tasks, len(lines), changed, parsed)
+            else:
+                parsed = iter(parsed)
+                tasks = [
+                    next(parsed) if previous_idx is None else self.tasks[previous_idx]
+                    for previous_idx in reused
+                ]
+
+        if self.where is not None:
+            # Reused tasks matched when they were first parsed
+            keep = [
+                idx
+                for idx, task in enumerate(tasks)
+                if reused[idx] is not None or self.where.matches(task)
+            ]
+            tasks = [tasks[idx] for idx in keep]
+            reused = [reused[idx] for idx in keep]
+            lines = [lines[idx] for idx in keep]
+            self.positions = [positions[idx] for idx in keep]
+
+        if self.index is not None:
+            if self.thread_safe:
+                # The published index may be in use
+                self.index = self.index.copy()
+            if aligned:
+                # Only the tasks at changed have been replaced or added
+                replaced = [idx for idx in changed if idx < len(self.tasks)]
+                self.index.update(self.tasks, tasks, None, changed, replaced)
+            else:
+                self.index.update(self.tasks, tasks, reused)
+        self._hash_tasks(tasks, lines, reused, changed if aligned else None)
+        self._task_lines = lines
+        return tasks
+
+    def _compare_lines(self, lines):
+        """The index of the previous task for each line, or None if the line
+        is new, and the indices of the new lines"""
+        previous = {}
+        for idx in reversed(range(min(len(self._task_lines), len(self.tasks)))):
+            previous.setdefault(self._task_lines[idx], []).append(idx)
+
+        reused = []
+        changed = []
+        for idx, line in enumerate(lines):
+            reusable = previous.get(line)
+            if reusable:
+                reused.append(reusable.pop())
+            else:
+                reused.append(None)
+                changed.append(idx)
+        return reused, changed
+
+    def _reused(self, event_type, changes, lines):
+        """The index of the previous task for each of the lines after a change
+        and the indices of the new lines, without comparing them
+
+        Returns
+        -------
+        tuple
+            of the lists returned by _compare_lines and whether each previous
+            task keeps its index, or None if the change's lines must be
+            compared. Additions and deletions leave the other lines exactly
+            as they were, as do updates unless they change the endings of
+            other lines, which is checked without parsing them.
+        """
+        before = self._lines
+        if self.where is not None or len(before) != len(self.tasks):
+            return None
+        if event_type == TASKS_ADDED:
+            added = range(len(before), len(lines))
+            return list(range(len(before))) + [None] * len(added), list(added), True
+        if event_type == TASKS_DELETED:
+            deleted = set(changes)
+            return [idx for idx in range(len(before)) if idx not in deleted], [], False
+        if event_type == TASKS_UPDATED and len(lines) == len(before):
+            changed = sorted(idx for idx in changes if 0 <= idx < len(before))
+            patched = list(before)
+            for idx in changed:
+                patched[idx] = lines[idx]
+            if patched != lines:
+                return None
+            reused = list(range(len(before)))
+            for idx in changed:
+                reused[idx] = None
+            return reused, changed, True
+        return None
+
+    def _parse_snapshot(self, lines):
+        """Load tasks for lines from the snapshot, or parse and save them"""
+        tasks = self.snapshot.load(lines)
+        if tasks is None:
+            tasks = self._parse(lines)
+            self.snapshot.save(lines, tasks)
+        return tasks
+
+    def _prefilter(self, lines):
+        """The positions and lines of those lines which may match where
+
+        Lines are first checked with the predicate's prefilter, if it has
+        one, so that lines which cannot match are never parsed.
+        """
+        check = self.where.prefilter()
+        if check is None:
+            return list(range(len(lines))), lines
+        positions = list(compress(range(len(lines)), map(check, lines)))
+        return positions, [lines[idx] for idx in positions]
+
+    def _hash_tasks(self, tasks, lines, reused, changed=None):
+        """Set tasks_hash, hashing only those tasks which were not reused
+
+        If changed is given, every other task keeps its index, so the
+        digests are copied and only those at changed are replaced.
+
+        For columnar tasks without a hash algorithm, a task whose string is
+        its line, as is usual, has None as its digest rather than a second
+        copy of the line, and the line is used in its place.
+        """
+        algorithm = self.hash_algorithm
+        by_line = self.columnar and self.where is None and algorithm is None
+
+        def digest(idx):
+            task_digest = _task_digest(tasks[idx], algorithm)
+            if by_line and task_digest == lines[idx].rstrip("\n"):
+                return None
+            return task_digest
+
+        digests = self._task_digests
+        if len(digests) != len(self.tasks):
+            digests = [_task_digest(task, algorithm) for task in self.tasks]
+        if changed is not None:
+            changed_digests = [digest(idx) for idx in changed]
+            digests = _patched(digests, len(tasks), changed, changed_digests)
+        else:
+            digests = [
+                digest(idx) if previous_idx is None else digests[previous_idx]
+                for idx, previous_idx in enumerate(reused)
+            ]
+        self._task_digests = digests
+        if by_line:
+            digests = [
+                line.rstrip("\n") if task_digest is None else task_digest
+                for task_digest, line in zip(digests, lines)
+            ]
+        self.tasks_hash = _combined_hash(digests, algorithm)
+
+    def _columns_changed(self, lines, reused, changed):
+        """Create columns for lines, copying unchanged tasks from the previous
+        columns without decoding them"""
+        # Imported here as the columns module builds upon this one
+        from blockbuster.core.columns import TaskColumns
+
+        previous = self.tasks
+        if not isinstance(previous, TaskColumns):
+            previous = TaskColumns.from_tasks(previous)
+        return previous.rearranged(
+            reused, parser.parse_many(lines[idx] for idx in changed)
+        )
+
+    def _publish(self, tasks):
+        """Make tasks those of the list, along with the hash, index and
+        positions which _parse_changed has set for them"""
+        if not self.thread_safe:
+            self.tasks = tasks
+            return
+        if isinstance(tasks, list):
+            tasks = tuple(tasks)
+        positions = None if self.positions is None else tuple(self.positions)
+        self.tasks = tasks
+        self._view = TaskListView(
+            file=self.file,
+            tasks=tasks,
+            tasks_hash=self.tasks_hash,
+            index=self.index,
+            positions=positions,
+        )
+
+    def view(self):
+        """The tasks with their hash, index and positions
+
+        If the list is thread safe, this is the TaskListView published by
+        the latest change or read, which no later change alters. Otherwise,
+        it holds the list's current attributes, which later changes may
+        alter.
+
+        Returns
+        -------
+        TaskListView
+        """
+        if self._view is not None:
+            return self._view
+        return TaskListView(
+            file=self.file,
+            tasks=self.tasks,
+            tasks_hash=self.tasks_hash,
+            index=self.index,
+            positions=self.positions,
+        )
+
+    @contextmanager
+    def _locked(self, exclusive):
+        """Hold the file's lock if locking, unless the list already holds it"""
+        if self._lock_depth or not (self.locking or self.compare_and_swap):
+            yield
+            return
+        with io.locked(self.file, exclusive):
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+
+    def read_file(self, force=False, verify=False):
+        """Read and parse the file, unless it is unchanged since the last read
+
+        The file is taken to be unchanged if its modification time, size and
+        inode all match those at the last read. Reads and changes from
+        different threads are made one at a time.
+
+        Parameters
+        ----------
+        force
+            If True, read and parse the file whether or not it has changed
+        verify
+            If True, confirm that an apparently unchanged file is unchanged by
+            comparing a checksum of its content with that of the last read
+
+        Returns
+        -------
+        Event
+            of type FILE_READ, whose cached attribute is True if the file was
+            found to be unchanged and so was not parsed
+        """
+        with self._change_lock:
+            return self._read_file(force, verify)
+
+    def _read_file(self, force, verify):
+        if self.committer is not None:
+            if self.committer.busy(self.file):
+                self.committer.flush()
+            self._take_flushed()
         prior_hash = self.tasks_hash
-        with self.file.open("r") as reader:
-            tasks_raw = reader.readlines()
-        self.tasks = [Task.from_todotxt(todotxt) for todotxt in tasks_raw]
-        self.tasks_hash = _tasks_hash([str(task) for task in self.tasks])
+        with self._locked(exclusive=False):
+            with self.file.open("r") as reader:
+                signature = _signature(os.fstat(reader.fileno()))
+                cached = not force and signature == self._file_signature
+                if cached and verify:
+                    checksum = self._file_checksum
+                    cached = (
+                        checksum is not None and _checksum([reader.read()]) == checksum
+                    )
+                    reader.seek(0)
+                if not cached:
+                    lines = reader.readlines()
+            if not cached:
+                self._file_checksum = _checksum(lines)
+                if self.journal is not None:
+                    lines = self.journal.replay(lines)
+
+        if not cached:
+            self._publish(self._parse_changed(lines))
+            self._file_signature = signature
+            self._lines = lines
+
         event = Event(
             event_type=FILE_READ,
             file=self.file,
             prior_hash=prior_hash,
             new_hash=self.tasks_hash,
+            cached=cached,
         )
         self.log.append(event)  # pylint: disable=no-member
         return event
 
-    def _change_tasks(self, event_type, changes):
-        actions = {
-            TASKS_ADDED: io.add_tasks,
-            TASKS_DELETED: io.delete_tasks,
-            TASKS_UPDATED: io.update_tasks,
-        }
+    def _record_change(self, event_type, changes, lines):
+        """Make lines the content of the list and log the change to them"""
         prior_hash = self.tasks_hash
-        actions[event_type](changes, self.file)
+        inverse = _inverse(event_type, changes, self._lines, lines)
+        known = self._reused(event_type, changes, lines)
+        self._publish(self._parse_changed(lines, known))
+        self._lines = lines
         event = Event(
             event_type=event_type,
             tasks=changes,
             file=self.file,
             prior_hash=prior_hash,
             new_hash=self.tasks_hash,
+            inverse=inverse,
         )
         self.log.append(event)  # pylint: disable=no-member
-        self.read_file()
         return event
 
+    def _apply_changes(self, event_type, changes):
+        """Write changes to the file and apply them to the tasks in memory
+
+        The file's new content is derived from the lines of the previous
+        read, so it is neither read beforehand nor read back afterwards.
+        """
+        actions = {
+            TASKS_ADDED: io.apply_additions,
+            TASKS_DELETED: io.apply_deletions,
+            TASKS_UPDATED: io.apply_updates,
+            TASKS_BATCHED: io.apply_batch,
+        }
+        if self.committer is None:
+            lines = actions[event_type](changes, self.file, self._lines)
+            self._file_signature = _signature(self.file.stat())
+            self._file_checksum = None
+            return self._record_change(event_type, changes, lines)
+
+        # The same lines as the file, journal and event store would hold
+        lines = CHANGED_LINES[event_type](changes, self._lines)
+        event = self._record_change(event_type, changes, lines)
+        written = partial(self._committed, event.new_hash)
+        ticket = self.committer.submit(self.file, lines, written)
+        if not self._lock_depth:
+            self._ticket = ticket
+        elif ticket is None:
+            self.committer.flush()
+        else:
+            self.committer.wait(ticket, window=0)
+        return event
+
+    def _committed(self, tasks_hash):
+        """Keep the signature of the file which the committer has written
+
+        The committer calls this from whichever thread wrote the file, so
+        the list itself is left to _take_flushed, in a thread changing it.
+        """
+        self._flushed.append((tasks_hash, _signature(self.file.stat())))
+
+    def _take_flushed(self):
+        """Note the signature of each file the committer has written since,
+        and log the writes, with the change lock held"""
+        while self._flushed:
+            tasks_hash, signature = self._flushed.popleft()
+            self._file_signature = signature
+            self._file_checksum = None
+            event = Event(
+                event_type=FILE_FLUSHED,
+                file=self.file,
+                prior_hash=tasks_hash,
+                new_hash=tasks_hash,
+            )
+            self.log.append(event)  # pylint: disable=no-member
+
+    def flush(self):
+        """Write any changes which the committer has yet to write"""
+        if self.committer is not None:
+            with self._change_lock:
+                self.committer.flush()
+                self._take_flushed()
+
+    def close(self):
+        """Write any changes which the committer has yet to write and stop
+        any background thread writing them"""
+        if self.committer is not None:
+            with self._change_lock:
+                self.committer.close()
+                self._take_flushed()
+
+    def _journal_changes(self, event_type, changes):
+        """Record changes in the journal and apply them to the tasks in memory
+
+        The journal is compacted into the file once it reaches any of its
+        thresholds.
+        """
+        lines = CHANGED_LINES[event_type](changes, self._lines)
+        self.journal.append(event_type, changes)
+        event = self._record_change(event_type, changes, lines)
+        if self.journal.due():
+            self.compact()
+        return event
+
+    def _file_changed(self):
+        """True if the file may have been written since it was last read
+
+        Whilst the committer has yet to write changes, the file is taken to
+        be unchanged, as the tasks in memory are newer.
+        """
+        if self.committer is not None:
+            if self.committer.busy(self.file):
+                return False
+            self._take_flushed()
+        return not self.file.exists() or self._file_signature != _signature(
+            self.file.stat()
+        )
+
+    def compact(self):
+        """Write any changes held in the journal to the file"""
+        if self.journal is not None:
+            with self._change_lock, self._locked(exclusive=True):
+                self.journal.compact(self._lines, self.file)
+                self._file_signature = _signature(self.file.stat())
+                self._file_checksum = None
+
+    def _change_tasks(self, event_type, changes):
+        """Make changes and keep the event for undo, unless it cannot be
+        inverted as the file was changed elsewhere"""
+        with self._change_lock:
+            with self._locked(exclusive=True):
+                if self.compare_and_swap:
+                    self._check_unchanged(self.tasks_hash)
+                event = self._make_changes(event_type, changes)
+            self._redo.clear()
+            if event.inverse is None:
+                self._undo.clear()
+            else:
+                self._undo.append(event)
+            ticket, self._ticket = self._ticket, None
+        if ticket is not None:
+            self.committer.wait(ticket)
+            with self._change_lock:
+                self._take_flushed()
+        return event
+
+    def _check_unchanged(self, tasks_hash):
+        """Raise ConflictError, having read the file, unless it holds the
+        tasks of tasks_hash"""
+        if self.compare_and_swap:
+            self.read_file(verify=True)
+        elif self._file_changed():
+            self.read_file()
+        if self.tasks_hash != tasks_hash:
+            raise ConflictError(
+                f"the tasks' hash is {self.tasks_hash} rather than {tasks_hash}"
+            )
+
+    def _make_changes(self, event_type, changes):
+        if self._file_changed():
+            # The change is made to, and inverted against, the lines which
+            # are in the file now
+            self.read_file()
+        if self.journal is not None:
+            return self._journal_changes(event_type, changes)
+        return self._apply_changes(event_type, changes)
+
+    def _revert(self, events, reverted):
+        """Apply the inverse of the latest of events and move its own inverse
+        to reverted"""
+        with self._change_lock:
+            if not events:
+                raise IndexError("there is no change to revert")
+            event = events[-1]
+            event_type, changes = event.inverse
+            with self._locked(exclusive=True):
+                self._check_unchanged(event.new_hash)
+                if self.journal is not None:
+                    inverse = self._journal_changes(event_type, changes)
+                else:
+                    inverse = self._apply_changes(event_type, changes)
+            events.pop()
+            reverted.append(inverse)
+            ticket, self._ticket = self._ticket, None
+        if ticket is not None:
+            self.committer.wait(ticket)
+            with self._change_lock:
+                self._take_flushed()
+        return inverse
+
+    def undo(self):
+        """Revert the latest change which has not been undone
+
+        Only the changed lines are rewritten in memory, from the content kept
+        in the change's Event, and the tasks for unchanged lines are reused.
+
+        Returns
+        -------
+        Event
+            for the reverting change, which can itself be reverted by redo
+
+        Raises
+        ------
+        IndexError
+            if there is no change to undo
+        ConflictError
+            if the tasks have changed since, so that their tasks_hash is no
+            longer the new_hash of the change's Event
+        """
+        return self._revert(self._undo, self._redo)
+
+    def redo(self):
+        """Make the latest undone change again
+
+        Returns
+        -------
+        Event
+            for the change, which can be undone again
+
+        Raises
+        ------
+        IndexError
+            if there is no undone change, or a change has been made since
+        ConflictError
+            if the tasks have changed since the change was undone
+        """
+        return self._revert(self._redo, self._undo)
+
+    def retry(self, change, attempts=3):
+        """Make changes, trying again while they conflict with other writers
+
+        Parameters
+        ----------
+        change
+            A function taking the TaskList as its only argument, which makes
+            its changes based on the list's current tasks. After a
+            ConflictError, the list holds the file's current tasks and the
+            function is called again.
+        attempts
+            The number of times to call change before the ConflictError is
+            raised
+
+        Returns
+        -------
+        whatever change returns
+        """
+        for attempt in range(1, attempts + 1):
+            try:
+                return change(self)
+            except ConflictError:
+                if attempt == attempts:
+                    raise
+        return None
+
     def add_tasks(self, additions):
         return self._change_tasks(TASKS_ADDED, additions)
 
@@ -168,3 +1196,22 @@ class TaskList:
 
     def update_tasks(self, updates):
         return self._change_tasks(TASKS_UPDATED, updates)
+
+    @contextmanager
+    def batch(self):
+        """Collect changes and make them together when the block exits
+
+        The changes are written to the file in one step and logged as a
+        single TASKS_BATCHED Event. Nothing is changed if the block raises an
+        exception.
+
+        Yields
+        ------
+        Batch
+            whose add_tasks, delete_tasks and update_tasks methods collect
+            the changes
+        """
+        batch = Batch()
+        yield batch
+        if batch.additions or batch.deletions or batch.updates:
+            batch.event = self._change_tasks(TASKS_BATCHED, batch.to_dict())
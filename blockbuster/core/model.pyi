@@ -1,6 +1,26 @@
 import datetime as dt
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from blockbuster.core.commit import Committer, WriteBehind
+from blockbuster.core.events import EventLog
+from blockbuster.core.index import TaskIndex
+from blockbuster.core.journal import Journal
+from blockbuster.core.query import Predicate
+from blockbuster.core.snapshot import Snapshot
 
 class Task:
     description: str
@@ -13,6 +33,8 @@ class Task:
     tags: Dict[str, str] = ...
     @classmethod
     def from_todotxt(cls, todotxt: str): ...
+    @classmethod
+    def from_todotxts(cls, todotxts: Iterable[str]) -> List[Task]: ...
     def __init__(self) -> None: ...
     def __ne__(self, other: Any) -> bool: ...
     def __eq__(self, other: Any) -> bool: ...
@@ -21,6 +43,9 @@ class Task:
     def __gt__(self, other: Any) -> bool: ...
     def __ge__(self, other: Any) -> bool: ...
 
+class LazyTask(Task):
+    def __init__(self, todotxt: str) -> None: ...
+
 class Event:
     event_type: str
     tasks: List[str]
@@ -28,6 +53,8 @@ class Event:
     prior_hash: str
     new_hash: str
     occurred_at: dt.datetime = ...
+    cached: bool = ...
+    inverse: Optional[Tuple[str, Any]] = ...
     def to_dict(self) -> Dict: ...
     def __init__(self) -> None: ...
     def __ne__(self, other: Any) -> bool: ...
@@ -37,14 +64,90 @@ class Event:
     def __gt__(self, other: Any) -> bool: ...
     def __ge__(self, other: Any) -> bool: ...
 
+class Batch:
+    additions: List[str]
+    deletions: List[int]
+    updates: Dict[int, str]
+    event: Optional[Event]
+    def add_tasks(self, additions: List[str]) -> None: ...
+    def delete_tasks(self, deletions: List[int]) -> None: ...
+    def update_tasks(self, updates: Dict[int, str]) -> None: ...
+    def to_dict(self) -> Dict: ...
+
+class TasksHash:
+    algorithm: Optional[str]
+    def __init__(self, algorithm: Optional[str] = ...) -> None: ...
+    def update(self, task: Union[Task, str]) -> None: ...
+    def hexdigest(self) -> str: ...
+
+class ConflictError(ValueError): ...
+
+class TaskListView:
+    file: Path
+    tasks: Sequence[Task]
+    tasks_hash: str
+    index: Optional[TaskIndex] = ...
+    positions: Optional[Tuple[int, ...]] = ...
+    def __init__(
+        self,
+        file: Path,
+        tasks: Sequence[Task],
+        tasks_hash: str,
+        index: Optional[TaskIndex] = ...,
+        positions: Optional[Tuple[int, ...]] = ...,
+    ) -> None: ...
+
 class TaskList:
     file: Path
-    tasks: List[Task]
+    tasks: Sequence[Task]
     tasks_hash: str
-    log: List[Event]
+    log: EventLog
+    journal: Optional[Journal]
+    executor: Optional[Executor]
+    columnar: bool
+    index: Optional[TaskIndex]
+    hash_algorithm: Optional[str]
+    lazy: bool
+    where: Optional[Predicate]
+    positions: Optional[List[int]]
+    snapshot: Optional[Snapshot]
+    max_undo: int
+    locking: bool
+    compare_and_swap: bool
+    committer: Optional[Union[Committer, WriteBehind]]
+    thread_safe: bool
     @classmethod
-    def from_file(cls, file: Path): ...
-    def read_file(self) -> None: ...
+    def from_file(
+        cls,
+        file: Path,
+        journal: Optional[Journal] = ...,
+        executor: Optional[Executor] = ...,
+        columnar: bool = ...,
+        indexed: bool = ...,
+        hash_algorithm: Optional[str] = ...,
+        lazy: bool = ...,
+        where: Optional[Predicate] = ...,
+        snapshot: Optional[Snapshot] = ...,
+        log: Optional[EventLog] = ...,
+        max_undo: int = ...,
+        locking: bool = ...,
+        compare_and_swap: bool = ...,
+        committer: Optional[Union[Committer, WriteBehind]] = ...,
+        thread_safe: bool = ...,
+    ) -> TaskList: ...
+    @staticmethod
+    def iter_tasks(
+        file: Path, tasks_hash: Optional[TasksHash] = ...
+    ) -> Iterator[Task]: ...
+    def view(self) -> TaskListView: ...
+    def read_file(self, force: bool = ..., verify: bool = ...) -> Event: ...
     def add_tasks(self, additions: List[str]) -> Event: ...
     def delete_tasks(self, deletions: List[int]) -> Event: ...
     def update_tasks(self, updates: Dict[int, str]) -> Event: ...
+    def compact(self) -> None: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
+    def undo(self) -> Event: ...
+    def redo(self) -> Event: ...
+    def retry(self, change: Callable[[TaskList], Any], attempts: int = ...) -> Any: ...
+    def batch(self) -> ContextManager[Batch]: ...
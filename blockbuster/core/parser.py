@@ -1,6 +1,14 @@
 """Functions to parse a string in todo.txt format"""
+
 import datetime as dt
 import re
+import sys
+from functools import lru_cache
+
+_PRIORITY = re.compile(r"\s*\((\S)\)")
+_WHITESPACE = re.compile(r"(\s+)")
+_DATE_PREFIX = re.compile(r"\d{4}-\d{2}-\d{2}")
+_DATE_VALUE = re.compile(r"\d{4}-\d{2}-\d{2}$")
 
 
 def _done(todotxt):
@@ -132,8 +140,13 @@ def _tags(todotxt):
     return tags, todotxt
 
 
-def parse(todotxt):
-    """
+def _reference_parse(todotxt):
+    """The original, stage by stage, implementation of parse
+
+    Each stage removes its own portion of the string before handing on to the
+    next. It is kept as the reference against which the single pass tokenizer
+    is tested.
+
     Returns
     -------
     dict suitable for creating a Task instance
@@ -162,3 +175,145 @@ def parse(todotxt):
     task["description"] = todotxt.strip()
 
     return task
+
+
+@lru_cache(maxsize=4096)
+def _date(text):
+    """Decode a date, memoized because lists reuse the same dates repeatedly"""
+    return dt.datetime.strptime(text, "%Y-%m-%d").date()
+
+
+def _tag_value(value):
+    return _date(value) if _DATE_VALUE.match(value) else value
+
+
+def parse_head(todotxt):
+    """Parse the done flag and priority from a string in todo.txt format
+
+    Returns
+    -------
+    tuple
+        boolean indicating whether the task is complete
+        Any priority character
+        The rest of the string, to be passed to parse_body
+    """
+    todotxt = todotxt.strip()
+    done = todotxt.startswith("x")
+    if done:
+        todotxt = todotxt[1:].strip()
+
+    priority = None
+    match = _PRIORITY.search(todotxt) if "(" in todotxt else None
+    if match:
+        priority = match.group(0).strip().lstrip("(").rstrip(")")
+        todotxt = (todotxt[: match.start()] + todotxt[match.end() :]).strip()
+    return done, priority, todotxt
+
+
+def parse_body(todotxt):
+    """Parse the rest of a string in todo.txt format, as left by parse_head
+
+    Returns
+    -------
+    dict
+        of the description, dates, projects, contexts and tags
+    """
+    projects = []
+    contexts = []
+    tags = {}
+    dates = []
+    tokens = _WHITESPACE.split(todotxt)
+    word = tokens[0]
+    if _DATE_PREFIX.match(word):
+        dates.append(word[:10])
+        word = word[10:]
+    description = [word]
+
+    for index in range(1, len(tokens), 2):
+        space, word = tokens[index], tokens[index + 1]
+        if word.find(":", 1, len(word) - 1) > 0:
+            key, value = word.split(":")[:2]
+            tags[sys.intern(key)] = value
+        elif word[0] == "+" and len(word) > 1:
+            projects.append(sys.intern(word.lstrip("+")))
+        elif word[0] == "@" and len(word) > 1:
+            contexts.append(sys.intern(word.lstrip("@")))
+        elif _DATE_PREFIX.match(word):
+            dates.append(word[:10])
+            description.append(space[0] + word[10:])
+        else:
+            description.append(space + word)
+
+    if tags:
+        tags = {key: _tag_value(value) for key, value in tags.items()}
+
+    completed_at = None
+    if len(dates) == 2:
+        completed_at, created_at = _date(dates[0]), _date(dates[1])
+    elif dates:
+        created_at = _date(dates[0])
+    else:
+        created_at = dt.datetime.now()
+
+    return {
+        "description": "".join(description).strip(),
+        "completed_at": completed_at,
+        "created_at": created_at,
+        "projects": projects,
+        "contexts": contexts,
+        "tags": tags,
+    }
+
+
+def parse(todotxt):
+    """Parse a string in todo.txt format in a single pass
+
+    The done flag and priority are taken from the start of the line by
+    parse_head. parse_body then splits the rest once into words and the
+    whitespace between them. Each word is classified, left to right, as a
+    tag, project, context, date or part of the description. The result is
+    identical to that of _reference_parse.
+
+    Project, context and tag key strings are interned so that repeated values
+    share a single object and decoded dates are cached between calls.
+
+    Returns
+    -------
+    dict suitable for creating a Task instance
+    """
+    done, priority, todotxt = parse_head(todotxt)
+    return {"done": done, "priority": priority, **parse_body(todotxt)}
+
+
+def parse_many(todotxts):
+    """Parse many strings in todo.txt format
+
+    Parameters
+    ----------
+    todotxts
+        An iterable of strings in todo.txt format, such as the lines of a file
+
+    Returns
+    -------
+    list
+        of dicts suitable for creating Task instances, in the same order as
+        todotxts. The dicts share the date and string caches used by parse.
+    """
+    return [parse(todotxt) for todotxt in todotxts]
+
+
+def iter_parse(todotxts):
+    """Parse strings in todo.txt format one at a time
+
+    Parameters
+    ----------
+    todotxts
+        An iterable of strings in todo.txt format, such as an open file
+
+    Yields
+    ------
+    dict
+        suitable for creating a Task instance, as each string is consumed
+    """
+    for todotxt in todotxts:
+        yield parse(todotxt)
@@ -1,3 +1,7 @@
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+def parse_head(todotxt: str) -> Tuple[bool, Optional[str], str]: ...
+def parse_body(todotxt: str) -> Dict: ...
 def parse(todotxt: str) -> Dict: ...
+def parse_many(todotxts: Iterable[str]) -> List[Dict]: ...
+def iter_parse(todotxts: Iterable[str]) -> Iterator[Dict]: ...
@@ -0,0 +1,400 @@
+"""Queries over the tasks in a TaskList
+Predicates are combined with & (and), | (or) and ~ (not)::
+
+    query = Query(
+        where=Project("Work") & ~Done() & PriorityRange("A", "B"),
+        sort="priority",
+        limit=10,
+    )
+    for task in query.run(task_list):
+        ...
+
+Where a TaskList has an index, or holds its tasks in columns, predicates
+find their matching positions from those directly. The positions from the
+most selective of them are then checked against the remaining predicates,
+so that only those tasks are examined.
+
+Predicates can also test raw lines before they are parsed, so that a TaskList
+created with a where predicate only parses lines which may match it.
+"""
+
+import datetime as dt
+import heapq
+from collections import OrderedDict
+from itertools import compress
+from typing import Any, Optional, Tuple
+
+import attr
+from blockbuster.core.columns import TaskColumns
+
+CACHE_SIZE = 256
+_CACHE: "OrderedDict[Tuple[str, Query], Tuple[int, ...]]" = OrderedDict()
+
+
+def _as_date(value):
+    return value.date() if isinstance(value, dt.datetime) else value
+
+
+def _lookup(task_list, **criteria):
+    """Positions from the task list's index or columns, if it has either"""
+    if task_list.index is not None:
+        return set(task_list.index.lookup(**criteria))
+    if isinstance(task_list.tasks, TaskColumns):
+        return set(task_list.tasks.where(**criteria))
+    return None
+
+
+class Predicate:
+    """The base class for conditions that tasks may satisfy"""
+
+    __slots__ = ()
+
+    def matches(self, task):
+        """True if the task satisfies the predicate"""
+        raise NotImplementedError
+
+    def positions(self, task_list):
+        """The set of positions of matching tasks in task_list
+
+        Returns None if they can only be found by examining every task.
+        """
+        return None
+
+    def prefilter(self):
+        """A cheap test of a raw todo.txt line for a possible match
+
+        The returned function is False for lines whose task cannot match, so
+        that they need not be parsed. It may be True for lines whose task does
+        not match.
+
+        Returns None if there is no such test.
+        """
+        return None
+
+    def __and__(self, other):
+        return And((self, other))
+
+    def __or__(self, other):
+        return Or((self, other))
+
+    def __invert__(self):
+        return Not(self)
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class Done(Predicate):
+    value: bool = True
+
+    def matches(self, task):
+        return bool(task.done) == self.value
+
+    def positions(self, task_list):
+        return _lookup(task_list, done=self.value)
+
+    def prefilter(self):
+        if self.value:
+            return lambda line: line.lstrip().startswith("x")
+        return lambda line: not line.lstrip().startswith("x")
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class Priority(Predicate):
+    """Tasks with the given priority; use ~PriorityRange("A", "Z") for none"""
+
+    value: str = attr.ib(validator=attr.validators.instance_of(str))
+
+    def matches(self, task):
+        return task.priority == self.value
+
+    def positions(self, task_list):
+        return _lookup(task_list, priority=self.value)
+
+    def prefilter(self):
+        text = f"({self.value})"
+        return lambda line: text in line
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class PriorityRange(Predicate):
+    """Tasks with a priority from low to high inclusive, such as "A" to "C" """
+
+    low: str
+    high: str
+
+    def matches(self, task):
+        return task.priority is not None and self.low <= task.priority <= self.high
+
+    def positions(self, task_list):
+        if task_list.index is None:
+            return None
+        positions = set()
+        for priority, idxs in task_list.index.positions["priority"].items():
+            if priority is not None and self.low <= priority <= self.high:
+                positions |= idxs
+        return positions
+
+    def prefilter(self):
+        return lambda line: "(" in line
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class Project(Predicate):
+    name: str
+
+    def matches(self, task):
+        return self.name in task.projects
+
+    def positions(self, task_list):
+        return _lookup(task_list, project=self.name)
+
+    def prefilter(self):
+        text = f"+{self.name}"
+        return lambda line: text in line
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class Context(Predicate):
+    name: str
+
+    def matches(self, task):
+        return self.name in task.contexts
+
+    def positions(self, task_list):
+        return _lookup(task_list, context=self.name)
+
+    def prefilter(self):
+        text = f"@{self.name}"
+        return lambda line: text in line
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class Tag(Predicate):
+    """Tasks with the tag key and, if given, that value for it"""
+
+    key: str
+    value: Any = None
+
+    def matches(self, task):
+        if self.value is None:
+            return self.key in task.tags
+        return task.tags.get(self.key) == self.value
+
+    def positions(self, task_list):
+        positions = _lookup(task_list, tag=self.key)
+        if positions is None or self.value is None:
+            return positions
+        tasks = task_list.tasks
+        return {idx for idx in positions if self.matches(tasks[idx])}
+
+    def prefilter(self):
+        text = f"{self.key}:"
+        return lambda line: text in line
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class _DateRange(Predicate):
+    start: Optional[dt.date] = None
+    end: Optional[dt.date] = None
+    _field = ""
+
+    def _contains(self, date):
+        return (
+            date is not None
+            and (self.start is None or self.start <= date)
+            and (self.end is None or date <= self.end)
+        )
+
+    def matches(self, task):
+        return self._contains(_as_date(getattr(task, self._field)))
+
+    def positions(self, task_list):
+        tasks = task_list.tasks
+        if not isinstance(tasks, TaskColumns):
+            return None
+        low = self.start.toordinal() if self.start else 1
+        high = self.end.toordinal() if self.end else dt.date.max.toordinal()
+        ordinals = getattr(tasks, self._field)
+        return set(
+            compress(
+                range(len(tasks)), (low <= ordinal <= high for ordinal in ordinals)
+            )
+        )
+
+
+class CreatedBetween(_DateRange):
+    """Tasks created from start to end inclusive, either of which may be None"""
+
+    __slots__ = ()
+    _field = "created_at"
+
+
+class CompletedBetween(_DateRange):
+    """Tasks completed from start to end inclusive, either of which may be None"""
+
+    __slots__ = ()
+    _field = "completed_at"
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class And(Predicate):
+    predicates: Tuple[Predicate, ...]
+
+    def matches(self, task):
+        return all(predicate.matches(task) for predicate in self.predicates)
+
+    def positions(self, task_list):
+        found = []
+        unindexed = []
+        for predicate in self.predicates:
+            positions = predicate.positions(task_list)
+            if positions is None:
+                unindexed.append(predicate)
+            else:
+                found.append(positions)
+        if not found:
+            return None
+
+        found.sort(key=len)
+        positions = found[0].intersection(*found[1:])
+        tasks = task_list.tasks
+        return {
+            idx
+            for idx in positions
+            if all(predicate.matches(tasks[idx]) for predicate in unindexed)
+        }
+
+    def prefilter(self):
+        checks = [predicate.prefilter() for predicate in self.predicates]
+        checks = [check for check in checks if check is not None]
+        if not checks:
+            return None
+        return lambda line: all(check(line) for check in checks)
+
+    def __and__(self, other):
+        return And(self.predicates + (other,))
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class Or(Predicate):
+    predicates: Tuple[Predicate, ...]
+
+    def matches(self, task):
+        return any(predicate.matches(task) for predicate in self.predicates)
+
+    def positions(self, task_list):
+        found = []
+        for predicate in self.predicates:
+            positions = predicate.positions(task_list)
+            if positions is None:
+                return None
+            found.append(positions)
+        return set().union(*found)
+
+    def prefilter(self):
+        checks = [predicate.prefilter() for predicate in self.predicates]
+        if None in checks:
+            return None
+        return lambda line: any(check(line) for check in checks)
+
+    def __or__(self, other):
+        return Or(self.predicates + (other,))
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class Not(Predicate):
+    predicate: Predicate
+
+    def matches(self, task):
+        return not self.predicate.matches(task)
+
+    def positions(self, task_list):
+        positions = self.predicate.positions(task_list)
+        if positions is None:
+            return None
+        return set(range(len(task_list.tasks))) - positions
+
+    def prefilter(self):
+        # Only the done flag's test is exact, and so can be negated
+        if isinstance(self.predicate, Done):
+            return Done(not self.predicate.value).prefilter()
+        return None
+
+
+def _sort_key(value):
+    value = _as_date(value)
+    return value is None, value
+
+
+@attr.s(auto_attribs=True, slots=True, frozen=True)
+class Query:
+    """A class to represent a query over the tasks in a TaskList
+
+    Attributes
+    ----------
+    where : Predicate, optional
+        the condition tasks must satisfy. All tasks match if it is None.
+    sort : str, optional
+        the name of a Task attribute by which to sort the results. Tasks
+        without a value for it come last.
+    reverse : bool
+        if True, sort in descending order
+    limit : int, optional
+        the maximum number of results
+    """
+
+    where: Optional[Predicate] = None
+    sort: Optional[str] = None
+    reverse: bool = False
+    limit: Optional[int] = None
+
+    def _evaluate(self, task_list):
+        tasks = task_list.tasks
+        positions = None if self.where is None else self.where.positions(task_list)
+        if positions is None:
+            positions = range(len(tasks))
+            if self.where is not None:
+                positions = (idx for idx in positions if self.where.matches(tasks[idx]))
+        elif self.sort is None:
+            positions = sorted(positions)
+
+        if self.sort is None:
+            return tuple(positions)[: self.limit]
+
+        def key(idx):
+            return _sort_key(getattr(tasks[idx], self.sort))
+
+        if self.limit is None:
+            return tuple(sorted(positions, key=key, reverse=self.reverse))
+        select = heapq.nlargest if self.reverse else heapq.nsmallest
+        return tuple(select(self.limit, positions, key=key))
+
+    def positions(self, task_list):
+        """The positions of the matching tasks within task_list.tasks
+
+        Results are cached by the task list's tasks_hash, so repeating a query
+        costs nothing until the tasks change.
+
+        Returns
+        -------
+        tuple
+            of index numbers, in sort order if there is one and otherwise in
+            ascending order
+        """
+        key = (task_list.tasks_hash, self)
+        try:
+            _CACHE.move_to_end(key)
+            return _CACHE[key]
+        except KeyError:
+            pass
+
+        positions = self._evaluate(task_list)
+        _CACHE[key] = positions
+        if len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+        return positions
+
+    def run(self, task_list):
+        """Yield the matching tasks, creating each only as it is reached"""
+        tasks = task_list.tasks
+        for idx in self.positions(task_list):
+            yield tasks[idx]
@@ -0,0 +1,81 @@
+import datetime as dt
+from typing import Any, Callable, Iterator, Optional, Set, Tuple, Union
+
+from blockbuster.core.model import Task, TaskList, TaskListView
+
+CACHE_SIZE: int
+
+class Predicate:
+    def matches(self, task: Task) -> bool: ...
+    def positions(
+        self, task_list: Union[TaskList, TaskListView]
+    ) -> Optional[Set[int]]: ...
+    def prefilter(self) -> Optional[Callable[[str], bool]]: ...
+    def __and__(self, other: Predicate) -> And: ...
+    def __or__(self, other: Predicate) -> Or: ...
+    def __invert__(self) -> Not: ...
+
+class Done(Predicate):
+    value: bool
+    def __init__(self, value: bool = ...) -> None: ...
+
+class Priority(Predicate):
+    value: str
+    def __init__(self, value: str) -> None: ...
+
+class PriorityRange(Predicate):
+    low: str
+    high: str
+    def __init__(self, low: str, high: str) -> None: ...
+
+class Project(Predicate):
+    name: str
+    def __init__(self, name: str) -> None: ...
+
+class Context(Predicate):
+    name: str
+    def __init__(self, name: str) -> None: ...
+
+class Tag(Predicate):
+    key: str
+    value: Any
+    def __init__(self, key: str, value: Any = ...) -> None: ...
+
+class _DateRange(Predicate):
+    start: Optional[dt.date]
+    end: Optional[dt.date]
+    def __init__(
+        self, start: Optional[dt.date] = ..., end: Optional[dt.date] = ...
+    ) -> None: ...
+
+class CreatedBetween(_DateRange): ...
+class CompletedBetween(_DateRange): ...
+
+class And(Predicate):
+    predicates: Tuple[Predicate, ...]
+    def __init__(self, predicates: Tuple[Predicate, ...]) -> None: ...
+
+class Or(Predicate):
+    predicates: Tuple[Predicate, ...]
+    def __init__(self, predicates: Tuple[Predicate, ...]) -> None: ...
+
+class Not(Predicate):
+    predicate: Predicate
+    def __init__(self, predicate: Predicate) -> None: ...
+
+class Query:
+    where: Optional[Predicate]
+    sort: Optional[str]
+    reverse: bool
+    limit: Optional[int]
+    def __init__(
+        self,
+        where: Optional[Predicate] = ...,
+        sort: Optional[str] = ...,
+        reverse: bool = ...,
+        limit: Optional[int] = ...,
+    ) -> None: ...
+    def positions(
+        self, task_list: Union[TaskList, TaskListView]
+    ) -> Tuple[int, ...]: ...
+    def run(self, task_list: Union[TaskList, TaskListView]) -> Iterator[Task]: ...
@@ -0,0 +1,103 @@
+"""Render tasks as strings in todo.txt format"""
+from functools import lru_cache
+
+from blockbuster.core import DATE_FORMAT
+
+
+@lru_cache(maxsize=4096)
+def format_date(date):
+    """A date as a string in DATE_FORMAT
+
+    Lists hold many tasks sharing relatively few dates, so the result is
+    memoized rather than calling strftime for every task.
+    """
+    return date.strftime(DATE_FORMAT)
+
+
+def _reference_render(task):
+    """The original implementation of Task.__str__, kept for comparison"""
+    optional_prefixes = ""
+    minimal_text = f"{task.created_at.strftime(DATE_FORMAT)} {task.description}"
+    optional_suffixes = ""
+
+    if task.done:
+        optional_prefixes += "x "
+
+    if task.priority:
+        optional_prefixes += f"({task.priority}) "
+
+    if task.completed_at:
+        optional_prefixes += f"{task.completed_at.strftime(DATE_FORMAT)} "
+
+    for project in task.projects:
+        if project:
+            optional_suffixes += f" +{project}"
+
+    for context in task.contexts:
+        if context:
+            optional_suffixes += f" @{context}"
+
+    for key, value in task.tags.items():
+        optional_suffixes += f" {key}:{value}"
+
+    return optional_prefixes + minimal_text + optional_suffixes
+
+
+def _render(task):
+    parts = []
+    if task.done:
+        parts.append("x ")
+    if task.priority:
+        parts.append(f"({task.priority}) ")
+    if task.completed_at:
+        parts.append(f"{format_date(task.completed_at)} ")
+    parts.append(f"{format_date(task.created_at)} {task.description}")
+    parts.extend(f" +{project}" for project in task.projects if project)
+    parts.extend(f" @{context}" for context in task.contexts if context)
+    parts.extend(f" {key}:{value}" for key, value in task.tags.items())
+    return "".join(parts)
+
+
+def line_cache(line, task):
+    """The value kept on a task once its string is line
+
+    It holds copies of the task's lists and tags, so that render can tell
+    whether they have since been changed in place.
+    """
+    return line, list(task.projects), list(task.contexts), dict(task.tags)
+
+
+def render(task):
+    """A task as a string in todo.txt format
+
+    The string is kept on the task and reused until one of the task's
+    attributes is set or its lists or tags no longer equal those from which
+    it was made.
+    """
+    cached = getattr(task, "_line", None)
+    if cached is not None:
+        line, projects, contexts, tags = cached
+        # A LazyTask's lists and tags are only copied once they are decoded
+        if projects is None or (
+            task.projects == projects
+            and task.contexts == contexts
+            and task.tags == tags
+        ):
+            return line
+    line = _render(task)
+    task._line = line_cache(line, task)  # pylint: disable=protected-access
+    return line
+
+
+def write_tasks(tasks, writer):
+    """Write tasks to a file object as the lines of a todo.txt file
+
+    Parameters
+    ----------
+    tasks
+        An iterable of Task instances
+    writer
+        A file object open for writing text. The tasks are passed to it in a
+        single call to its write method.
+    """
+    writer.write("\n".join(map(render, tasks)))
@@ -0,0 +1,9 @@
+import datetime as dt
+from typing import Iterable, TextIO
+
+from blockbuster.core.model import Task
+
+def format_date(date: dt.date) -> str: ...
+def line_cache(line: str, task: Task) -> tuple: ...
+def render(task: Task) -> str: ...
+def write_tasks(tasks: Iterable[Task], writer: TextIO) -> None: ...
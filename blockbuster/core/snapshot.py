@@ -0,0 +1,176 @@
+"""A binary sidecar file holding the parsed tasks of a todo.txt file"""
+
+import datetime as dt
+import marshal
+import os
+import struct
+from functools import lru_cache
+from hashlib import sha256
+from pathlib import Path
+
+import attr
+import blockbuster.core.serializer as serializer
+from blockbuster.core import __version__
+from blockbuster.core.model import Task
+
+FORMAT = 1
+_KEY_SIZE = struct.Struct("<I")
+_LINE = Task._line  # pylint: disable=protected-access
+
+
+def _ordinal(date):
+    return date.toordinal() if date else 0
+
+
+@lru_cache(maxsize=4096)
+def _date(ordinal):
+    return dt.date.fromordinal(ordinal) if ordinal else None
+
+
+def _row(task):
+    """A task as a tuple of values which marshal can write
+
+    Only tuples and atomic values are used, so that the garbage collector
+    need not track the rows.
+    """
+    tags = []
+    for key, value in task.tags.items():
+        if isinstance(value, dt.date):
+            value = value.toordinal()
+        elif not isinstance(value, str):
+            raise TypeError(f"tag value {value!r} cannot be held in a snapshot")
+        tags.extend((key, value))
+    return (
+        task.description,
+        bool(task.done),
+        task.priority,
+        _ordinal(task.completed_at),
+        _ordinal(task.created_at),
+        tuple(task.projects),
+        tuple(task.contexts),
+        tuple(tags),
+        str(task),
+    )
+
+
+def _task(row):
+    """The Task for a tuple returned by _row"""
+    tags = row[7]
+    if tags:
+        tags = {
+            key: _date(value) if isinstance(value, int) else value
+            for key, value in zip(tags[::2], tags[1::2])
+        }
+    else:
+        tags = {}
+    if not isinstance(row[8], str):
+        raise TypeError("the task's string is not a str")
+    task = Task(
+        row[0],
+        row[1],
+        row[2],
+        _date(row[3]),
+        _date(row[4]),
+        list(row[5]),
+        list(row[6]),
+        tags,
+    )
+    # The slot is set directly as Task's __setattr__ is only needed for changes
+    _LINE.__set__(task, serializer.line_cache(row[8], task))
+    return task
+
+
+@attr.s(auto_attribs=True, slots=True)
+class Snapshot:
+    """A binary file holding the parsed tasks of a todo.txt file
+
+    The snapshot begins with a key made from the hash of the lines from which
+    the tasks were parsed, the version of this library and the snapshot
+    format. The tasks follow, each with its string in todo.txt format so
+    that it need not be formatted again. A snapshot whose key does not
+    match, or which cannot be read, is ignored and the lines are parsed as
+    usual.
+
+    Dates are held without any time, so a created_at datetime is loaded as a
+    date.
+
+    Attributes
+    ----------
+    file : pathlib.Path
+        the snapshot file
+    """
+
+    file: Path
+
+    @classmethod
+    def for_file(cls, file, directory=None):
+        """Create a Snapshot for the todo.txt file at the given Path
+
+        The snapshot is kept alongside the file unless a directory is given,
+        in which case its name includes a hash of the file's full path so
+        that files of the same name do not share it.
+        """
+        if directory is None:
+            return cls(file=file.with_name(f"{file.name}.snapshot"))
+        path_hash = sha256(str(file.resolve()).encode("UTF-8")).hexdigest()[:16]
+        return cls(file=Path(directory, f"{file.name}.{path_hash}.snapshot"))
+
+    @staticmethod
+    def _key(lines):
+        content_hash = sha256("".join(lines).encode("UTF-8")).hexdigest()
+        return (FORMAT, __version__, marshal.version, content_hash)
+
+    def load(self, lines):
+        """The tasks for lines, if the snapshot holds them
+
+        Parameters
+        ----------
+        lines
+            A list of the lines in the todo.txt file, as returned by readlines
+
+        Returns
+        -------
+        list
+            of Task instances, or None if the snapshot is missing, stale or
+            corrupt
+        """
+        try:
+            with self.file.open("rb") as reader:
+                (size,) = _KEY_SIZE.unpack(reader.read(_KEY_SIZE.size))
+                if marshal.loads(reader.read(size)) != self._key(lines):
+                    return None
+                rows = marshal.loads(reader.read())
+            tasks = [_task(row) for row in rows]
+        except (
+            OSError,
+            EOFError,
+            ValueError,
+            TypeError,
+            IndexError,
+            OverflowError,
+            struct.error,
+        ):
+            return None
+        return tasks if len(tasks) == len(lines) else None
+
+    def save(self, lines, tasks):
+        """Replace the snapshot with the tasks parsed from lines
+
+        The snapshot is only a cache, so a failure to write it is ignored.
+
+        Parameters
+        ----------
+        lines
+            A list of the lines in the todo.txt file, as returned by readlines
+        tasks
+            The sequence of Task instances parsed from lines
+        """
+        temporary = self.file.with_name(f".{self.file.name}.tmp")
+        try:
+            rows = [_row(task) for task in tasks]
+            key = marshal.dumps(self._key(lines))
+            with temporary.open("wb") as writer:
+                writer.write(_KEY_SIZE.pack(len(key)) + key + marshal.dumps(rows))
+            os.replace(temporary, self.file)
+        except (OSError, TypeError, ValueError):
+            pass
@@ -0,0 +1,16 @@
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+from blockbuster.core.model import Task
+
+FORMAT: int
+
+class Snapshot:
+    file: Path
+    def __init__(self, file: Path) -> None: ...
+    @classmethod
+    def for_file(
+        cls, file: Path, directory: Optional[Union[str, Path]] = ...
+    ) -> Snapshot: ...
+    def load(self, lines: List[str]) -> Optional[List[Task]]: ...
+    def save(self, lines: List[str], tasks: Sequence[Task]) -> None: ...
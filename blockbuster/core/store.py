@@ -0,0 +1,260 @@
+"""A durable store of the events of a TaskList, from which its past is rebuilt"""
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import attr
+import blockbuster.core.io as io
+from blockbuster.core import FILE_FLUSHED, FILE_READ
+from blockbuster.core.journal import CHANGED_LINES, decode_changes
+from blockbuster.core.model import Event, TaskList
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def _write_durably(text, file, mode="a"):
+    with file.open(mode) as writer:
+        writer.write(text)
+        writer.flush()
+        os.fsync(writer.fileno())
+
+
+@attr.s(auto_attribs=True, slots=True)
+class EventStore:
+    """A directory holding every event of a TaskList and snapshots of its lines
+
+    Each event is appended to events.jsonl as a line of JSON and synced to
+    disk before the next is recorded. Every snapshot_every events, and
+    whenever a read finds that the file was changed by something other than
+    the TaskList, the lines of the file are saved as a snapshot. The content
+    of the file after any recorded event is then rebuilt from the nearest
+    earlier snapshot by replaying only the events which follow it.
+
+    Reads which find the file unchanged, and writes of changes already
+    recorded, alter nothing, so are not recorded.
+
+    Attributes
+    ----------
+    directory : pathlib.Path
+        the directory holding the events file and snapshots
+    snapshot_every : int
+        the number of events after which a snapshot is taken
+    """
+
+    directory: Path
+    snapshot_every: int = 100
+    _sequence: Optional[int] = attr.ib(default=None, init=False, repr=False)
+    _last_hash: Optional[str] = attr.ib(default=None, init=False, repr=False)
+    _since_snapshot: int = attr.ib(default=0, init=False, repr=False)
+
+    @property
+    def events_file(self):
+        return self.directory / "events.jsonl"
+
+    def _snapshot_file(self, sequence):
+        return self.directory / f"snapshot-{sequence:010d}.json"
+
+    def _snapshots(self):
+        """A sorted list of the sequence numbers of the snapshots"""
+        return sorted(
+            int(file.stem.split("-")[1])
+            for file in self.directory.glob("snapshot-*.json")
+        )
+
+    def records(self):
+        """A list of dicts of the recorded events, oldest first
+
+        Each has the sequence number of the event, counting from 1, and its
+        event_type, tasks, prior_hash and new_hash. occurred_at is a string
+        in TIME_FORMAT. A partly written last record, left by an interrupted
+        append, is removed from the file.
+        """
+        try:
+            with self.events_file.open("r") as reader:
+                lines = reader.readlines()
+        except FileNotFoundError:
+            return []
+
+        records = []
+        for line in lines:
+            try:
+                if not line.endswith("\n"):
+                    raise ValueError
+                records.append(json.loads(line))
+            except ValueError:
+                _write_durably("".join(lines[: len(records)]), self.events_file, "w")
+                break
+        return records
+
+    def _load(self):
+        if self._sequence is None:
+            records = self.records()
+            self._sequence = len(records)
+            self._last_hash = records[-1]["new_hash"] if records else None
+            snapshots = self._snapshots()
+            self._since_snapshot = self._sequence - (snapshots[-1] if snapshots else 0)
+
+    def append(self, event, lines):
+        """Record an event and take a snapshot if one is due
+
+        Parameters
+        ----------
+        event
+            An Event instance
+        lines
+            A list of the lines in the todo.txt file after the event
+        """
+        self._load()
+        external = event.event_type not in CHANGED_LINES
+        if event.event_type == FILE_FLUSHED or (
+            external and event.new_hash == event.prior_hash
+        ):
+            return
+        # An event missed, such as by a failed append, leaves a gap which
+        # replaying cannot cross, so a snapshot is taken after this one
+        missed = self._sequence and event.prior_hash != self._last_hash
+        self.directory.mkdir(parents=True, exist_ok=True)
+        record = {
+            "sequence": self._sequence + 1,
+            "event_type": event.event_type,
+            "file": str(event.file),
+            "tasks": event.tasks,
+            "prior_hash": event.prior_hash,
+            "new_hash": event.new_hash,
+            "occurred_at": event.occurred_at.strftime(TIME_FORMAT),
+        }
+        try:
+            _write_durably(json.dumps(record) + "\n", self.events_file)
+        except OSError:
+            # Loaded again, without any partly written record, when next used
+            self._sequence = None
+            raise
+        self._sequence += 1
+        self._last_hash = event.new_hash
+        self._since_snapshot += 1
+        if external or missed or self._since_snapshot >= self.snapshot_every:
+            self.snapshot(lines, event.new_hash)
+
+    def snapshot(self, lines, tasks_hash):
+        """Save lines as the content of the file after the latest event
+
+        Parameters
+        ----------
+        lines
+            A list of the lines in the todo.txt file
+        tasks_hash
+            The tasks_hash of the TaskList holding them
+        """
+        self._load()
+        file = self._snapshot_file(self._sequence)
+        temporary = file.with_name(f".{file.name}.tmp")
+        content = {"sequence": self._sequence, "tasks_hash": tasks_hash, "lines": lines}
+        _write_durably(json.dumps(content), temporary, "w")
+        os.replace(temporary, file)
+        self._since_snapshot = 0
+
+    def attach(self, task_list):
+        """Record every later event of a TaskList
+
+        If the list's content is not that after the latest recorded event,
+        such as when the store is new, it is first recorded as a read of the
+        file and snapshotted.
+
+        Returns
+        -------
+        function
+            subscribed to the list's log, which can be passed to its
+            unsubscribe method to stop recording
+        """
+        self._load()
+        if task_list.tasks_hash != self._last_hash:
+            event = Event(
+                event_type=FILE_READ,
+                file=task_list.file,
+                prior_hash=self._last_hash,
+                new_hash=task_list.tasks_hash,
+            )
+            self.append(event, task_list._lines)  # pylint: disable=protected-access
+
+        def record(event):
+            self.append(event, task_list._lines)  # pylint: disable=protected-access
+
+        task_list.log.subscribe(record)
+        return record
+
+    def _target(self, records, tasks_hash, at):
+        """The sequence number of the event after which the content is wanted"""
+        if tasks_hash is not None:
+            matches = [
+                record["sequence"]
+                for record in records
+                if record["new_hash"] == tasks_hash
+            ]
+            if not matches:
+                raise KeyError(tasks_hash)
+            return matches[-1]
+        if at is not None:
+            at = at.strftime(TIME_FORMAT)
+            earlier = [
+                record["sequence"] for record in records if record["occurred_at"] <= at
+            ]
+            if not earlier:
+                raise ValueError(f"no event was recorded at or before {at}")
+            return earlier[-1]
+        return len(records)
+
+    def lines_at(self, tasks_hash=None, at=None):
+        """The lines of the file after the last event with the given hash or
+        at or before the given time
+
+        Parameters
+        ----------
+        tasks_hash
+            If given, the tasks_hash of the content to rebuild. KeyError is
+            raised if no event resulted in it.
+        at
+            If given, a datetime. The content after the last event which
+            occurred at or before it is rebuilt. ValueError is raised if
+            there is no such event.
+
+        Returns
+        -------
+        list
+            of the lines of the file, as returned by readlines. If neither
+            tasks_hash nor at is given, those after the latest event.
+        """
+        records = self.records()
+        target = self._target(records, tasks_hash, at)
+        snapshots = [sequence for sequence in self._snapshots() if sequence <= target]
+        if not snapshots:
+            raise ValueError(f"no snapshot precedes event {target}")
+
+        with self._snapshot_file(snapshots[-1]).open("r") as reader:
+            lines = json.load(reader)["lines"]
+        for record in records[snapshots[-1] : target]:
+            event_type = record["event_type"]
+            if event_type in CHANGED_LINES:
+                changes = decode_changes(event_type, record["tasks"])
+                lines = CHANGED_LINES[event_type](changes, lines)
+        return lines
+
+    def restore(self, file, tasks_hash=None, at=None, **kwargs):
+        """Write the content rebuilt by lines_at to a file and read it
+
+        Parameters
+        ----------
+        file
+            A Path instance, whose content is replaced
+        tasks_hash, at
+            As for lines_at
+        kwargs
+            Passed to TaskList.from_file
+
+        Returns
+        -------
+        TaskList
+            for file
+        """
+        io.replace_lines(self.lines_at(tasks_hash=tasks_hash, at=at), file)
+        return TaskList.from_file(file, **kwargs)
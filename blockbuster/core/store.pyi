@@ -0,0 +1,28 @@
+import datetime as dt
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from blockbuster.core.model import Event, TaskList
+
+TIME_FORMAT: str
+
+class EventStore:
+    directory: Path
+    snapshot_every: int
+    def __init__(self, directory: Path, snapshot_every: int = ...) -> None: ...
+    @property
+    def events_file(self) -> Path: ...
+    def records(self) -> List[Dict[str, Any]]: ...
+    def append(self, event: Event, lines: List[str]) -> None: ...
+    def snapshot(self, lines: List[str], tasks_hash: str) -> None: ...
+    def attach(self, task_list: TaskList) -> Callable[[Event], None]: ...
+    def lines_at(
+        self, tasks_hash: Optional[str] = ..., at: Optional[dt.datetime] = ...
+    ) -> List[str]: ...
+    def restore(
+        self,
+        file: Path,
+        tasks_hash: Optional[str] = ...,
+        at: Optional[dt.datetime] = ...,
+        **kwargs: Any
+    ) -> TaskList: ...
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import blockbuster.core.model as model
+from blockbuster.core.aio import AsyncTaskList, read_files
+from blockbuster.core.model import TaskList
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def _strings(task_list):
+    return [str(task) for task in task_list.tasks]
+
+
+def test_from_file(test_file, test_tasks_hash):
+    task_list = _run(AsyncTaskList.from_file(test_file))
+    assert task_list.tasks == TaskList.from_file(test_file).tasks
+    assert task_list.tasks_hash == test_tasks_hash
+    assert task_list.file == test_file
+
+
+def test_changes(additions, deletions, updates, test_file, test_tasks):
+    async def change(task_list):
+        await task_list.add_tasks(additions)
+        await task_list.update_tasks(updates)
+        await task_list.delete_tasks(deletions)
+        return await task_list.undo()
+
+    task_list = _run(AsyncTaskList.from_file(test_file))
+    event = _run(change(task_list))
+    assert event.new_hash == task_list.tasks_hash
+    assert len(task_list.tasks) == len(test_tasks) + len(additions)
+    assert _strings(task_list)[1:3] == list(updates.values())
+    assert _strings(TaskList.from_file(test_file)) == _strings(task_list)
+
+
+def test_concurrent_changes_are_serialized(test_file, test_tasks):
+    additions = [f"2019-01-0{count} Added concurrently" for count in range(1, 9)]
+
+    async def add(task_list):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            task_list.io_executor = executor
+            await asyncio.gather(
+                *(task_list.add_tasks([addition]) for addition in additions)
+            )
+
+    task_list = _run(AsyncTaskList.from_file(test_file))
+    _run(add(task_list))
+    assert sorted(_strings(task_list)[len(test_tasks) :]) == additions
+    assert _strings(TaskList.from_file(test_file)) == _strings(task_list)
+    hashes = [(event.prior_hash, event.new_hash) for event in task_list.log[1:]]
+    assert all(prior == new for (_, prior), (new, _) in zip(hashes, hashes[1:]))
+
+
+def test_operations_do_not_block_loop(test_file):
+    released = threading.Event()
+
+    def wait_for_loop(task_list):
+        return released.wait(5)
+
+    async def release():
+        released.set()
+
+    async def run(task_list):
+        return await asyncio.gather(task_list.call(wait_for_loop), release())
+
+    task_list = _run(AsyncTaskList.from_file(test_file))
+    assert _run(run(task_list)) == [True, None]
+
+
+def test_many_files(monkeypatch, tmp_path, test_tasks):
+    monkeypatch.setattr(model, "_PARALLEL_CHUNK_SIZE", 2)
+    files = []
+    for number in range(3):
+        file = Path(tmp_path, f"list{number}.txt")
+        file.write_text("\n".join(test_tasks * (number + 1)))
+        files.append(file)
+
+    async def read(executor):
+        task_lists = await AsyncTaskList.from_files(files, executor=executor)
+        for file in files:
+            file.write_text("\n".join(test_tasks))
+        return task_lists, await read_files(task_lists)
+
+    with ThreadPoolExecutor() as executor:
+        task_lists, events = _run(read(executor))
+    assert [task_list.file for task_list in task_lists] == files
+    assert [event.file for event in events] == files
+    for task_list in task_lists:
+        assert task_list.tasks == TaskList.from_file(task_list.file).tasks
@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import blockbuster.core.model as model
+from blockbuster.core.collection import TaskListCollection
+from blockbuster.core.model import TaskList
+
+
+def _write_lists(directory, test_tasks):
+    files = []
+    for number in range(3):
+        file = Path(directory, f"list{number}.txt")
+        file.write_text("\n".join(test_tasks[number:]))
+        files.append(file)
+    return files
+
+
+def test_from_directory(tmp_path, test_tasks):
+    files = _write_lists(tmp_path, test_tasks)
+    Path(tmp_path, "ignored.journal").write_text("")
+    collection = TaskListCollection.from_directory(tmp_path, max_workers=2)
+    assert len(collection) == len(files)
+    for file in files:
+        assert collection[file].tasks == TaskList.from_file(file).tasks
+        assert collection[file].tasks_hash == TaskList.from_file(file).tasks_hash
+    assert [task_list.file for task_list in collection] == files
+
+
+def test_from_files_with_executor(tmp_path, test_tasks):
+    files = _write_lists(tmp_path, test_tasks)
+    with ThreadPoolExecutor() as executor:
+        collection = TaskListCollection.from_files(files, executor=executor)
+    assert list(collection.task_lists) == files
+
+
+def test_parallel_parse(monkeypatch, tmp_path, test_tasks):
+    monkeypatch.setattr(model, "_PARALLEL_CHUNK_SIZE", 2)
+    file = Path(tmp_path, "test_file")
+    file.write_text("\n".join(test_tasks * 3))
+    with ThreadPoolExecutor() as executor:
+        task_list = TaskList.from_file(file, executor=executor)
+    assert task_list.tasks == TaskList.from_file(file).tasks
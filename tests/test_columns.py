@@ -0,0 +1,96 @@
+from collections import Counter
+
+from blockbuster.core.columns import TaskColumns
+from blockbuster.core.model import Task, TaskList
+
+TEST_TEXTS = [
+    "x (A) 2019-01-02 2019-01-01 Task One +Project1 @Context1 due:2019-02-01",
+    "(B) 2019-01-02 Task Two +Project1 +Project2 @Context2 rec:1w",
+    "2019-03-05 Task Three @Context1",
+]
+
+
+def test_from_todotxts():
+    columns = TaskColumns.from_todotxts(TEST_TEXTS)
+    assert len(columns) == len(TEST_TEXTS)
+    assert list(columns) == Task.from_todotxts(TEST_TEXTS)
+    assert columns[-1] == Task.from_todotxt(TEST_TEXTS[-1])
+    assert columns[1:] == Task.from_todotxts(TEST_TEXTS[1:])
+
+
+def test_from_tasks():
+    tasks = Task.from_todotxts(TEST_TEXTS)
+    assert list(TaskColumns.from_tasks(tasks)) == tasks
+
+
+def test_rearranged():
+    columns = TaskColumns.from_todotxts(TEST_TEXTS)
+    added = "(C) 2019-02-01 Task Four +Project3 @Context1 t:2019-02-02"
+    rows = [TaskColumns.from_todotxts([added]).row(0)]
+    rearranged = columns.rearranged([2, None, 0, 1, 1], rows)
+    expected = [TEST_TEXTS[2], added, TEST_TEXTS[0], TEST_TEXTS[1], TEST_TEXTS[1]]
+    assert list(rearranged) == Task.from_todotxts(expected)
+    assert rearranged.where(project="Project1") == [2, 3, 4]
+    assert rearranged.where(context="Context1") == [0, 1, 2]
+    assert list(columns) == Task.from_todotxts(TEST_TEXTS)
+    assert list(columns.rearranged([], [])) == []
+
+
+def test_where():
+    columns = TaskColumns.from_todotxts(TEST_TEXTS)
+    assert columns.where() == [0, 1, 2]
+    assert columns.where(done=True) == [0]
+    assert columns.where(done=False) == [1, 2]
+    assert columns.where(priority="B") == [1]
+    assert columns.where(project="Project1") == [0, 1]
+    assert columns.where(project="Project1", done=False) == [1]
+    assert columns.where(context="Context1") == [0, 2]
+    assert columns.where(tag="due") == [0]
+    assert columns.where(project="Missing") == []
+
+
+def test_aggregations():
+    columns = TaskColumns.from_todotxts(TEST_TEXTS)
+    assert columns.count_where(done=False) == 2
+    assert columns.count_where(project="Project1", context="Context2") == 1
+    assert columns.priority_counts() == Counter({"A": 1, "B": 1, None: 1})
+    assert columns.project_counts() == Counter({"Project1": 2, "Project2": 1})
+    assert columns.context_counts() == Counter({"Context1": 2, "Context2": 1})
+
+
+def test_columnar_task_list(additions, deletions, updates, test_file):
+    task_list = TaskList.from_file(test_file, columnar=True)
+    assert isinstance(task_list.tasks, TaskColumns)
+    assert list(task_list.tasks) == TaskList.from_file(test_file).tasks
+    task_list.update_tasks(updates)
+    task_list.delete_tasks(deletions)
+    task_list.add_tasks(additions)
+    assert isinstance(task_list.tasks, TaskColumns)
+    expected = TaskList.from_file(test_file)
+    assert [str(task) for task in task_list.tasks] == [
+        str(task) for task in expected.tasks
+    ]
+    assert task_list.tasks_hash == expected.tasks_hash
+
+
+def test_columnar_hash(updates, test_file, test_tasks):
+    test_file.write_text("\n".join(test_tasks + ["(B)   Task   Four 2019-01-01"]))
+    task_list = TaskList.from_file(test_file, columnar=True)
+    assert task_list.tasks_hash == TaskList.from_file(test_file).tasks_hash
+    task_list.update_tasks(updates)
+    assert task_list.tasks_hash == TaskList.from_file(test_file).tasks_hash
+
+
+def test_rearranged_compacts_values():
+    first = TaskColumns.from_todotxts(TEST_TEXTS)
+    columns = first
+    for generation in range(200):
+        added = f"(C) 2019-02-01 Task +Churn{generation} @Context1 due:{generation}"
+        rows = [TaskColumns.from_todotxts([added]).row(0)]
+        columns = columns.rearranged([0, None], rows)
+        assert list(columns) == Task.from_todotxts([TEST_TEXTS[0], added])
+        assert columns.where(project=f"Churn{generation}") == [1]
+        assert columns.where(project=f"Churn{generation - 1}") == []
+    assert len(columns._values) < 40
+    assert list(first) == Task.from_todotxts(TEST_TEXTS)
+    assert first.where(project="Project1") == [0, 1]
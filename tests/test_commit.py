@@ -0,0 +1,196 @@
+# pylint: disable=protected-access
+import os
+import threading
+import time
+
+import blockbuster.core.commit as commit
+import blockbuster.core.io as io
+import pytest
+from blockbuster.core import FILE_FLUSHED
+from blockbuster.core.commit import Committer, WriteBehind
+from blockbuster.core.model import TaskList
+
+
+def _strings(task_list):
+    return [str(task) for task in task_list.tasks]
+
+
+def test_changes_replace_file(additions, deletions, updates, test_file):
+    committer = Committer()
+    task_list = TaskList.from_file(test_file, committer=committer)
+    # Held open so that its inode is not reused by a replacement
+    with test_file.open() as original:
+        task_list.add_tasks(additions)
+        task_list.update_tasks(updates)
+        task_list.delete_tasks(deletions)
+        assert test_file.stat().st_ino != os.fstat(original.fileno()).st_ino
+    assert committer.writes == 3
+    assert not committer.busy()
+    assert _strings(TaskList.from_file(test_file)) == _strings(task_list)
+
+
+def test_concurrent_changes_share_writes(test_file):
+    committer = Committer(window=0.05)
+    task_list = TaskList.from_file(test_file, committer=committer)
+    additions = [f"2019-01-0{count} Added by thread {count}" for count in range(1, 9)]
+    threads = [
+        threading.Thread(target=task_list.add_tasks, args=([addition],))
+        for addition in additions
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert committer.writes < len(additions)
+    descriptions = [task.description for task in TaskList.from_file(test_file).tasks]
+    for count in range(1, 9):
+        assert f"Added by thread {count}" in descriptions
+    assert _strings(TaskList.from_file(test_file)) == _strings(task_list)
+
+
+def test_lists_share_committer(additions, tmp_path, test_tasks):
+    committer = Committer(window=0.05)
+    files = [tmp_path / "a.txt", tmp_path / "b.txt"]
+    task_lists = []
+    for file in files:
+        file.write_text("\n".join(test_tasks))
+        task_lists.append(TaskList.from_file(file, committer=committer))
+    threads = [
+        threading.Thread(target=task_list.add_tasks, args=([addition],))
+        for task_list, addition in zip(task_lists, additions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert committer.writes == 2
+    for task_list, addition in zip(task_lists, additions):
+        assert task_list.tasks[-1].description == addition
+        assert _strings(TaskList.from_file(task_list.file)) == _strings(task_list)
+
+
+def test_failed_write_raised(monkeypatch, additions, test_file):
+    task_list = TaskList.from_file(test_file, committer=Committer(fsync=False))
+
+    def fail(lines, file, fsync=False):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(io, "replace_lines", fail)
+    with pytest.raises(OSError):
+        task_list.add_tasks(additions)
+    monkeypatch.undo()
+    task_list.add_tasks(additions[:1])
+    assert len(TaskList.from_file(test_file).tasks) == 6
+
+
+def test_committed_with_locking(additions, test_file):
+    committer = Committer(window=10.0)
+    task_list = TaskList.from_file(test_file, committer=committer, locking=True)
+    task_list.add_tasks(additions)
+    assert committer.writes == 1
+    assert len(TaskList.from_file(test_file).tasks) == 5
+
+
+def _wait_until(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_write_behind(additions, test_file, test_tasks):
+    write_behind = WriteBehind(delay=60)
+    task_list = TaskList.from_file(test_file, committer=write_behind)
+    event = task_list.add_tasks(additions)
+    assert write_behind.busy()
+    assert test_file.read_text() == "\n".join(test_tasks)
+
+    task_list.flush()
+    assert not write_behind.busy()
+    assert _strings(TaskList.from_file(test_file)) == _strings(task_list)
+    assert task_list.log[-1].event_type == FILE_FLUSHED
+    assert task_list.log[-1].new_hash == event.new_hash
+    task_list.close()
+
+
+def test_write_behind_logged_by_owner(additions, test_file):
+    write_behind = WriteBehind(delay=0.01)
+    task_list = TaskList.from_file(test_file, committer=write_behind)
+    event = task_list.add_tasks(additions)
+    _wait_until(lambda: not write_behind.busy())
+    assert task_list.log[-1] is event
+    task_list.flush()
+    assert task_list.log[-1].event_type == FILE_FLUSHED
+    assert task_list.read_file().cached
+    task_list.close()
+
+
+def test_lists_share_write_behind(additions, tmp_path, test_tasks):
+    write_behind = WriteBehind(delay=60)
+    task_lists = []
+    for name in ("a.txt", "b.txt"):
+        file = tmp_path / name
+        file.write_text("\n".join(test_tasks))
+        task_lists.append(TaskList.from_file(file, committer=write_behind))
+    for task_list, addition in zip(task_lists, additions):
+        task_list.add_tasks([addition])
+    assert write_behind.busy(task_lists[0].file)
+    write_behind.flush()
+    assert write_behind.writes == 2
+    for task_list, addition in zip(task_lists, additions):
+        assert task_list.tasks[-1].description == addition
+        assert _strings(TaskList.from_file(task_list.file)) == _strings(task_list)
+    write_behind.close()
+
+
+def test_write_behind_debounced(additions, test_file):
+    write_behind = WriteBehind(delay=0.1)
+    task_list = TaskList.from_file(test_file, committer=write_behind)
+    for addition in additions * 3:
+        task_list.add_tasks([addition])
+    _wait_until(lambda: not write_behind.busy())
+    assert write_behind.writes == 1
+    assert len(TaskList.from_file(test_file).tasks) == 9
+    task_list.close()
+
+
+def test_write_behind_max_changes(additions, test_file):
+    write_behind = WriteBehind(delay=60, max_changes=2)
+    task_list = TaskList.from_file(test_file, committer=write_behind)
+    task_list.add_tasks(additions[:1])
+    task_list.add_tasks(additions[1:])
+    _wait_until(lambda: write_behind.writes == 1)
+    assert len(TaskList.from_file(test_file).tasks) == 5
+    task_list.close()
+
+
+def test_write_behind_closed_at_exit(additions, test_file):
+    task_list = TaskList.from_file(test_file, committer=WriteBehind(delay=60))
+    task_list.add_tasks(additions)
+    commit._close_all()
+    assert len(TaskList.from_file(test_file).tasks) == 5
+
+
+def test_read_file_flushes_first(additions, test_file):
+    task_list = TaskList.from_file(test_file, committer=WriteBehind(delay=60))
+    expected = task_list.add_tasks(additions).new_hash
+    task_list.read_file(force=True)
+    assert task_list.tasks_hash == expected
+    task_list.close()
+
+
+@pytest.mark.parametrize("make_committer", [Committer, WriteBehind])
+def test_updates_write_same_lines(make_committer, updates, test_file, test_tasks):
+    content = "\n".join(line + "  " for line in test_tasks) + "\n"
+    test_file.write_text(content)
+    TaskList.from_file(test_file).update_tasks(updates)
+    expected = test_file.read_text()
+    test_file.write_text(content)
+    committer = make_committer()
+    task_list = TaskList.from_file(test_file, committer=committer)
+    task_list.update_tasks(updates)
+    task_list.close()
+    assert test_file.read_text() == expected
+    assert task_list.tasks_hash == TaskList.from_file(test_file).tasks_hash
@@ -13,5 +13,5 @@ TEST_EVENT_KWARGS = {
 
 def test_events():
     event = Event(**TEST_EVENT_KWARGS)
-    keys = list(TEST_EVENT_KWARGS.keys()) + ["occurred_at"]
+    keys = list(TEST_EVENT_KWARGS.keys()) + ["occurred_at", "cached", "inverse"]
     assert list(event.to_dict().keys()) == keys
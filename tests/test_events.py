@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from blockbuster.core import FILE_READ, TASKS_ADDED, TASKS_DELETED
+from blockbuster.core.events import EventLog
+from blockbuster.core.model import TaskList
+
+
+def test_bounded_log(additions, tmp_path, test_file):
+    spill = Path(tmp_path, "events.jsonl")
+    task_list = TaskList.from_file(test_file, log=EventLog(max_length=2, spill=spill))
+    task_list.add_tasks(additions)
+    task_list.delete_tasks([0])
+    task_list.read_file(force=True)
+    assert len(task_list.log) == 2
+    assert [event.event_type for event in task_list.log] == [TASKS_DELETED, FILE_READ]
+    assert task_list.log[-1].event_type == FILE_READ
+    spilled = list(task_list.log.spilled())
+    assert [event["event_type"] for event in spilled] == [FILE_READ, TASKS_ADDED]
+    assert spilled[1]["tasks"] == additions
+    assert spilled[1]["file"] == str(test_file)
+
+
+def test_unbounded_by_default(additions, test_file):
+    task_list = TaskList.from_file(test_file)
+    for _ in range(5):
+        task_list.add_tasks(additions)
+    assert len(task_list.log) == 6
+    assert list(task_list.log.spilled()) == []
+
+
+def test_subscribers(additions, test_file):
+    task_list = TaskList.from_file(test_file)
+    added = []
+    every = []
+    task_list.log.subscribe(added.append, TASKS_ADDED)
+    task_list.log.subscribe(every.append)
+    event = task_list.add_tasks(additions)
+    task_list.delete_tasks([0])
+    assert added == [event]
+    assert [event.event_type for event in every] == [TASKS_ADDED, TASKS_DELETED]
+
+    task_list.log.unsubscribe(added.append, TASKS_ADDED)
+    task_list.add_tasks(additions)
+    assert len(added) == 1
+    assert len(every) == 3
+
+
+def test_asynchronous_subscribers(additions, test_file):
+    task_list = TaskList.from_file(test_file)
+    received = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        task_list.log.subscribe(received.append, TASKS_ADDED, executor=executor)
+        event = task_list.add_tasks(additions)
+    assert received == [event]
+
+
+def test_failing_subscriber(caplog, additions, test_file):
+    task_list = TaskList.from_file(test_file)
+
+    def fail(event):
+        raise RuntimeError("subscriber failed")
+
+    task_list.log.subscribe(fail)
+    event = task_list.add_tasks(additions)
+    assert event.new_hash == task_list.tasks_hash
+    assert "subscriber failed" in caplog.text
+    task_list.undo()
+    assert task_list.tasks == TaskList.from_file(test_file).tasks
@@ -0,0 +1,67 @@
+from blockbuster.core.index import TaskIndex
+from blockbuster.core.model import Task, TaskList
+
+
+def _expected(task_list):
+    return TaskIndex.from_tasks(TaskList.from_file(task_list.file).tasks)
+
+
+def test_lookup(test_tasks):
+    index = TaskIndex.from_tasks(Task.from_todotxts(test_tasks))
+    assert index.lookup() is None
+    assert index.lookup(project="Project1") == [0, 2]
+    assert index.lookup(project="Project1", done=False) == [2]
+    assert index.lookup(context="Context2") == [1]
+    assert index.lookup(priority="A") == []
+    assert index.lookup(tag="due") == []
+
+
+def test_index_built_on_read(test_file):
+    task_list = TaskList.from_file(test_file, indexed=True)
+    assert task_list.index == TaskIndex.from_tasks(task_list.tasks)
+
+
+def test_index_kept_up_to_date(additions, deletions, updates, test_file):
+    task_list = TaskList.from_file(test_file, indexed=True)
+    task_list.add_tasks(additions + ["2019-01-01 Task Six +Project3 due:2019-02-01"])
+    assert task_list.index == _expected(task_list)
+    assert task_list.index.lookup(tag="due") == [5]
+    task_list.update_tasks(updates)
+    assert task_list.index == _expected(task_list)
+    assert task_list.index.lookup(project="ProjectUpdated") == [2]
+    task_list.delete_tasks(deletions)
+    assert task_list.index == _expected(task_list)
+    assert task_list.index.lookup(project="Project3") == [3]
+    with task_list.batch() as batch:
+        batch.delete_tasks([0])
+        batch.update_tasks({3: "(A) 2019-01-01 Task Six"})
+    assert task_list.index == _expected(task_list)
+    assert task_list.index.lookup(priority="A") == [2]
+
+
+class _Only(list):
+    """A list of tasks which fails if any but the allowed are used"""
+
+    def __init__(self, tasks, allowed):
+        super().__init__(tasks)
+        self.allowed = allowed
+
+    def __getitem__(self, idx):
+        assert idx in self.allowed, f"task {idx} used"
+        return super().__getitem__(idx)
+
+    def __iter__(self):
+        raise AssertionError("every task used")
+
+
+def test_update_uses_only_changes(test_tasks):
+    tasks = Task.from_todotxts(test_tasks)
+    index = TaskIndex.from_tasks(tasks)
+    updated = (
+        tasks[:1] + Task.from_todotxts(["(A) 2019-01-01 Task +Project2"]) + tasks[2:]
+    )
+    index.update(_Only(tasks, {1}), _Only(updated, {1}), None, [1], [1])
+    assert index == TaskIndex.from_tasks(updated)
+
+    index.update(_Only(updated, {0}), _Only(updated[1:], set()), [1, 2])
+    assert index == TaskIndex.from_tasks(updated[1:])
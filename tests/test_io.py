@@ -1,4 +1,7 @@
+import threading
+
 import blockbuster.core.io as io
+import pytest
 
 
 def test_add_tasks(additions, test_file, test_tasks):
@@ -20,3 +23,109 @@ def test_update_tasks(updates, test_file, test_tasks):
     assert len(tasks) == len(test_tasks)
     for key, value in updates.items():
         assert tasks[key].strip() == value
+
+
+@pytest.mark.parametrize(
+    "change, changes",
+    [
+        (io.add_tasks, ["2019-01-04 Task Four"]),
+        (io.delete_tasks, [0]),
+        (io.update_tasks, {0: "2019-01-04 Task Four"}),
+    ],
+)
+def test_changes_wait_for_lock(change, changes, test_file):
+    before = test_file.read_text()
+    with io.locked(test_file):
+        writer = threading.Thread(target=change, args=(changes, test_file))
+        writer.start()
+        writer.join(0.2)
+        assert writer.is_alive()
+    writer.join()
+    assert test_file.read_text() != before
+
+
+def _read(file):
+    with file.open("r") as reader:
+        return reader.readlines()
+
+
+def _copy(file):
+    copy = file.with_name(file.name + "_copy")
+    copy.write_bytes(file.read_bytes())
+    return copy
+
+
+def test_apply_additions(additions, test_file):
+    copy = _copy(test_file)
+    lines = io.apply_additions(additions, copy, _read(copy))
+    io.add_tasks(additions, test_file)
+    assert lines == _read(test_file)
+    assert copy.read_bytes() == test_file.read_bytes()
+
+
+def test_apply_deletions(deletions, test_file):
+    copy = _copy(test_file)
+    lines = io.apply_deletions(deletions, copy, _read(copy))
+    io.delete_tasks(deletions, test_file)
+    assert lines == _read(test_file)
+    assert copy.read_bytes() == test_file.read_bytes()
+
+
+def test_apply_updates(updates, test_file):
+    copy = _copy(test_file)
+    lines = io.apply_updates(updates, copy, _read(copy))
+    io.update_tasks(updates, test_file)
+    assert lines == _read(test_file)
+    assert copy.read_bytes() == test_file.read_bytes()
+
+
+@pytest.mark.parametrize(
+    "apply, changes",
+    [
+        (io.apply_deletions, [0]),
+        (io.apply_updates, {0: "2019-01-04 Task Four"}),
+        (io.apply_batch, {"additions": [], "deletions": [0], "updates": {}}),
+    ],
+)
+def test_apply_replaces_file(apply, changes, test_file):
+    before = test_file.read_text()
+    with test_file.open() as reader:
+        lines = apply(changes, test_file, reader.readlines())
+        reader.seek(0)
+        assert reader.read() == before
+    assert _read(test_file) == lines
+
+
+def test_replace_lines_keeps_mode(test_file):
+    test_file.chmod(0o600)
+    io.replace_lines(["2019-01-04 Task Four"], test_file)
+    assert test_file.stat().st_mode & 0o777 == 0o600
+    assert test_file.read_text() == "2019-01-04 Task Four"
+
+
+def test_replace_lines_through_link(test_file):
+    link = test_file.with_name("link.txt")
+    link.symlink_to(test_file)
+    io.replace_lines(["2019-01-04 Task Four"], link)
+    assert link.is_symlink()
+    assert test_file.read_text() == "2019-01-04 Task Four"
+
+
+def test_concurrent_replacements(test_file):
+    failures = []
+
+    def replace(name):
+        try:
+            for count in range(100):
+                io.replace_lines([f"2019-01-04 {name} {count}"], test_file)
+        except OSError as error:
+            failures.append(error)
+
+    writers = [threading.Thread(target=replace, args=(name,)) for name in "ab"]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    assert failures == []
+    assert test_file.read_text() in ("2019-01-04 a 99", "2019-01-04 b 99")
+    assert [path.name for path in test_file.parent.iterdir()] == [test_file.name]
@@ -0,0 +1,138 @@
+# pylint: disable=protected-access
+from pathlib import Path
+
+import blockbuster.core.io as io
+import pytest
+from blockbuster.core.journal import Journal, JournalError
+from blockbuster.core.model import TaskList
+
+
+def _descriptions(task_list):
+    return [task.description for task in task_list.tasks]
+
+
+def test_changes_recorded_in_journal(additions, deletions, test_file):
+    content = test_file.read_text()
+    journal = Journal.for_file(test_file)
+    task_list = TaskList.from_file(test_file, journal=journal)
+    task_list.add_tasks(additions)
+    task_list.delete_tasks(deletions)
+    assert test_file.read_text() == content
+    assert journal.file.exists()
+    expected_file = Path(test_file.parent, "expected")
+    expected_file.write_text(content)
+    expected = TaskList.from_file(expected_file)
+    expected.add_tasks(additions)
+    expected.delete_tasks(deletions)
+    assert _descriptions(task_list) == _descriptions(expected)
+
+
+def test_journal_replayed(additions, updates, test_file):
+    task_list = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    task_list.add_tasks(additions)
+    task_list.update_tasks(updates)
+    replayed = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    assert _descriptions(replayed) == _descriptions(task_list)
+    assert replayed.tasks_hash == task_list.tasks_hash
+
+
+def test_compaction(additions, deletions, test_file):
+    journal = Journal.for_file(test_file, max_records=2)
+    task_list = TaskList.from_file(test_file, journal=journal)
+    task_list.add_tasks(additions)
+    assert journal.file.exists()
+    task_list.delete_tasks(deletions)
+    assert not journal.file.exists()
+    assert _descriptions(TaskList.from_file(test_file)) == _descriptions(task_list)
+
+
+def test_journal_rebased_on_external_change(additions, test_file):
+    journal = Journal.for_file(test_file)
+    task_list = TaskList.from_file(test_file, journal=journal)
+    task_list.add_tasks(additions)
+    test_file.write_text("2019-01-01 Written elsewhere")
+    reread = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    assert _descriptions(reread) == ["Written elsewhere"] + additions
+
+
+def test_journal_kept_after_external_append(additions, test_file):
+    task_list = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    task_list.add_tasks(additions[:1])
+    with test_file.open("a") as writer:
+        writer.write("\n2019-01-01 Added elsewhere")
+    task_list.read_file()
+    assert _descriptions(task_list)[-2:] == ["Added elsewhere", additions[0]]
+    task_list.add_tasks(additions[1:])
+    replayed = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    assert _descriptions(replayed) == _descriptions(task_list)
+    assert _descriptions(replayed)[-3:] == ["Added elsewhere"] + additions
+
+
+def test_interrupted_compaction(monkeypatch, additions, test_file):
+    journal = Journal.for_file(test_file)
+    task_list = TaskList.from_file(test_file, journal=journal)
+    task_list.add_tasks(additions)
+    monkeypatch.setattr(Journal, "_remove", lambda self: None)
+    task_list.compact()
+    monkeypatch.undo()
+    assert journal.file.exists()
+    reread = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    assert _descriptions(reread) == _descriptions(task_list)
+    assert not journal.file.exists()
+
+
+def test_compaction_interrupted_before_replacing(monkeypatch, additions, test_file):
+    content = test_file.read_text()
+    task_list = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    task_list.add_tasks(additions)
+
+    def crash(lines, file):
+        raise OSError("interrupted")
+
+    monkeypatch.setattr(io, "replace_lines", crash)
+    with pytest.raises(OSError):
+        task_list.compact()
+    monkeypatch.undo()
+    assert test_file.read_text() == content
+    reread = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    assert _descriptions(reread) == _descriptions(task_list)
+    reread.add_tasks(["task six"])
+    replayed = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    assert _descriptions(replayed) == _descriptions(reread)
+
+
+def test_external_change_after_interrupted_compaction(
+    monkeypatch, additions, test_file
+):
+    journal = Journal.for_file(test_file)
+    task_list = TaskList.from_file(test_file, journal=journal)
+    task_list.add_tasks(additions)
+    monkeypatch.setattr(Journal, "_remove", lambda self: None)
+    task_list.compact()
+    monkeypatch.undo()
+    test_file.write_text("2019-01-01 Written elsewhere")
+    with pytest.raises(JournalError):
+        TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+
+
+def test_partial_record_ignored(additions, test_file):
+    journal = Journal.for_file(test_file)
+    task_list = TaskList.from_file(test_file, journal=journal)
+    task_list.add_tasks(additions)
+    with journal.file.open("a") as writer:
+        writer.write('{"event_type": ')
+    reread = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    assert _descriptions(reread) == _descriptions(task_list)
+    reread.add_tasks(["task six"])
+    replayed = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    assert _descriptions(replayed) == _descriptions(reread)
+
+
+def test_batch_replayed(additions, deletions, updates, test_file):
+    task_list = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    with task_list.batch() as batch:
+        batch.update_tasks(updates)
+        batch.delete_tasks(deletions)
+        batch.add_tasks(additions)
+    replayed = TaskList.from_file(test_file, journal=Journal.for_file(test_file))
+    assert _descriptions(replayed) == _descriptions(task_list)
@@ -215,3 +215,112 @@ def test_parse_with_date_tags():
     assert task["created_at"] == datetime(2019, 1, 1).date()
     assert task["completed_at"] is None
     assert task["tags"] == {"due": datetime(2019, 2, 1).date()}
+
+
+def _parsed(parse, test_text):
+    """Parse with the given engine, normalising results which cannot compare
+
+    Where a line has no dates, created_at is the current time and so differs
+    between calls. Lines with invalid dates raise ValueError.
+    """
+    try:
+        task = parse(test_text)
+    except ValueError:
+        return ValueError
+    if type(task["created_at"]) is datetime:  # pylint: disable=unidiomatic-typecheck
+        task["created_at"] = datetime
+    return task
+
+
+@given(
+    description=text(min_size=1, alphabet=ALPHABET),
+    done=sampled_from(("", "x")),
+    priority=characters(whitelist_categories=("Lu",)),
+    completed_at=dates(min_value=date(1111, 1, 1)),
+    created_at=dates(min_value=date(1111, 1, 1)),
+    projects=lists(text(min_size=1, alphabet=ALPHABET)),
+    contexts=lists(text(min_size=1, alphabet=ALPHABET)),
+    tags=dictionaries(
+        keys=text(min_size=1, alphabet=ALPHABET),
+        values=text(min_size=1, alphabet=ALPHABET),
+    ),
+)
+def test_parse_matches_reference(
+    description, done, priority, completed_at, created_at, projects, contexts, tags
+):
+    test_text = todotxt(
+        description, done, priority, completed_at, created_at, projects, contexts, tags
+    )
+    assert _parsed(parser.parse, test_text) == _parsed(
+        parser._reference_parse, test_text
+    )
+
+
+@given(
+    test_text=lists(
+        sampled_from(
+            (
+                "x",
+                "(A)",
+                "(()",
+                " ",
+                "\t",
+                "+",
+                "@",
+                ":",
+                "a",
+                "key:value",
+                "2019-01-01",
+                "2019-13-01",
+                "due:2019-02-01",
+            )
+        )
+    ).map("".join)
+)
+def test_parse_matches_reference_on_fragments(test_text):
+    assert _parsed(parser.parse, test_text) == _parsed(
+        parser._reference_parse, test_text
+    )
+
+
+@given(test_text=text())
+def test_parse_matches_reference_on_any_text(test_text):
+    assert _parsed(parser.parse, test_text) == _parsed(
+        parser._reference_parse, test_text
+    )
+
+
+@given(
+    test_texts=lists(
+        sampled_from(
+            (
+                "x 2019-01-02 2019-01-01 Task One +Project1 @Context1",
+                "(A) 2019-01-01 Task Two +Project1 @Context2 due:2019-02-01",
+                "2019-01-01 Task Three +Project2 due:2019-02-01",
+            )
+        )
+    )
+)
+def test_parse_many(test_texts):
+    tasks = parser.parse_many(iter(test_texts))
+    assert tasks == [parser.parse(test_text) for test_text in test_texts]
+
+
+def test_parse_many_shares_strings_and_dates():
+    first, second = parser.parse_many(
+        (
+            "2019-01-01 Task One +" + "Project" + "1 due:2019-02-01",
+            "2019-01-01 Task Two +" + "Project" + "1 due:2019-02-01",
+        )
+    )
+    assert first["projects"][0] is second["projects"][0]
+    assert list(first["tags"])[0] is list(second["tags"])[0]
+    assert first["created_at"] is second["created_at"]
+    assert first["tags"]["due"] is second["tags"]["due"]
+
+
+def test_iter_parse_is_lazy():
+    test_texts = iter(["2019-01-01 Task One +Project1", "2019-01-02 Task Two"])
+    tasks = parser.iter_parse(test_texts)
+    assert next(tasks)["description"] == "Task One"
+    assert next(test_texts) == "2019-01-02 Task Two"
@@ -0,0 +1,147 @@
+import datetime as dt
+from pathlib import Path
+
+import pytest
+from blockbuster.core import query
+from blockbuster.core.model import Task, TaskList
+from blockbuster.core.query import (
+    CompletedBetween,
+    Context,
+    CreatedBetween,
+    Done,
+    Priority,
+    PriorityRange,
+    Project,
+    Query,
+    Tag,
+)
+
+PREDICATES = [
+    Done(),
+    ~Done(),
+    Priority("A"),
+    PriorityRange("A", "B"),
+    Project("Project1") & Context("Context2"),
+    Project("Project1") | Context("Context2"),
+    ~Project("Project1") & Tag("due"),
+    Tag("due", dt.date(2019, 2, 1)) | Tag("due", "soon"),
+    CreatedBetween(dt.date(2019, 1, 2), dt.date(2019, 3, 5)),
+    CompletedBetween(start=dt.date(2019, 1, 3)),
+    Project("Project2") & CreatedBetween(end=dt.date(2019, 1, 31)) & ~Done(),
+    ~(Priority("B") | Context("Context1")),
+]
+
+
+@pytest.fixture(name="query_file")
+def _query_file(tmp_path):
+    query_file = Path(tmp_path, "query_file")
+    with query_file.open("w") as file:
+        file.write(
+            "\n".join(
+                [
+                    "x 2019-01-04 2019-01-01 Task One +Project1 @Context1",
+                    "(A) 2019-01-02 Task Two +Project2 @Context2 due:2019-02-01",
+                    "(B) 2019-03-05 Task Three +Project1 +Project2 @Context1",
+                    "(C) 2019-01-10 Task Four +Project1 @Context2 due:soon",
+                    "x 2019-01-02 2019-01-01 Task Five +Project2",
+                ]
+            )
+        )
+    return query_file
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    query._CACHE.clear()
+
+
+@pytest.mark.parametrize("where", PREDICATES)
+@pytest.mark.parametrize("options", [{}, {"indexed": True}, {"columnar": True}])
+def test_positions(query_file, where, options):
+    task_list = TaskList.from_file(query_file, **options)
+    expected = tuple(
+        idx for idx, task in enumerate(task_list.tasks) if where.matches(task)
+    )
+    assert Query(where).positions(task_list) == expected
+
+
+@pytest.mark.parametrize("where", PREDICATES)
+def test_prefilter(query_file, where):
+    check = where.prefilter() or (lambda line: True)
+    lines = query_file.read_text().splitlines()
+    expected = [line for line in lines if where.matches(Task.from_todotxt(line))]
+    assert [line for line in expected if check(line)] == expected
+
+    task_list = TaskList.from_file(query_file, where=where)
+    assert [str(task) for task in task_list.tasks] == expected
+    assert [lines[idx] for idx in task_list.positions] == expected
+
+
+def test_predicates(query_file):
+    task_list = TaskList.from_file(query_file)
+    assert Query(Done()).positions(task_list) == (0, 4)
+    assert Query(PriorityRange("A", "B")).positions(task_list) == (1, 2)
+    assert Query(Tag("due", "soon")).positions(task_list) == (3,)
+    completed = CompletedBetween(start=dt.date(2019, 1, 3))
+    assert Query(completed).positions(task_list) == (0,)
+    assert Query(~Project("Project1") & Tag("due")).positions(task_list) == (1,)
+
+
+def test_sort_and_limit(query_file):
+    task_list = TaskList.from_file(query_file, indexed=True)
+    assert Query().positions(task_list) == (0, 1, 2, 3, 4)
+    assert Query(sort="priority").positions(task_list) == (1, 2, 3, 0, 4)
+    assert Query(sort="created_at", limit=2).positions(task_list) == (0, 4)
+    assert Query(~Done(), sort="priority", reverse=True, limit=2).positions(
+        task_list
+    ) == (3, 2)
+    assert Query(Project("Project1"), limit=2).positions(task_list) == (0, 2)
+
+
+def test_run(query_file):
+    task_list = TaskList.from_file(query_file, columnar=True)
+    results = Query(Context("Context2"), sort="priority").run(task_list)
+    assert next(results).description == "Task Two"
+    assert [task.description for task in results] == ["Task Four"]
+
+
+def test_cache(query_file):
+    task_list = TaskList.from_file(query_file, indexed=True)
+    where = Project("Project2") & ~Done()
+    assert Query(where).positions(task_list) == (1, 2)
+    assert (task_list.tasks_hash, Query(where)) in query._CACHE
+
+    task_list.update_tasks({1: "(A) 2019-01-02 Task Two +Project3"})
+    assert Query(where).positions(task_list) == (2,)
+    assert len(query._CACHE) == 2
+
+
+def test_prefiltered_task_list(monkeypatch, query_file):
+    parsed = []
+    from_todotxts = Task.from_todotxts
+    monkeypatch.setattr(
+        Task,
+        "from_todotxts",
+        lambda lines: parsed.extend(lines) or from_todotxts(lines),
+    )
+    where = Project("Project1") & ~Done()
+    task_list = TaskList.from_file(query_file, where=where, indexed=True)
+    assert len(parsed) == 2
+    assert task_list.positions == [2, 3]
+    assert [task.description for task in task_list.tasks] == ["Task Three", "Task Four"]
+
+    task_list.update_tasks({task_list.positions[1]: "(C) 2019-01-10 Task Four"})
+    task_list.delete_tasks([0])
+    task_list.add_tasks(["2019-01-11 Task Six +Project1"])
+    assert len(parsed) == 3
+    assert task_list.positions == [1, 4]
+    assert [task.description for task in task_list.tasks] == ["Task Three", "Task Six"]
+    assert Query(Context("Context1")).positions(task_list) == (0,)
+
+
+def test_priority_none_rejected(test_file):
+    with pytest.raises(TypeError):
+        Priority(None)
+    task_list = TaskList.from_file(test_file)
+    unprioritised = [task for task in task_list.tasks if task.priority is None]
+    assert list(Query(~PriorityRange("A", "Z")).run(task_list)) == unprioritised
@@ -0,0 +1,73 @@
+# pylint: disable=protected-access
+import datetime as dt
+from io import StringIO
+
+import blockbuster.core.serializer as serializer
+from blockbuster.core.model import Task
+from hypothesis import given
+from hypothesis.strategies import (
+    booleans,
+    builds,
+    dates,
+    datetimes,
+    dictionaries,
+    lists,
+    none,
+    one_of,
+    text,
+)
+
+TASKS = builds(
+    Task,
+    description=text(),
+    done=booleans(),
+    priority=one_of(none(), text(max_size=1)),
+    completed_at=one_of(none(), dates()),
+    created_at=one_of(dates(), datetimes()),
+    projects=lists(text()),
+    contexts=lists(text()),
+    tags=dictionaries(keys=text(min_size=1), values=one_of(text(), dates())),
+)
+
+
+@given(task=TASKS)
+def test_render_matches_reference(task):
+    assert str(task) == serializer._reference_render(task)
+    assert str(task) == serializer._reference_render(task)
+
+
+def test_render_cached_until_changed(test_tasks):
+    task = Task.from_todotxt(test_tasks[0])
+    assert getattr(task, "_line", None) is None
+    line = str(task)
+    assert task._line[0] is line
+    assert str(task) is line
+
+    task.priority = "A"
+    assert task._line is None
+    assert str(task) == "x (A) " + test_tasks[0][2:]
+    task.projects = task.projects + ["Project2"]
+    assert str(task).endswith(" +Project1 +Project2 @Context1")
+
+
+def test_render_after_changes_in_place(test_tasks):
+    task = Task.from_todotxt(test_tasks[0])
+    line = str(task)
+    task.projects.append("Project2")
+    assert str(task) == line.replace(" +Project1", " +Project1 +Project2")
+    task.contexts.clear()
+    assert str(task) == line.replace(" +Project1 @Context1", " +Project1 +Project2")
+    task.tags["due"] = "2019-03-01"
+    assert str(task).endswith(" due:2019-03-01")
+    assert str(task) == serializer._reference_render(task)
+
+
+def test_format_date():
+    assert serializer.format_date(dt.date(2019, 1, 2)) == "2019-01-02"
+    assert serializer.format_date(dt.datetime(2019, 1, 2, 3)) == "2019-01-02"
+
+
+def test_write_tasks(test_tasks):
+    writer = StringIO()
+    serializer.write_tasks(Task.from_todotxts(test_tasks), writer)
+    assert writer.getvalue() == "\n".join(test_tasks)
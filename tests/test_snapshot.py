@@ -0,0 +1,81 @@
+# pylint: disable=protected-access
+import marshal
+
+import blockbuster.core.snapshot as snapshot
+from blockbuster.core.model import Task, TaskList
+from blockbuster.core.snapshot import Snapshot
+
+
+def _no_parsing(monkeypatch):
+    def fail(todotxts):
+        raise AssertionError(f"{list(todotxts)} parsed")
+
+    monkeypatch.setattr(Task, "from_todotxts", fail)
+
+
+def test_snapshot_saved_and_loaded(monkeypatch, test_file):
+    test_file.write_text(
+        test_file.read_text() + "\n(A) 2019-01-04 Task Four due:2019-02-01"
+    )
+    expected = TaskList.from_file(test_file)
+    task_list = TaskList.from_file(test_file, snapshot=Snapshot.for_file(test_file))
+    assert Snapshot.for_file(test_file).file.exists()
+    assert task_list.tasks == expected.tasks
+
+    _no_parsing(monkeypatch)
+    task_list = TaskList.from_file(test_file, snapshot=Snapshot.for_file(test_file))
+    assert task_list.tasks == expected.tasks
+    assert task_list.tasks_hash == expected.tasks_hash
+
+
+def test_snapshot_in_directory(tmp_path, test_file):
+    directory = tmp_path / "cache"
+    directory.mkdir()
+    snapshot_ = Snapshot.for_file(test_file, directory)
+    assert snapshot_.file.parent == directory
+    TaskList.from_file(test_file, snapshot=snapshot_)
+    assert snapshot_.file.exists()
+    assert not Snapshot.for_file(test_file).file.exists()
+
+
+def test_stale_snapshot(additions, test_file):
+    TaskList.from_file(test_file, snapshot=Snapshot.for_file(test_file))
+    TaskList.from_file(test_file).add_tasks(additions)
+    task_list = TaskList.from_file(test_file, snapshot=Snapshot.for_file(test_file))
+    assert [task.description for task in task_list.tasks][-2:] == additions
+
+
+def test_other_version_ignored(monkeypatch, test_file):
+    TaskList.from_file(test_file, snapshot=Snapshot.for_file(test_file))
+    monkeypatch.setattr(snapshot, "__version__", "0.0.0")
+    lines = test_file.open().readlines()
+    assert Snapshot.for_file(test_file).load(lines) is None
+
+
+def test_corrupt_snapshot(test_file):
+    snapshot_ = Snapshot.for_file(test_file)
+    expected = TaskList.from_file(test_file)
+    lines = test_file.open().readlines()
+    key = marshal.dumps(Snapshot._key(lines))
+    key = snapshot._KEY_SIZE.pack(len(key)) + key
+    for content in (
+        b"",
+        b"not a snapshot",
+        key + b"\x00\x01",
+        key + marshal.dumps([("one",)] * 3),
+        key + marshal.dumps([("one", False, None, 0, 1, [], [], [], 2)] * 3),
+    ):
+        snapshot_.file.write_bytes(content)
+        assert snapshot_.load(lines) is None
+        task_list = TaskList.from_file(test_file, snapshot=snapshot_)
+        assert task_list.tasks == expected.tasks
+    assert snapshot_.load(lines) == expected.tasks
+
+
+def test_snapshot_tasks_changed_in_place(test_file):
+    TaskList.from_file(test_file, snapshot=Snapshot.for_file(test_file))
+    task_list = TaskList.from_file(test_file, snapshot=Snapshot.for_file(test_file))
+    task = task_list.tasks[0]
+    line = str(task)
+    task.projects.append("Project2")
+    assert str(task) == str(Task.from_todotxt(line + " +Project2"))
@@ -0,0 +1,145 @@
+# pylint: disable=protected-access
+import datetime as dt
+
+import blockbuster.core.io as io
+import blockbuster.core.store as store_module
+import pytest
+from blockbuster.core import FILE_READ, TASKS_ADDED
+from blockbuster.core.commit import Committer
+from blockbuster.core.journal import CHANGED_LINES
+from blockbuster.core.model import TaskList
+from blockbuster.core.store import EventStore
+
+
+def _descriptions(task_list):
+    return [task.description for task in task_list.tasks]
+
+
+def test_events_recorded(tmp_path, test_file, additions, deletions):
+    store = EventStore(tmp_path / "store")
+    task_list = TaskList.from_file(test_file)
+    store.attach(task_list)
+    task_list.add_tasks(additions)
+    task_list.delete_tasks(deletions)
+    task_list.read_file(force=True)
+
+    records = store.records()
+    assert [record["sequence"] for record in records] == [1, 2, 3]
+    assert records[0]["event_type"] == FILE_READ
+    assert records[1]["event_type"] == TASKS_ADDED
+    assert records[1]["tasks"] == additions
+    assert records[-1]["new_hash"] == task_list.tasks_hash
+
+
+def test_restore_at_hash(tmp_path, test_file, additions, deletions, updates):
+    store = EventStore(tmp_path / "store", snapshot_every=2)
+    task_list = TaskList.from_file(test_file)
+    store.attach(task_list)
+    states = [(task_list.tasks_hash, _descriptions(task_list))]
+    for method, changes in (
+        (task_list.add_tasks, additions),
+        (task_list.update_tasks, updates),
+        (task_list.delete_tasks, deletions),
+    ):
+        method(changes)
+        states.append((task_list.tasks_hash, _descriptions(task_list)))
+
+    for tasks_hash, descriptions in states:
+        restored = store.restore(tmp_path / "restored.txt", tasks_hash=tasks_hash)
+        assert restored.tasks_hash == tasks_hash
+        assert _descriptions(restored) == descriptions
+
+
+def test_restore_at_time(tmp_path, test_file, additions):
+    store = EventStore(tmp_path / "store")
+    task_list = TaskList.from_file(test_file)
+    store.attach(task_list)
+    lines = test_file.open().readlines()
+    between = dt.datetime.now()
+    task_list.add_tasks(additions)
+
+    assert store.lines_at(at=between) == lines
+    restored = store.restore(tmp_path / "restored.txt", at=between)
+    assert restored.tasks == TaskList.from_file(test_file).tasks[:3]
+    with pytest.raises(ValueError):
+        store.lines_at(at=between - dt.timedelta(days=1))
+    with pytest.raises(KeyError):
+        store.lines_at(tasks_hash="unknown")
+
+
+def test_nearest_snapshot_replayed(monkeypatch, tmp_path, test_file, additions):
+    store = EventStore(tmp_path / "store", snapshot_every=3)
+    task_list = TaskList.from_file(test_file)
+    store.attach(task_list)
+    for addition in additions * 4:
+        task_list.add_tasks([addition])
+    assert store._snapshots() == [1, 4, 7]
+
+    replayed = []
+
+    def added_lines(changes, lines):
+        replayed.append(changes)
+        return io.added_lines(changes, lines)
+
+    monkeypatch.setitem(CHANGED_LINES, TASKS_ADDED, added_lines)
+    assert store.lines_at() == task_list._lines
+    assert replayed == [[additions[0]], [additions[1]]]
+
+
+def test_external_change_snapshotted(tmp_path, test_file, additions):
+    store = EventStore(tmp_path / "store")
+    task_list = TaskList.from_file(test_file)
+    store.attach(task_list)
+    TaskList.from_file(test_file).add_tasks(additions)
+    task_list.read_file()
+    task_list.read_file(force=True)
+
+    assert len(store.records()) == 2
+    assert store._snapshots() == [1, 2]
+    assert store.lines_at() == task_list._lines
+
+
+def test_torn_record_dropped(tmp_path, test_file, additions):
+    store = EventStore(tmp_path / "store")
+    task_list = TaskList.from_file(test_file)
+    record = store.attach(task_list)
+    task_list.add_tasks(additions)
+    task_list.log.unsubscribe(record)
+    with store.events_file.open("a") as writer:
+        writer.write('{"sequence": 3, "event_')
+
+    reopened = EventStore(tmp_path / "store")
+    reopened.attach(task_list)
+    task_list.delete_tasks([0])
+    assert [record["sequence"] for record in reopened.records()] == [1, 2, 3]
+    assert reopened.lines_at() == task_list._lines
+
+
+def test_updates_replayed_as_written(tmp_path, test_file, test_tasks, updates):
+    test_file.write_text("\n".join(line + "  " for line in test_tasks) + "\n")
+    store = EventStore(tmp_path / "store")
+    task_list = TaskList.from_file(test_file, committer=Committer())
+    store.attach(task_list)
+    task_list.update_tasks(updates)
+    with test_file.open() as reader:
+        assert store.lines_at() == reader.readlines()
+
+
+def test_failed_append(monkeypatch, tmp_path, test_file, additions, deletions):
+    store = EventStore(tmp_path / "store")
+    task_list = TaskList.from_file(test_file)
+    store.attach(task_list)
+    write_durably = store_module._write_durably
+
+    def fail(text, file, mode="a"):
+        write_durably(text[:10], file, mode)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store_module, "_write_durably", fail)
+    task_list.add_tasks(additions)
+    monkeypatch.undo()
+    task_list.undo()
+    task_list.delete_tasks(deletions)
+
+    assert len(store.records()) == 3
+    assert store.lines_at() == task_list._lines
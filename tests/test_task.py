@@ -1,7 +1,9 @@
 # pylint: disable=too-many-arguments
+import pickle
 from datetime import date, datetime
 
-from blockbuster.core.model import Task
+import attr
+from blockbuster.core.model import LazyTask, Task
 from hypothesis import given
 from hypothesis.strategies import (
     booleans,
@@ -218,3 +220,60 @@ def test_from_todotxt_with_date_tags():
     assert task.created_at == datetime(2019, 1, 1).date()
     assert task.completed_at is None
     assert task.tags == {"due": datetime(2019, 2, 1).date()}
+
+
+def test_from_todotxts():
+    test_texts = [
+        "x 2019-01-02 2019-01-01 Task One +Project1 @Context1",
+        "(A) 2019-01-01 Task Two +Project1 @Context2 due:2019-02-01",
+    ]
+    tasks = Task.from_todotxts(test_texts)
+    assert tasks == [Task.from_todotxt(test_text) for test_text in test_texts]
+
+
+def test_rendered_line_not_an_attribute():
+    task = Task.from_todotxt("(A) 2019-01-01 Task One +Project1 due:2019-02-01")
+    line = str(task)
+    assert "_line" not in attr.asdict(task)
+    assert Task(**attr.asdict(task)) == task
+    assert str(pickle.loads(pickle.dumps(task))) == line
+
+
+def test_lazy_task():
+    # pylint: disable=protected-access
+    test_text = "x (A) 2019-01-02 2019-01-01 Task One +Project1 due:2019-02-01\n"
+    task = LazyTask(test_text)
+    assert str(task) == test_text.strip()
+    assert task.done and task.priority == "A"
+    try:
+        Task.description.__get__(task)
+        assert False, "the description was decoded with the done flag"
+    except AttributeError:
+        pass
+
+    assert task == Task.from_todotxt(test_text)
+    assert Task.from_todotxt(test_text) == task
+    assert task.tags is task.tags
+    assert pickle.loads(pickle.dumps(task)) == task
+    task.done = False
+    assert str(task) == "(A) 2019-01-02 2019-01-01 Task One +Project1 due:2019-02-01"
+
+
+def test_lazy_task_line_untouched():
+    test_text = "(B)   Task   Two 2019-01-01 @Context1"
+    task = LazyTask(test_text)
+    assert task.created_at == datetime(2019, 1, 1).date()
+    assert task.description == "Task   Two"
+    assert str(task) == test_text
+    task.contexts = ["Context2"]
+    assert str(task) == "(B) 2019-01-01 Task   Two @Context2"
+
+
+def test_lazy_task_changed_in_place():
+    test_text = "(B)   Task   Two 2019-01-01 @Context1 due:2019-02-01"
+    task = LazyTask(test_text)
+    task.contexts.append("Context2")
+    assert str(task) == "(B) 2019-01-01 Task   Two @Context1 @Context2 due:2019-02-01"
+    task = LazyTask(test_text)
+    task.tags["due"] = "2019-03-01"
+    assert str(task) == "(B) 2019-01-01 Task   Two @Context1 due:2019-03-01"
@@ -1,10 +1,20 @@
 # pylint: disable=protected-access, redefined-outer-name
+import os
+import threading
 from hashlib import sha256
 from pathlib import Path
 
+import blockbuster.core.io as io
 import blockbuster.core.model as model
-from blockbuster.core import TASKS_ADDED, TASKS_DELETED, TASKS_UPDATED
-from blockbuster.core.model import Event, Task, TaskList
+import pytest
+from blockbuster.core import (
+    FILE_READ,
+    TASKS_ADDED,
+    TASKS_BATCHED,
+    TASKS_DELETED,
+    TASKS_UPDATED,
+)
+from blockbuster.core.model import ConflictError, Event, Task, TaskList, TasksHash
 
 
 def test_tasks_hash(test_tasks, test_tasks_hash):
@@ -58,3 +68,384 @@ def test_update_tasks(updates, test_file, test_tasks):
     assert event in task_list.log  # pylint: disable=unsupported-membership-test
     assert isinstance(event, Event)
     assert event.event_type == TASKS_UPDATED
+
+
+def test_read_file_reuses_unchanged_tasks(updates, test_file):
+    task_list = TaskList.from_file(test_file)
+    original = list(task_list.tasks)
+    task_list.update_tasks(updates)
+    for idx, task in enumerate(task_list.tasks):
+        if idx in updates:
+            assert task is not original[idx]
+        else:
+            assert task is original[idx]
+
+
+def test_read_file_with_repeated_lines(tmp_path):
+    test_file = Path(tmp_path, "test_file")
+    test_file.write_text("2019-01-01 Task One\n2019-01-01 Task One\n")
+    task_list = TaskList.from_file(test_file)
+    first, second = task_list.tasks
+    assert first == second
+    assert first is not second
+    with test_file.open("a") as writer:
+        writer.write("2019-01-01 Task One\n")
+    task_list.read_file()
+    assert task_list.tasks[0] is first
+    assert task_list.tasks[1] is second
+    assert task_list.tasks[2] == first
+    assert task_list.tasks[2] is not first
+
+
+def test_changes_applied_without_reading_file(additions, deletions, test_file):
+    task_list = TaskList.from_file(test_file)
+    task_list.add_tasks(additions)
+    event = task_list.delete_tasks(deletions)
+    assert FILE_READ not in [event.event_type for event in task_list.log[1:]]
+    assert event.new_hash == task_list.tasks_hash
+    assert [str(task) for task in task_list.tasks] == [
+        str(task) for task in TaskList.from_file(test_file).tasks
+    ]
+
+
+def test_changes_reread_file_changed_elsewhere(additions, test_file):
+    task_list = TaskList.from_file(test_file)
+    with test_file.open("a") as writer:
+        writer.write("\n2019-01-01 Added elsewhere")
+    event = task_list.add_tasks(additions)
+    assert task_list.log[-2].event_type == FILE_READ
+    assert task_list.log[-1] is event
+    assert event.prior_hash == task_list.log[-2].new_hash
+    assert event.new_hash == task_list.tasks_hash
+    descriptions = [task.description for task in task_list.tasks]
+    assert "Added elsewhere" in descriptions
+    for task in additions:
+        assert task in descriptions
+    task_list.undo()
+    assert task_list.tasks[-1].description == "Added elsewhere"
+    assert _strings(TaskList.from_file(test_file)) == _strings(task_list)
+
+
+def _strings(task_list):
+    return [str(task) for task in task_list.tasks]
+
+
+@pytest.mark.parametrize("journaled", [False, True])
+def test_undo_redo(journaled, additions, deletions, updates, test_file):
+    journal = model.Journal.for_file(test_file) if journaled else None
+    task_list = TaskList.from_file(test_file, journal=journal)
+    states = [(task_list.tasks_hash, _strings(task_list))]
+    task_list.add_tasks(additions)
+    states.append((task_list.tasks_hash, _strings(task_list)))
+    task_list.update_tasks(updates)
+    states.append((task_list.tasks_hash, _strings(task_list)))
+    task_list.delete_tasks(deletions)
+    states.append((task_list.tasks_hash, _strings(task_list)))
+    with task_list.batch() as batch:
+        batch.update_tasks({0: "2019-01-05 Task Updated"})
+        batch.delete_tasks([1, 2])
+        batch.add_tasks(["task six"])
+    states.append((task_list.tasks_hash, _strings(task_list)))
+
+    for tasks_hash, strings in reversed(states[:-1]):
+        event = task_list.undo()
+        assert event.new_hash == task_list.tasks_hash == tasks_hash
+        assert _strings(task_list) == strings
+    with pytest.raises(IndexError):
+        task_list.undo()
+
+    for tasks_hash, strings in states[1:]:
+        task_list.redo()
+        assert task_list.tasks_hash == tasks_hash
+        assert _strings(task_list) == strings
+    task_list.compact()
+    assert _strings(TaskList.from_file(test_file)) == states[-1][1]
+
+
+def test_undo_keeps_deleted_content(deletions, test_file, test_tasks):
+    task_list = TaskList.from_file(test_file)
+    event = task_list.delete_tasks(deletions)
+    event_type, changes = event.inverse
+    assert event_type == TASKS_BATCHED
+    assert {idx: line.strip() for idx, line in changes["insertions"].items()} == {
+        idx: test_tasks[idx] for idx in deletions
+    }
+    task_list.undo()
+    assert test_file.read_text() == "\n".join(test_tasks)
+
+
+@pytest.mark.parametrize("ending", ["", "\n"])
+def test_undo_add_restores_file(ending, additions, test_file, test_tasks):
+    content = "\n".join(test_tasks) + ending
+    test_file.write_text(content)
+    task_list = TaskList.from_file(test_file)
+    task_list.add_tasks(additions)
+    added = test_file.read_text()
+    task_list.undo()
+    assert test_file.read_text() == content
+    task_list.redo()
+    assert test_file.read_text() == added
+    task_list.undo()
+    assert test_file.read_text() == content
+
+
+def test_add_after_undone_add(additions, test_file, test_tasks):
+    task_list = TaskList.from_file(test_file)
+    task_list.add_tasks(additions)
+    task_list.undo()
+    task_list.add_tasks(additions[:1])
+    assert [task.description for task in task_list.tasks[len(test_tasks) :]] == [
+        additions[0]
+    ]
+    assert _strings(TaskList.from_file(test_file)) == _strings(task_list)
+
+
+def test_undo_adds_to_empty_file(additions, test_file):
+    test_file.write_text("")
+    task_list = TaskList.from_file(test_file)
+    task_list.add_tasks(additions[:1])
+    once = test_file.read_text()
+    task_list.add_tasks(additions[1:])
+    task_list.undo()
+    assert test_file.read_text() == once
+    assert _strings(TaskList.from_file(test_file)) == _strings(task_list)
+    task_list.undo()
+    assert test_file.read_text() == ""
+    assert task_list.tasks == []
+
+
+def test_undo_delete_before_blank_line(test_file, test_tasks):
+    content = "\n".join(test_tasks) + "\n\n"
+    test_file.write_text(content)
+    task_list = TaskList.from_file(test_file)
+    task_list.delete_tasks([0])
+    task_list.undo()
+    assert test_file.read_text() == content
+    assert _strings(TaskList.from_file(test_file)) == _strings(task_list)
+
+
+def test_redo_cleared_by_change(additions, test_file):
+    task_list = TaskList.from_file(test_file)
+    task_list.add_tasks(additions)
+    task_list.undo()
+    task_list.add_tasks(additions[:1])
+    with pytest.raises(IndexError):
+        task_list.redo()
+
+
+def test_undo_after_change_elsewhere(additions, test_file):
+    task_list = TaskList.from_file(test_file)
+    task_list.add_tasks(additions)
+    other = TaskList.from_file(test_file)
+    other.delete_tasks([0])
+    with pytest.raises(ConflictError):
+        task_list.undo()
+    assert _strings(task_list) == _strings(other)
+
+
+def test_compare_and_swap(additions, test_file):
+    task_list = TaskList.from_file(test_file, compare_and_swap=True)
+    other = TaskList.from_file(test_file, compare_and_swap=True)
+    other.delete_tasks([0])
+    with pytest.raises(ConflictError):
+        task_list.update_tasks({0: "2019-01-05 Based on stale tasks"})
+    assert task_list.tasks_hash == other.tasks_hash
+
+    other.add_tasks(additions[:1])
+    calls = []
+
+    def change(tasks):
+        calls.append(tasks.tasks_hash)
+        return tasks.update_tasks({len(tasks.tasks) - 1: "2019-01-05 Last"})
+
+    task_list.retry(change)
+    assert len(calls) == 2
+    assert _strings(TaskList.from_file(test_file))[-1] == "2019-01-05 Last"
+
+
+def test_locking_waits_for_lock(additions, test_file):
+    task_list = TaskList.from_file(test_file, locking=True)
+    with io.locked(test_file):
+        writer = threading.Thread(target=task_list.add_tasks, args=(additions,))
+        writer.start()
+        writer.join(0.2)
+        assert writer.is_alive()
+    writer.join()
+    assert len(TaskList.from_file(test_file).tasks) == 5
+
+
+def test_locking_with_file_changed_elsewhere(additions, test_file):
+    task_list = TaskList.from_file(test_file, locking=True)
+    io.add_tasks(["2019-01-04 Added elsewhere"], test_file)
+    writer = threading.Thread(target=task_list.add_tasks, args=(additions,))
+    writer.start()
+    writer.join(5)
+    assert not writer.is_alive()
+    assert len(TaskList.from_file(test_file).tasks) == 6
+
+
+def test_iter_tasks(test_file, test_tasks_hash):
+    tasks_hash = TasksHash()
+    tasks = list(TaskList.iter_tasks(test_file, tasks_hash))
+    assert tasks == TaskList.from_file(test_file).tasks
+    assert tasks_hash.hexdigest() == test_tasks_hash
+
+
+def test_tasks_hash_matches(test_tasks, test_tasks_hash):
+    tasks_hash = TasksHash()
+    for task in test_tasks:
+        tasks_hash.update(task)
+    assert tasks_hash.hexdigest() == test_tasks_hash
+    assert TasksHash().hexdigest() == model._tasks_hash([])
+
+
+def test_hash_algorithm(test_file, test_tasks):
+    task_list = TaskList.from_file(test_file, hash_algorithm="blake2b")
+    tasks_hash = TasksHash("blake2b")
+    for task in test_tasks:
+        tasks_hash.update(task)
+    assert task_list.tasks_hash.startswith("blake2b:")
+    assert task_list.tasks_hash == tasks_hash.hexdigest()
+    assert task_list.tasks_hash != TaskList.from_file(test_file).tasks_hash
+
+
+@pytest.mark.parametrize("algorithm", [None, "blake2b"])
+def test_only_changed_tasks_hashed(algorithm, monkeypatch, updates, test_file):
+    task_list = TaskList.from_file(test_file, hash_algorithm=algorithm)
+    hashed = []
+    task_digest = model._task_digest
+    monkeypatch.setattr(
+        model,
+        "_task_digest",
+        lambda task, algorithm: hashed.append(task) or task_digest(task, algorithm),
+    )
+    prior_hash = task_list.tasks_hash
+    event = task_list.update_tasks({1: updates[1]})
+    monkeypatch.undo()
+    assert [task.description for task in hashed] == ["Task Two Updated"]
+    assert event.prior_hash == prior_hash
+    assert event.new_hash == task_list.tasks_hash
+    expected = TaskList.from_file(test_file, hash_algorithm=algorithm)
+    assert task_list.tasks_hash == expected.tasks_hash
+
+
+def test_lazy(additions, updates, test_file, test_tasks, test_tasks_hash):
+    task_list = TaskList.from_file(test_file, lazy=True)
+    assert all(isinstance(task, model.LazyTask) for task in task_list.tasks)
+    assert [str(task) for task in task_list.tasks] == test_tasks
+    assert task_list.tasks == TaskList.from_file(test_file).tasks
+    assert task_list.tasks_hash == test_tasks_hash
+
+    task_list.add_tasks(["2019-01-05 " + addition for addition in additions])
+    task_list.update_tasks(updates)
+    expected = TaskList.from_file(test_file)
+    assert task_list.tasks == expected.tasks
+    assert task_list.tasks_hash == expected.tasks_hash
+
+
+def test_batch(additions, deletions, updates, test_file, test_tasks):
+    task_list = TaskList.from_file(test_file)
+    log_length = len(task_list.log)
+    with task_list.batch() as batch:
+        batch.update_tasks(updates)
+        batch.delete_tasks(deletions)
+        batch.add_tasks(additions)
+    assert len(task_list.log) == log_length + 1
+    assert batch.event is task_list.log[-1]
+    assert batch.event.event_type == TASKS_BATCHED
+    expected = [updates[1]] + [str(task) for task in Task.from_todotxts(additions)]
+    assert [str(task) for task in task_list.tasks] == expected
+    assert [str(task) for task in TaskList.from_file(test_file).tasks] == expected
+
+
+def test_batch_abandoned_on_error(additions, test_file, test_tasks_hash):
+    task_list = TaskList.from_file(test_file)
+    try:
+        with task_list.batch() as batch:
+            batch.add_tasks(additions)
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert batch.event is None
+    assert task_list.tasks_hash == test_tasks_hash
+    assert TaskList.from_file(test_file).tasks_hash == test_tasks_hash
+
+
+def test_read_file_cached(test_file):
+    task_list = TaskList.from_file(test_file)
+    tasks = task_list.tasks
+    event = task_list.read_file()
+    assert event.cached
+    assert event.event_type == FILE_READ
+    assert event.new_hash == event.prior_hash
+    assert task_list.tasks is tasks
+    assert not task_list.read_file(force=True).cached
+    assert task_list.read_file(verify=True).cached
+
+
+def test_read_file_changed(test_file):
+    task_list = TaskList.from_file(test_file)
+    with test_file.open("a") as writer:
+        writer.write("\n2019-01-01 Added elsewhere")
+    event = task_list.read_file()
+    assert not event.cached
+    assert task_list.tasks[-1].description == "Added elsewhere"
+
+
+def test_read_file_verify(test_file):
+    task_list = TaskList.from_file(test_file)
+    stat = test_file.stat()
+    content = test_file.read_text()
+    test_file.write_text(content.replace("One", "Six"))
+    os.utime(test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert task_list.read_file().cached
+    assert not task_list.read_file(verify=True).cached
+    assert task_list.tasks[0].description == "Task Six"
+
+
+def test_thread_safe_view(additions, test_file, test_tasks):
+    task_list = TaskList.from_file(test_file, indexed=True, thread_safe=True)
+    view = task_list.view()
+    assert isinstance(task_list.tasks, tuple)
+    assert view.tasks is task_list.tasks
+    assert view.tasks_hash == task_list.tasks_hash
+    task_list.add_tasks(additions)
+    assert len(view.tasks) == len(test_tasks)
+    assert view.index.lookup(done=False) == [1, 2]
+    assert task_list.view().index.lookup(done=False) == [1, 2, 3, 4]
+    assert task_list.view().tasks_hash == task_list.tasks_hash
+
+
+def test_thread_safe_stress(test_file, test_tasks):
+    task_list = TaskList.from_file(test_file, indexed=True, thread_safe=True)
+    done = threading.Event()
+    failures = []
+
+    def read():
+        while not done.is_set():
+            view = task_list.view()
+            content = "\n".join(str(task) for task in view.tasks)
+            if sha256(content.encode("UTF-8")).hexdigest() != view.tasks_hash:
+                failures.append(view)
+            if view.index.lookup(done=False)[-1] != len(view.tasks) - 1:
+                failures.append(view)
+
+    def write(writer):
+        for count in range(10):
+            task_list.add_tasks([f"2019-01-01 Writer {writer} task {count}"])
+            task_list.update_tasks({0: f"x 2019-01-01 Writer {writer} {count}"})
+            task_list.read_file(force=True)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    writers = [threading.Thread(target=write, args=(writer,)) for writer in range(4)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    assert not failures
+    assert len(task_list.tasks) == len(test_tasks) + 40
+    assert task_list.tasks_hash == TaskList.from_file(test_file).tasks_hash